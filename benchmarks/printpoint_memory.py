@@ -0,0 +1,43 @@
+"""
+Measures the memory that is allocated per million PrintPoints, as they are created by the print organizers:
+with a point, a mesh normal, a layer height and an up vector that is set afterwards.
+
+Usage: python benchmarks/printpoint_memory.py [number_of_printpoints]
+"""
+import sys
+import time
+import tracemalloc
+from compas.geometry import Point, Vector
+from compas_slicer.geometry import PrintPoint
+
+
+def create_printpoints(n, access_frames):
+    ppts = []
+    for i in range(n):
+        ppt = PrintPoint(pt=Point(i, 0.0, 0.0), layer_height=1.0, mesh_normal=Vector(1.0, 0.0, 0.0))
+        ppt.up_vector = Vector(0.0, 0.0, 1.0)
+        if access_frames:
+            ppt.frame
+        ppts.append(ppt)
+    return ppts
+
+
+def measure(n, access_frames):
+    start = time.time()
+    create_printpoints(n, access_frames)
+    duration = time.time() - start  # timed without tracemalloc, which slows down the allocations
+
+    tracemalloc.start()
+    ppts = create_printpoints(n, access_frames)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del ppts
+    return memory, duration
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for access_frames in [False, True]:
+        memory, duration = measure(n, access_frames)
+        print("%s frames: %.0f MB per million printpoints, %.2f s per million printpoints"
+              % ('with' if access_frames else 'without', memory / 2 ** 20 * 1e6 / n, duration * 1e6 / n))
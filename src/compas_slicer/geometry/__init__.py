@@ -12,9 +12,12 @@ seen as a 'slice' of a geometry. Layers are typically organized horizontally,
 but can also be organized vertically. A Layer consists out of one, or multiple
 Paths (depending on the geometry).
 A Path is a contour within a layer. A Path consists out of a list of
-compas.Points, plus some additional attributes.
+compas.Points (or an array of their coordinates), plus some additional attributes.
+A Toolpath stores all the paths of a print in one contiguous array of coordinates,
+with offsets arrays that give the ranges of the paths and of the layers.
 A PrintPoint consists out of a single compas.geometry.Point, with additional
 functionality added for the printing process.
+A PrintPointTable stores the printpoints of a print in columns, with one row per printpoint.
 
 
 Classes
@@ -26,7 +29,9 @@ Classes
 
     Layer
     Path
+    Toolpath
     PrintPoint
+    PrintPointTable
 """
 
 from __future__ import absolute_import
@@ -35,6 +40,8 @@ from __future__ import print_function
 
 from .path import *  # noqa: F401 E402 F403
 from .layer import *  # noqa: F401 E402 F403
+from .toolpath import *  # noqa: F401 E402 F403
 from .print_point import *  # noqa: F401 E402 F403
+from .print_point_table import *  # noqa: F401 E402 F403
 
 __all__ = [name for name in dir() if not name.startswith('_')]
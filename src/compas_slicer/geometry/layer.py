@@ -1,6 +1,7 @@
 import logging
 import compas_slicer
 import compas_slicer.utilities.utils as utils
+from compas_slicer.utilities.point_cloud import PointCloudIndex
 import numpy as np
 from compas_slicer.geometry import Path
 
@@ -66,9 +67,10 @@ class Layer(object):
         z_min = 2 ** 32  # very big number
         z_max = -2 ** 32  # very small number
         for path in self.paths:
-            for pt in path.points:
-                z_min = min(z_min, pt[2])
-                z_max = max(z_max, pt[2])
+            z = path.coords[:, 2]
+            if len(z) > 0:
+                z_min = min(z_min, float(np.min(z)))
+                z_max = max(z_max, float(np.max(z)))
         self.min_max_z_height = (z_min, z_max)
 
     @classmethod
@@ -139,8 +141,7 @@ class VerticalLayer(Layer):
 
     def compute_head_centroid(self):
         """ Find the centroid of all the points of the last path in the self.paths list"""
-        pts = np.array(self.paths[-1].points)
-        self.head_centroid = np.mean(pts, axis=0)
+        self.head_centroid = np.mean(self.paths[-1].coords, axis=0)
 
     def printout_details(self):
         """ Prints the details of the class. """
@@ -201,6 +202,16 @@ class VerticalLayersManager:
         self.layers = [VerticalLayer(id=0)]  # vertical_layers_print_data that contain isocurves (compas_slicer.Path)
         self.avg_layer_height = avg_layer_height
         self.max_paths_per_layer = max_paths_per_layer
+        self.head_indices = {}  # VerticalLayer.id : (head path, PointCloudIndex of its points)
+
+    def get_head_index(self, vertical_layer):
+        """ Returns the PointCloudIndex of the head (last path) of the vertical layer. It is built once per head. """
+        head = vertical_layer.paths[-1]
+        cached = self.head_indices.get(vertical_layer.id)
+        if cached is None or cached[0] is not head:
+            cached = (head, PointCloudIndex(head.coords))
+            self.head_indices[vertical_layer.id] = cached
+        return cached[1]
 
     def add(self, path):
         selected_layer = None
@@ -210,7 +221,8 @@ class VerticalLayersManager:
             selected_layer = self.layers[0]
 
         else:  # find the candidate segment for new isocurve
-            centroid = np.mean(np.array(path.points), axis=0)
+            pts = path.coords
+            centroid = np.mean(pts, axis=0)
             other_centroids = get_vertical_layers_centroids_list(self.layers)
             candidate_layer = self.layers[utils.get_closest_pt_index(centroid, other_centroids)]
 
@@ -223,16 +235,8 @@ class VerticalLayersManager:
                     selected_layer = candidate_layer
 
                 if selected_layer:  # also check that the actual distance between the layers is acceptable
-                    pts_selected_layer = np.array(candidate_layer.paths[-1].points)
-                    pts = np.array(path.points)
-                    # find min distance between pts_selected_layer and pts
-                    min_dist = 1e10  # some large number
-                    max_dist = 0.0  # some small number
-                    for pt in pts:
-                        pt_array = np.tile(pt, (pts_selected_layer.shape[0], 1))
-                        dists = np.linalg.norm(pts_selected_layer - pt_array, axis=1)
-                        min_dist = min(np.min(dists), min_dist)
-                        max_dist = max(np.min(dists), max_dist)
+                    # min and max of the distances of pts to their nearest points on the head of the layer
+                    min_dist, max_dist = self.get_head_index(candidate_layer).min_max_nearest_distance(pts)
                     if min_dist > 3.0 * self.avg_layer_height or max_dist > 8.0 * self.avg_layer_height:
                         selected_layer = None
 
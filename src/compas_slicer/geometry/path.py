@@ -1,16 +1,23 @@
 import logging
 import compas
+import numpy as np
 from compas.geometry import Point
 
 logger = logging.getLogger('logger')
 
-__all__ = ['Path']
+__all__ = ['Path',
+           'points_to_coords']
 
 
 class Path(object):
     """
     A Path is a connected contour within a Layer. A Path consists of a list of
-    compas.geometry.Points.
+    compas.geometry.Points, or equivalently of an array with their coordinates.
+
+    A Path can be backed by the list of points, by the array of coordinates (see Path.from_coords) or by both,
+    as long as they describe the same points. The points of a path that is backed by an array are only created
+    the first time that path.points is accessed. From then on the list is the authoritative representation,
+    since it can be modified in place, and path.coords is computed from it.
 
     Attributes
     ----------
@@ -19,18 +26,77 @@ class Path(object):
     is_closed: bool
         True if the Path is a closed curve, False if the Path is open.
         If the path is closed, the first and the last point are identical.
+    coords: np.array, float, (#points x 3) (optional)
+        The coordinates of the points. If given, points can be None.
     """
 
-    def __init__(self, points, is_closed):
-        # check input
-        assert isinstance(points[0], compas.geometry.Point)
+    def __init__(self, points, is_closed, coords=None):
+        self._points = None  # list, :class: compas.geometry.Point
+        self._coords = None  # np.array, float, (#points x 3)
+
+        if points is not None:
+            # check input
+            assert isinstance(points[0], compas.geometry.Point)
+            self._points = points
+        if coords is not None:
+            self._coords = np.asarray(coords, dtype=np.float64).reshape((-1, 3))
+        assert self._points is not None or self._coords is not None, 'A Path needs either points or coords.'
 
-        self.points = points  # :class: compas.geometry.Point
         self.is_closed = is_closed  # bool
 
     def __repr__(self):
-        no_of_points = len(self.points) if self.points else 0
-        return "<Path object with %i points>" % no_of_points
+        return "<Path object with %i points>" % self.number_of_points
+
+    @classmethod
+    def from_coords(cls, coords, is_closed):
+        """
+        Construct a path that is backed by an array of coordinates, without creating any Points.
+
+        Parameters
+        ----------
+        coords: np.array, float, (#points x 3)
+        is_closed: bool
+
+        Returns
+        -------
+        path
+        """
+        return cls(points=None, is_closed=is_closed, coords=coords)
+
+    @property
+    def points(self):
+        """ list, :class:`compas.geometry.Point`. Accessing the points makes the list the authoritative representation. """
+        if self._points is None:
+            self._points = [Point(x, y, z) for x, y, z in self._coords.tolist()]
+        self._coords = None  # the list can be modified in place, so the array might get out of sync
+        return self._points
+
+    @points.setter
+    def points(self, points):
+        self._points = points
+        self._coords = None
+
+    @property
+    def coords(self):
+        """
+        np.array, float, (#points x 3). If the path is backed by an array this is the array itself, otherwise it is
+        a new array computed from the points, so modifying it does not modify the path.
+        """
+        if self._coords is not None:
+            return self._coords
+        return points_to_coords(self._points)
+
+    @coords.setter
+    def coords(self, coords):
+        self._coords = np.asarray(coords, dtype=np.float64).reshape((-1, 3))
+        self._points = None
+
+    @property
+    def number_of_points(self):
+        """ Returns int: The number of points of the path. """
+        if self._coords is not None:
+            return len(self._coords)
+        return len(self._points) if self._points else 0
 
     @classmethod
     def from_data(cls, data):
@@ -48,9 +114,8 @@ class Path(object):
 
         """
         points_data = data['points']
-        pts = [Point(points_data[key][0], points_data[key][1], points_data[key][2])
-               for key in points_data]
-        path = cls(points=pts, is_closed=data['is_closed'])
+        coords = [points_data[key] for key in points_data]
+        path = cls.from_coords(coords, is_closed=data['is_closed'])
         return path
 
     def to_data(self):
@@ -62,10 +127,25 @@ class Path(object):
             The path's data.
 
         """
-        data = {'points': {i: point.to_data() for i, point in enumerate(self.points)},
+        data = {'points': {i: pt for i, pt in enumerate(self.coords.tolist())},
                 'is_closed': self.is_closed}
         return data
 
 
+def points_to_coords(points):
+    """
+    Returns np.array, float, (#points x 3), the coordinates of the points.
+
+    Parameters
+    ----------
+    points: list, :class:`compas.geometry.Point` or any sequence of 3 floats
+    """
+    try:
+        coords = [(pt.x, pt.y, pt.z) for pt in points]
+    except AttributeError:  # not compas Points, i.e. lists or arrays
+        coords = [(pt[0], pt[1], pt[2]) for pt in points]
+    return np.array(coords, dtype=np.float64).reshape((-1, 3))
+
+
 if __name__ == '__main__':
     pass
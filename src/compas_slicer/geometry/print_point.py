@@ -23,6 +23,7 @@ class PrintPoint(object):
         Vector in up direction. For planar slicing this corresponds to the z axis, for curved slicing it varies.
     frame: :class:`compas.geometry.Frame`
         Frame with x-axis pointing up, y-axis pointing towards the mesh normal.
+        It is computed lazily, and recomputed after pt, mesh_normal or up_vector are set.
     extruder_toggle: bool
         True if extruder should be on (when printing), False if it should be off (when travelling).
     velocity: float
@@ -31,21 +32,25 @@ class PrintPoint(object):
         Time in seconds to wait at this PrintPoint.
     """
 
+    __slots__ = ('_pt', '_mesh_normal', '_up_vector', '_frame', '_attributes', 'layer_height',
+                 'extruder_toggle', 'velocity', 'wait_time', 'blend_radius',
+                 'closest_support_pt', 'distance_to_support', 'is_feasible')
+
     def __init__(self, pt, layer_height, mesh_normal):
         assert isinstance(pt, compas.geometry.Point)
         assert isinstance(mesh_normal, compas.geometry.Vector)
         assert layer_height
 
         #  --- basic printpoint
-        self.pt = pt
+        self._pt = pt
         self.layer_height = layer_height
 
-        self.mesh_normal = mesh_normal  # compas.geometry.Vector
-        self.up_vector = Vector(0, 0, 1)  # default value that can be updated
-        self.frame = self.get_frame()  # compas.geometry.Frame
+        self._mesh_normal = mesh_normal  # compas.geometry.Vector
+        self._up_vector = None  # compas.geometry.Vector, created on first access (default Vector(0, 0, 1))
+        self._frame = None  # compas.geometry.Frame, computed on first access
 
         #  --- attributes transferred from the mesh (vertex / face attributes)
-        self.attributes = {}  # dict. To fill this in,
+        self._attributes = None  # dict, created on first access
 
         #  --- print_organization related attributes
         self.extruder_toggle = None  # bool
@@ -63,6 +68,64 @@ class PrintPoint(object):
         x, y, z = self.pt[0], self.pt[1], self.pt[2]
         return "<PrintPoint object at (%.2f, %.2f, %.2f)>" % (x, y, z)
 
+    #################################
+    #  --- Properties
+
+    @property
+    def pt(self):
+        """ :class:`compas.geometry.Point`. Setting it invalidates the frame. """
+        return self._pt
+
+    @pt.setter
+    def pt(self, pt):
+        self._pt = pt
+        self._frame = None
+
+    @property
+    def mesh_normal(self):
+        """ :class:`compas.geometry.Vector`. Setting it invalidates the frame. """
+        return self._mesh_normal
+
+    @mesh_normal.setter
+    def mesh_normal(self, mesh_normal):
+        self._mesh_normal = mesh_normal
+        self._frame = None
+
+    @property
+    def up_vector(self):
+        """ :class:`compas.geometry.Vector`. Setting it invalidates the frame. """
+        if self._up_vector is None:
+            self._up_vector = Vector(0, 0, 1)  # default value that can be updated
+        return self._up_vector
+
+    @up_vector.setter
+    def up_vector(self, up_vector):
+        self._up_vector = up_vector
+        self._frame = None
+
+    @property
+    def frame(self):
+        """ :class:`compas.geometry.Frame`. It is computed with get_frame() the first time it is accessed after
+        pt, mesh_normal or up_vector have been set. """
+        if self._frame is None:
+            self._frame = self.get_frame()
+        return self._frame
+
+    @frame.setter
+    def frame(self, frame):
+        self._frame = frame
+
+    @property
+    def attributes(self):
+        """ dict. Attributes transferred from the mesh (vertex / face attributes). """
+        if self._attributes is None:
+            self._attributes = {}
+        return self._attributes
+
+    @attributes.setter
+    def attributes(self, attributes):
+        self._attributes = attributes
+
     def get_frame(self):
         """ Returns a Frame with x-axis pointing up, y-axis pointing towards the mesh normal. """
         if abs(dot_vectors(self.up_vector, self.mesh_normal)) < 1.0:  # if the normalized vectors are not co-linear
@@ -70,7 +133,7 @@ class PrintPoint(object):
             if norm_vector(c) == 0:
                 c = Vector(1, 0, 0)
             if norm_vector(self.mesh_normal) == 0:
-                self.mesh_normal = Vector(0, 1, 0)
+                self._mesh_normal = Vector(0, 1, 0)
             return Frame(self.pt, c, self.mesh_normal)
         else:  # in horizontal surfaces the vectors happen to be co-linear
             return Frame(self.pt, Vector(1, 0, 0), Vector(0, 1, 0))
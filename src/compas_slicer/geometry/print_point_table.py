@@ -0,0 +1,350 @@
+import logging
+import numpy as np
+from compas.geometry import Point, Vector
+from compas_slicer.geometry import PrintPoint
+
+logger = logging.getLogger('logger')
+
+__all__ = ['PrintPointTable',
+           'get_frames_axes']
+
+
+class PrintPointTable(object):
+    """
+    A PrintPointTable stores the printpoints of a print organizer in columns, with one row per printpoint.
+    The rows are ordered by layer, then by path, then by point, and the paths and the layers are ranges of rows
+    given by offsets arrays (same as in :class: 'compas_slicer.geometry.Toolpath'):
+    the rows of path p are range(path_offsets[p], path_offsets[p + 1]),
+    the paths of layer i are range(layer_offsets[i], layer_offsets[i + 1]).
+
+    The values that are not assigned are stored as nan (float columns) or -1 (extruder_toggle), and they correspond
+    to the None values of the PrintPoint attributes.
+    The frames are not stored, they are computed from the pt, mesh_normal and up_vector columns
+    (see PrintPoint.get_frame and get_frames_axes).
+
+    Attributes
+    ----------
+    pt: np.array, float, (#printpoints x 3)
+    mesh_normal: np.array, float, (#printpoints x 3)
+    up_vector: np.array, float, (#printpoints x 3)
+    layer_height: np.array, float, (#printpoints)
+    velocity: np.array, float, (#printpoints)
+    wait_time: np.array, float, (#printpoints)
+    blend_radius: np.array, float, (#printpoints)
+    extruder_toggle: np.array, int8, (#printpoints), 1 for True, 0 for False, -1 for None
+    is_feasible: np.array, bool, (#printpoints)
+    distance_to_support: np.array, float, (#printpoints)
+    closest_support_pt: np.array, float, (#printpoints x 3)
+    attributes: list, dict or None, (#printpoints), or None if no printpoint has attributes
+    path_offsets: np.array, int, (#paths + 1)
+    layer_offsets: np.array, int, (#layers + 1)
+    layer_index: np.array, int, (#printpoints), the index of the layer of each printpoint
+    path_index: np.array, int, (#printpoints), the index of the path of each printpoint within its layer
+    """
+
+    float_columns = ['layer_height', 'velocity', 'wait_time', 'blend_radius', 'distance_to_support']
+    vector_columns = ['pt', 'mesh_normal', 'up_vector', 'closest_support_pt']
+
+    def __init__(self, pt, path_offsets, layer_offsets, mesh_normal=None, up_vector=None, layer_height=None,
+                 velocity=None, wait_time=None, blend_radius=None, extruder_toggle=None, is_feasible=None,
+                 distance_to_support=None, closest_support_pt=None, attributes=None):
+        self.pt = np.array(pt, dtype=np.float64).reshape((-1, 3))
+        self.path_offsets = np.asarray(path_offsets, dtype=np.int64)
+        self.layer_offsets = np.asarray(layer_offsets, dtype=np.int64)
+        assert self.path_offsets[-1] == len(self.pt), 'The path offsets do not match the number of printpoints.'
+        assert self.layer_offsets[-1] == len(self.path_offsets) - 1, 'The layer offsets do not match the paths.'
+
+        n = len(self.pt)
+        self.mesh_normal = get_column(mesh_normal, (n, 3), (0.0, 1.0, 0.0), np.float64)
+        self.up_vector = get_column(up_vector, (n, 3), (0.0, 0.0, 1.0), np.float64)
+        self.layer_height = get_column(layer_height, (n,), np.nan, np.float64)
+        self.velocity = get_column(velocity, (n,), np.nan, np.float64)
+        self.wait_time = get_column(wait_time, (n,), np.nan, np.float64)
+        self.blend_radius = get_column(blend_radius, (n,), np.nan, np.float64)
+        self.extruder_toggle = get_column(extruder_toggle, (n,), -1, np.int8)
+        self.is_feasible = get_column(is_feasible, (n,), True, bool)
+        self.distance_to_support = get_column(distance_to_support, (n,), np.nan, np.float64)
+        self.closest_support_pt = get_column(closest_support_pt, (n, 3), np.nan, np.float64)
+        if attributes is not None:
+            assert len(attributes) == n, 'Wrong number of attributes: %d instead of %d' % (len(attributes), n)
+        self.attributes = attributes
+
+        # indices of the rows
+        paths_per_layer = np.diff(self.layer_offsets)
+        points_per_path = np.diff(self.path_offsets)
+        path_layer = np.repeat(np.arange(self.number_of_layers), paths_per_layer)
+        path_index_in_layer = np.arange(self.number_of_paths) - np.repeat(self.layer_offsets[:-1], paths_per_layer)
+        self.path_id = np.repeat(np.arange(self.number_of_paths), points_per_path)  # global index of the path
+        self.layer_index = path_layer[self.path_id]
+        self.path_index = path_index_in_layer[self.path_id]
+
+    def __repr__(self):
+        return "<PrintPointTable with %d layers, %d paths and %d printpoints>" % (self.number_of_layers,
+                                                                                  self.number_of_paths,
+                                                                                  self.number_of_printpoints)
+
+    # --- Counts and indices
+
+    @property
+    def number_of_printpoints(self):
+        """ Returns int: Total number of printpoints. """
+        return len(self.pt)
+
+    @property
+    def number_of_paths(self):
+        """ Returns int: Total number of paths. """
+        return len(self.path_offsets) - 1
+
+    @property
+    def number_of_layers(self):
+        """ Returns int: Total number of layers. """
+        return len(self.layer_offsets) - 1
+
+    def number_of_paths_on_layer(self, layer_index):
+        """ Returns int: Number of paths on the layer. """
+        return int(self.layer_offsets[layer_index + 1] - self.layer_offsets[layer_index])
+
+    def layer_path_indices(self, layer_index):
+        """ Returns range, int, the global indices of the paths of the layer. """
+        return range(int(self.layer_offsets[layer_index]), int(self.layer_offsets[layer_index + 1]))
+
+    def path_rows(self, layer_index, path_index):
+        """ Returns the slice with the rows of the path with index path_index on the layer with index layer_index. """
+        p = self.layer_offsets[layer_index] + path_index
+        assert p < self.layer_offsets[layer_index + 1], 'Path %d does not exist on layer %d' % (path_index,
+                                                                                                layer_index)
+        return slice(self.path_offsets[p], self.path_offsets[p + 1])
+
+    @property
+    def is_path_start(self):
+        """ Returns np.array, bool, (#printpoints), True for the first printpoint of each path. """
+        is_start = np.zeros(self.number_of_printpoints, dtype=bool)
+        starts = self.path_offsets[:-1][np.diff(self.path_offsets) > 0]
+        is_start[starts] = True
+        return is_start
+
+    @property
+    def is_path_end(self):
+        """ Returns np.array, bool, (#printpoints), True for the last printpoint of each path. """
+        is_end = np.zeros(self.number_of_printpoints, dtype=bool)
+        ends = self.path_offsets[1:][np.diff(self.path_offsets) > 0] - 1
+        is_end[ends] = True
+        return is_end
+
+    def distances_to_previous(self):
+        """ Returns np.array, float, (#printpoints), the distance of each printpoint to the previous printpoint of the
+        same path (nan for the first printpoint of each path). """
+        d = np.full(self.number_of_printpoints, np.nan)
+        if self.number_of_printpoints > 1:
+            diff = self.pt[1:] - self.pt[:-1]
+            d[1:] = np.sqrt(diff[:, 0] ** 2 + diff[:, 1] ** 2 + diff[:, 2] ** 2)
+        d[self.is_path_start] = np.nan
+        return d
+
+    # --- Frames
+
+    def frames_axes(self):
+        """ Returns the x and y axes of the frames of all the printpoints, see get_frames_axes. """
+        return get_frames_axes(self.up_vector, self.mesh_normal)
+
+    # --- Selection
+
+    def take(self, rows, path_id=None):
+        """
+        Returns a new PrintPointTable with the given rows, in the given order. The layers and the paths stay the same.
+
+        Parameters
+        ----------
+        rows: np.array, int, the rows to take. The rows of each path have to stay consecutive.
+        path_id: np.array, int (optional), the global path index of each new row. If None, the rows keep their path.
+
+        Returns
+        -------
+        :class: 'compas_slicer.geometry.PrintPointTable'
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        if path_id is None:
+            path_id = self.path_id[rows]
+        assert np.all(np.diff(path_id) >= 0), 'The rows of each path have to be consecutive.'
+        counts = np.bincount(path_id, minlength=self.number_of_paths)
+        path_offsets = np.concatenate([[0], np.cumsum(counts)])
+        return PrintPointTable(pt=self.pt[rows], path_offsets=path_offsets, layer_offsets=self.layer_offsets,
+                               mesh_normal=self.mesh_normal[rows], up_vector=self.up_vector[rows],
+                               layer_height=self.layer_height[rows], velocity=self.velocity[rows],
+                               wait_time=self.wait_time[rows], blend_radius=self.blend_radius[rows],
+                               extruder_toggle=self.extruder_toggle[rows], is_feasible=self.is_feasible[rows],
+                               distance_to_support=self.distance_to_support[rows],
+                               closest_support_pt=self.closest_support_pt[rows],
+                               attributes=[self.attributes[r] for r in rows.tolist()] if self.attributes else None)
+
+    # --- Conversion from and to PrintPoints
+
+    @classmethod
+    def from_printpoints_dict(cls, printpoints_dict):
+        """
+        Creates a PrintPointTable from a printpoints dict ('layer_%d' -> 'path_%d' -> list of PrintPoints).
+        Frames that were set explicitly on the printpoints are not kept, since the table computes them from the
+        pt, mesh_normal and up_vector columns.
+
+        Parameters
+        ----------
+        printpoints_dict: dict
+
+        Returns
+        -------
+        :class: 'compas_slicer.geometry.PrintPointTable'
+        """
+        ppts = []
+        points_per_path = []
+        paths_per_layer = []
+        for layer_key in printpoints_dict:
+            paths_per_layer.append(len(printpoints_dict[layer_key]))
+            for path_key in printpoints_dict[layer_key]:
+                path_ppts = printpoints_dict[layer_key][path_key]
+                points_per_path.append(len(path_ppts))
+                ppts.extend(path_ppts)
+
+        attributes = [ppt.attributes for ppt in ppts]
+        return cls(pt=[list(ppt.pt) for ppt in ppts],
+                   path_offsets=np.concatenate([[0], np.cumsum(points_per_path, dtype=np.int64)]),
+                   layer_offsets=np.concatenate([[0], np.cumsum(paths_per_layer, dtype=np.int64)]),
+                   mesh_normal=[list(ppt.mesh_normal) for ppt in ppts],
+                   up_vector=[list(ppt.up_vector) for ppt in ppts],
+                   layer_height=[none_to_nan(ppt.layer_height) for ppt in ppts],
+                   velocity=[none_to_nan(ppt.velocity) for ppt in ppts],
+                   wait_time=[none_to_nan(ppt.wait_time) for ppt in ppts],
+                   blend_radius=[none_to_nan(ppt.blend_radius) for ppt in ppts],
+                   extruder_toggle=[-1 if ppt.extruder_toggle is None else int(ppt.extruder_toggle) for ppt in ppts],
+                   is_feasible=[ppt.is_feasible for ppt in ppts],
+                   distance_to_support=[none_to_nan(ppt.distance_to_support) for ppt in ppts],
+                   closest_support_pt=[list(ppt.closest_support_pt) if ppt.closest_support_pt is not None
+                                       else [np.nan] * 3 for ppt in ppts],
+                   attributes=attributes if any(attributes) else None)
+
+    def to_printpoints_dict(self):
+        """
+        Creates the printpoints dict ('layer_%d' -> 'path_%d' -> list of PrintPoints) of the table.
+
+        Returns
+        -------
+        dict
+        """
+        ppts = self.to_printpoints()
+        printpoints_dict = {}
+        for i in range(self.number_of_layers):
+            layer_key = 'layer_%d' % i
+            printpoints_dict[layer_key] = {}
+            for j, p in enumerate(self.layer_path_indices(i)):
+                printpoints_dict[layer_key]['path_%d' % j] = ppts[self.path_offsets[p]:self.path_offsets[p + 1]]
+        return printpoints_dict
+
+    def to_printpoints(self, rows=None):
+        """
+        Creates the PrintPoints of the rows.
+
+        Parameters
+        ----------
+        rows: list, int (optional). If None, all the rows are converted.
+
+        Returns
+        -------
+        list, :class: 'compas_slicer.geometry.PrintPoint'
+        """
+        rows = np.arange(self.number_of_printpoints) if rows is None else np.asarray(rows, dtype=np.int64)
+        columns = {name: getattr(self, name)[rows].tolist() for name in self.vector_columns + self.float_columns}
+        toggles = self.extruder_toggle[rows].tolist()
+        is_feasible = self.is_feasible[rows].tolist()
+
+        ppts = []
+        for m, r in enumerate(rows.tolist()):
+            ppt = PrintPoint(pt=Point(*columns['pt'][m]), layer_height=columns['layer_height'][m],
+                             mesh_normal=Vector(*columns['mesh_normal'][m]))
+            ppt.up_vector = Vector(*columns['up_vector'][m])
+            ppt.extruder_toggle = None if toggles[m] < 0 else bool(toggles[m])
+            ppt.velocity = nan_to_none(columns['velocity'][m])
+            ppt.wait_time = nan_to_none(columns['wait_time'][m])
+            ppt.blend_radius = nan_to_none(columns['blend_radius'][m])
+            ppt.distance_to_support = nan_to_none(columns['distance_to_support'][m])
+            closest_support_pt = columns['closest_support_pt'][m]
+            if closest_support_pt[0] == closest_support_pt[0]:  # not nan
+                ppt.closest_support_pt = Point(*closest_support_pt)
+            ppt.is_feasible = is_feasible[m]
+            if self.attributes and self.attributes[r]:
+                ppt.attributes = self.attributes[r]
+            ppts.append(ppt)
+        return ppts
+
+
+def get_frames_axes(up_vectors, mesh_normals):
+    """
+    Computes the x and y axes of the frames of many printpoints at once, with x-axis pointing up and y-axis pointing
+    towards the mesh normal. The result is the same as the axes of PrintPoint.get_frame().
+
+    Parameters
+    ----------
+    up_vectors: np.array, float, (#printpoints x 3)
+    mesh_normals: np.array, float, (#printpoints x 3)
+
+    Returns
+    -------
+    np.array, float, (#printpoints x 3), the x axes of the frames
+    np.array, float, (#printpoints x 3), the y axes of the frames
+    """
+    u = np.asarray(up_vectors, dtype=np.float64).reshape((-1, 3))
+    n = np.array(mesh_normals, dtype=np.float64).reshape((-1, 3))
+
+    # in horizontal surfaces the up vector and the normal happen to be co-linear
+    co_linear = np.abs(u[:, 0] * n[:, 0] + u[:, 1] * n[:, 1] + u[:, 2] * n[:, 2]) >= 1.0
+
+    c = cross(u, n)
+    c[length(c) == 0] = (1.0, 0.0, 0.0)
+    n[length(n) == 0] = (0.0, 1.0, 0.0)
+    c[co_linear] = (1.0, 0.0, 0.0)
+    n[co_linear] = (0.0, 1.0, 0.0)
+
+    # same as the constructor of compas.geometry.Frame
+    x_axis = c / length(c)[:, None]
+    y = n / length(n)[:, None]
+    z = cross(x_axis, y)
+    z = z / length(z)[:, None]
+    y_axis = cross(z, x_axis)
+    return x_axis, y_axis
+
+
+def cross(u, v):
+    """ Row-wise cross product, same as compas.geometry.cross_vectors. """
+    return np.stack([u[:, 1] * v[:, 2] - u[:, 2] * v[:, 1],
+                     u[:, 2] * v[:, 0] - u[:, 0] * v[:, 2],
+                     u[:, 0] * v[:, 1] - u[:, 1] * v[:, 0]], axis=1)
+
+
+def length(v):
+    """ Row-wise length, same as compas.geometry.length_vector. """
+    return np.sqrt(v[:, 0] ** 2 + v[:, 1] ** 2 + v[:, 2] ** 2)
+
+
+def normalize_rows(v):
+    """ Row-wise normalization, same as compas.geometry.normalize_vector (zero rows stay zero). """
+    lengths = length(v)
+    lengths[lengths == 0] = 1.0
+    return v / lengths[:, None]
+
+
+def get_column(values, shape, default, dtype):
+    """ Returns np.array with the values, or filled with the default value if the values are None. """
+    if values is None:
+        return np.full(shape, default, dtype=dtype)
+    values = np.array(values, dtype=dtype).reshape(shape)
+    return values
+
+
+def none_to_nan(value):
+    return np.nan if value is None else value
+
+
+def nan_to_none(value):
+    return None if value != value else value
+
+
+if __name__ == "__main__":
+    pass
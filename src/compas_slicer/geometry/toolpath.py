@@ -0,0 +1,234 @@
+import logging
+import numpy as np
+from compas_slicer.geometry import Path, Layer, VerticalLayer
+
+logger = logging.getLogger('logger')
+
+__all__ = ['Toolpath']
+
+
+class Toolpath(object):
+    """
+    A Toolpath stores all the paths of a sliced print in a compact form, with the coordinates of all the points in
+    one contiguous array. The paths and the layers are ranges of that array, given by offsets arrays, in the same way
+    as a compressed sparse row (CSR) matrix:
+    the points of path i are coords[path_offsets[i]:path_offsets[i + 1]],
+    the paths of layer j are the paths with indices in range(layer_offsets[j], layer_offsets[j + 1]).
+
+    The counts and the bounds are computed once when the Toolpath is created, so reading them is O(1).
+    A Toolpath is a snapshot, it does not change if the layers that it was created from are modified afterwards.
+
+    Attributes
+    ----------
+    coords: np.array, float, (#points x 3)
+    path_offsets: np.array, int, (#paths + 1)
+    layer_offsets: np.array, int, (#layers + 1)
+    is_closed: np.array, bool, (#paths)
+    is_brim: np.array, bool, (#paths), True for the paths of brim layers
+    is_raft: np.array, bool, (#paths), True for the paths of raft layers
+    vertical_layer_id: np.array, int, (#paths), the id of the VerticalLayer of each path (-1 for other layers)
+    number_of_brim_offsets: np.array, int, (#layers), the number of brim offsets of each layer (-1 for None)
+    layer_height: float (optional)
+    """
+
+    def __init__(self, coords, path_offsets, layer_offsets, is_closed=None, is_brim=None, is_raft=None,
+                 vertical_layer_id=None, number_of_brim_offsets=None, layer_height=None):
+        self.coords = np.ascontiguousarray(coords, dtype=np.float64).reshape((-1, 3))
+        self.path_offsets = np.asarray(path_offsets, dtype=np.int64)
+        self.layer_offsets = np.asarray(layer_offsets, dtype=np.int64)
+        assert self.path_offsets[-1] == len(self.coords), 'The path offsets do not match the number of points.'
+        assert self.layer_offsets[-1] == len(self.path_offsets) - 1, 'The layer offsets do not match the paths.'
+
+        P, L = len(self.path_offsets) - 1, len(self.layer_offsets) - 1
+        self.is_closed = get_flags(is_closed, P, False, bool)
+        self.is_brim = get_flags(is_brim, P, False, bool)
+        self.is_raft = get_flags(is_raft, P, False, bool)
+        self.vertical_layer_id = get_flags(vertical_layer_id, P, -1, np.int64)
+        self.number_of_brim_offsets = get_flags(number_of_brim_offsets, L, -1, np.int64)
+        self.layer_height = layer_height
+
+        # counts and bounds
+        self._number_of_closed_paths = int(np.count_nonzero(self.is_closed))
+        if len(self.coords) > 0:
+            self._bounding_box = (self.coords.min(axis=0), self.coords.max(axis=0))
+        else:
+            self._bounding_box = (None, None)
+        self._layer_z_bounds = self.compute_layer_z_bounds()
+
+    def __repr__(self):
+        return "<Toolpath with %d layers, %d paths and %d points>" % (self.number_of_layers, self.number_of_paths[0],
+                                                                      self.number_of_points)
+
+    # --- Counts and bounds
+
+    @property
+    def number_of_points(self):
+        """ Returns int: Total number of points. """
+        return len(self.coords)
+
+    @property
+    def number_of_paths(self):
+        """ Returns tuple (int, int, int): Total number of paths, number of open paths, number of closed paths.
+        Same as BaseSlicer.number_of_paths. """
+        total = len(self.path_offsets) - 1
+        return total, self._number_of_closed_paths, total - self._number_of_closed_paths
+
+    @property
+    def number_of_layers(self):
+        """ Returns int: Total number of layers. """
+        return len(self.layer_offsets) - 1
+
+    @property
+    def bounding_box(self):
+        """ Returns tuple (np.array, np.array): The minimum and the maximum coordinates of all the points. """
+        return self._bounding_box
+
+    @property
+    def layer_z_bounds(self):
+        """ Returns np.array, float, (#layers x 2): The min and max z of each layer (nan for empty layers). """
+        return self._layer_z_bounds
+
+    def compute_layer_z_bounds(self):
+        """ Computes the min and max z of the points of each layer. """
+        z_bounds = np.full((self.number_of_layers, 2), np.nan)
+        point_offsets = self.path_offsets[self.layer_offsets]  # the first point of each layer
+        non_empty = point_offsets[1:] > point_offsets[:-1]
+        if np.any(non_empty):
+            z = self.coords[:, 2]
+            starts = point_offsets[:-1][non_empty]
+            z_bounds[non_empty, 0] = np.minimum.reduceat(z, starts)
+            z_bounds[non_empty, 1] = np.maximum.reduceat(z, starts)
+        return z_bounds
+
+    # --- Access
+
+    def path_coords(self, path_index):
+        """ Returns np.array, float, (#points x 3), the coordinates of the path (a view of self.coords). """
+        return self.coords[self.path_offsets[path_index]:self.path_offsets[path_index + 1]]
+
+    def layer_path_indices(self, layer_index):
+        """ Returns range, int, the indices of the paths of the layer. """
+        return range(self.layer_offsets[layer_index], self.layer_offsets[layer_index + 1])
+
+    # --- Conversion from and to layers
+
+    @classmethod
+    def from_layers(cls, layers, layer_height=None):
+        """
+        Creates a Toolpath from a list of layers, i.e. the layers of a slicer.
+
+        Parameters
+        ----------
+        layers: list, :class: 'compas_slicer.geometry.Layer' or 'compas_slicer.geometry.VerticalLayer'
+        layer_height: float (optional)
+
+        Returns
+        -------
+        :class: 'compas_slicer.geometry.Toolpath'
+        """
+        paths = [path for layer in layers for path in layer.paths]
+        all_coords = [path.coords for path in paths]
+        counts = [len(coords) for coords in all_coords]
+        paths_per_layer = [len(layer.paths) for layer in layers]
+
+        is_vertical = [isinstance(layer, VerticalLayer) for layer in layers]
+        vertical_ids = [layer.id if vertical and layer.id is not None else -1
+                        for layer, vertical in zip(layers, is_vertical)]
+        brim_offsets = [getattr(layer, 'number_of_brim_offsets', None) for layer in layers]
+        return cls(coords=np.concatenate(all_coords) if len(all_coords) > 0 else np.zeros((0, 3)),
+                   path_offsets=np.concatenate([[0], np.cumsum(counts, dtype=np.int64)]),
+                   layer_offsets=np.concatenate([[0], np.cumsum(paths_per_layer, dtype=np.int64)]),
+                   is_closed=[bool(path.is_closed) for path in paths],
+                   is_brim=np.repeat([bool(getattr(layer, 'is_brim', False)) for layer in layers], paths_per_layer),
+                   is_raft=np.repeat([bool(getattr(layer, 'is_raft', False)) for layer in layers], paths_per_layer),
+                   vertical_layer_id=np.repeat(vertical_ids, paths_per_layer),
+                   number_of_brim_offsets=[-1 if n is None else n for n in brim_offsets],
+                   layer_height=layer_height)
+
+    def to_layers(self, vertical=None):
+        """
+        Creates the list of layers of the Toolpath. The paths are backed by (views of) a copy of self.coords.
+
+        Parameters
+        ----------
+        vertical: bool (optional)
+            If True, VerticalLayers are created. If False, Layers are created. If None, a layer is vertical if its
+            paths have a vertical_layer_id.
+
+        Returns
+        -------
+        list, :class: 'compas_slicer.geometry.Layer' or 'compas_slicer.geometry.VerticalLayer'
+        """
+        coords = self.coords.copy()
+        paths = [Path.from_coords(coords[self.path_offsets[i]:self.path_offsets[i + 1]], is_closed=bool(closed))
+                 for i, closed in enumerate(self.is_closed.tolist())]
+
+        layers = []
+        for j in range(self.number_of_layers):
+            start, end = self.layer_offsets[j], self.layer_offsets[j + 1]
+            vertical_id = int(self.vertical_layer_id[start]) if end > start else -1
+            if vertical or (vertical is None and vertical_id >= 0):
+                layer = VerticalLayer(id=max(vertical_id, 0), paths=paths[start:end])
+                if end > start:
+                    layer.compute_head_centroid()
+            else:
+                layer = Layer(paths=paths[start:end])
+            if end > start:
+                layer.is_brim = bool(self.is_brim[start])
+                layer.is_raft = bool(self.is_raft[start])
+            if self.number_of_brim_offsets[j] >= 0:
+                layer.number_of_brim_offsets = int(self.number_of_brim_offsets[j])
+            layers.append(layer)
+        return layers
+
+    # --- To data, from data
+
+    @classmethod
+    def from_data(cls, data):
+        """Construct a toolpath from its data representation.
+
+        Parameters
+        ----------
+        data: dict
+            The data dictionary.
+
+        Returns
+        -------
+        toolpath
+            The constructed toolpath.
+        """
+        return cls(coords=data['coords'], path_offsets=data['path_offsets'], layer_offsets=data['layer_offsets'],
+                   is_closed=data['is_closed'], is_brim=data['is_brim'], is_raft=data['is_raft'],
+                   vertical_layer_id=data['vertical_layer_id'], number_of_brim_offsets=data['number_of_brim_offsets'],
+                   layer_height=data['layer_height'])
+
+    def to_data(self):
+        """Returns a dictionary of structured data representing the data structure.
+
+        Returns
+        -------
+        dict
+            The toolpath's data.
+        """
+        return {'coords': self.coords.tolist(),
+                'path_offsets': self.path_offsets.tolist(),
+                'layer_offsets': self.layer_offsets.tolist(),
+                'is_closed': self.is_closed.tolist(),
+                'is_brim': self.is_brim.tolist(),
+                'is_raft': self.is_raft.tolist(),
+                'vertical_layer_id': self.vertical_layer_id.tolist(),
+                'number_of_brim_offsets': self.number_of_brim_offsets.tolist(),
+                'layer_height': self.layer_height}
+
+
+def get_flags(values, length, default, dtype):
+    """ Returns np.array with the values, or filled with the default value if the values are None. """
+    if values is None:
+        return np.full(length, default, dtype=dtype)
+    values = np.asarray(values, dtype=dtype).reshape(-1)
+    assert len(values) == length, 'Wrong number of flags: %d instead of %d' % (len(values), length)
+    return values
+
+
+if __name__ == "__main__":
+    pass
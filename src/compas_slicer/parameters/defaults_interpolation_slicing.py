@@ -12,10 +12,17 @@ def interpolation_slicing_default_param(key):
 
 default_parameters = \
     {
-        # geodesics method
+        # geodesics method, 'exact_igl', 'heat' or 'heat_fast'
         'target_LOW_geodesics_method': 'exact_igl',
         'target_HIGH_geodesics_method': 'exact_igl',
 
+        # on-disk cache of the geodesic distances, in the folder output/geodesics_cache. Opt-in, because it writes up
+        # to geodesics_cache_max_size bytes of .npy files
+        'geodesics_cache': False,
+        'geodesics_cache_max_size': 512 * 1024 ** 2,  # bytes
+        # number of processes for the 'exact_igl' geodesics of the target neighborhoods, None computes them in series
+        'geodesics_workers': None,
+
         # union method for HIGH target
         # if all are false, then default 'min' method is used
         'target_HIGH_smooth_union': [False, [10.0]],  # blend radius
@@ -10,6 +10,7 @@ from compas_slicer.pre_processing import get_existing_cut_indices, get_vertices_
 import compas_slicer.utilities as utils
 from compas_slicer.parameters import get_param
 from compas_slicer.pre_processing.preprocessing_utils import assign_interpolation_distance_to_mesh_vertices
+from compas_slicer.pre_processing.preprocessing_utils import GeodesicsCache
 
 logger = logging.getLogger('logger')
 
@@ -48,6 +49,15 @@ class InterpolationSlicingPreprocessor:
     def create_compound_targets(self):
         """ Creates the target_LOW and the target_HIGH and computes the geodesic distances. """
 
+        # --- cache of the geodesic distances, that are reused when the same mesh and targets are processed again
+        geodesics_cache = None
+        if get_param(self.parameters, key='geodesics_cache', defaults_type='interpolation_slicing'):
+            geodesics_cache = GeodesicsCache(os.path.join(self.OUTPUT_PATH, 'geodesics_cache'),
+                                             max_size=get_param(self.parameters, key='geodesics_cache_max_size',
+                                                                defaults_type='interpolation_slicing'))
+
+        geodesics_workers = get_param(self.parameters, key='geodesics_workers', defaults_type='interpolation_slicing')
+
         # --- low target
         geodesics_method = get_param(self.parameters, key='target_LOW_geodesics_method',
                                      defaults_type='interpolation_slicing')
@@ -55,7 +65,9 @@ class InterpolationSlicingPreprocessor:
         self.target_LOW = CompoundTarget(self.mesh, 'boundary', 1, self.DATA_PATH,
                                          union_method=method,
                                          union_params=params,
-                                         geodesics_method=geodesics_method)
+                                         geodesics_method=geodesics_method,
+                                         geodesics_cache=geodesics_cache,
+                                         geodesics_workers=geodesics_workers)
 
         # --- high target
         geodesics_method = get_param(self.parameters, key='target_HIGH_geodesics_method',
@@ -65,7 +77,9 @@ class InterpolationSlicingPreprocessor:
         self.target_HIGH = CompoundTarget(self.mesh, 'boundary', 2, self.DATA_PATH,
                                           union_method=method,
                                           union_params=params,
-                                          geodesics_method=geodesics_method)
+                                          geodesics_method=geodesics_method,
+                                          geodesics_cache=geodesics_cache,
+                                          geodesics_workers=geodesics_workers)
 
         # --- uneven boundaries of high target
         self.target_HIGH.offset = get_param(self.parameters, key='uneven_upper_targets_offset',
@@ -174,8 +188,7 @@ class InterpolationSlicingPreprocessor:
             print("")
             logger.info("--- Topological sort of meshes directed graph to determine print order")
             graph = topo_sort.MeshDirectedGraph(self.split_meshes, self.DATA_PATH)
-            all_orders = graph.get_all_topological_orders()
-            selected_order = all_orders[0]
+            selected_order = graph.get_best_order()
             logger.info('selected_order : ' + str(selected_order))  # TODO: improve the way an order is selected
             self.cleanup_mesh_attributes_based_on_selected_order(selected_order, graph)
 
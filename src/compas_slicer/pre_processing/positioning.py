@@ -1,6 +1,7 @@
 from compas.geometry import Frame, Point
 from compas.geometry import Transformation
 from compas.datastructures import mesh_bounding_box
+from compas_slicer.utilities import invalidate_mesh_caches
 
 import logging
 
@@ -28,6 +29,7 @@ def move_mesh_to_point(mesh, target_point):
 
     T = Transformation.from_frame_to_frame(mesh_frame, target_frame)
     mesh.transform(T)
+    invalidate_mesh_caches(mesh)  # the vertex coordinates changed in place
 
     logger.info("Mesh moved to: " + str(target_point))
 
@@ -3,6 +3,7 @@ from __future__ import division
 from __future__ import print_function
 
 from .mesh_attributes_handling import *  # noqa: F401 E402 F403
+from .geodesics_cache import *  # noqa: F401 E402 F403
 from .compound_target import *  # noqa: F401 E402 F403
 from .geodesics import *  # noqa: F401 E402 F403
 from .assign_vertex_distance import *  # noqa: F401 E402 F403
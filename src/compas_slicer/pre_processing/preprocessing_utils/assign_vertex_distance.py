@@ -1,17 +1,21 @@
 import logging
 from compas_slicer.pre_processing.preprocessing_utils import blend_union_list, stairs_union_list, chamfer_union_list
+from compas_slicer.pre_processing.preprocessing_utils import get_union_of_distances
 from compas_slicer.utilities.utils import remap_unbound
 import numpy as np
 
 logger = logging.getLogger('logger')
 
 __all__ = ['assign_interpolation_distance_to_mesh_vertices',
-           'assign_interpolation_distance_to_mesh_vertex']
+           'assign_interpolation_distance_to_mesh_vertex',
+           'get_interpolation_distances',
+           'get_interpolation_distances_batch',
+           'get_interpolation_distances_of_vertices']
 
 
 def assign_interpolation_distance_to_mesh_vertices(mesh, weight, target_LOW, target_HIGH):
     """
-    Fills in the 'get_distance' attribute of every vertex of the mesh.
+    Fills in the 'scalar_field' attribute of every vertex of the mesh with the interpolation distance.
 
     Parameters
     ----------
@@ -22,10 +26,112 @@ def assign_interpolation_distance_to_mesh_vertices(mesh, weight, target_LOW, tar
         The lower compound target.
     target_HIGH:  :class: 'compas_slicer.pre_processing.CompoundTarget'
         The upper compound target.
+
+    Returns
+    ----------
+    np.array, float, the distances that were assigned, see get_interpolation_distances
     """
-    for i, vkey in enumerate(mesh.vertices()):
-        d = assign_interpolation_distance_to_mesh_vertex(vkey, weight, target_LOW, target_HIGH)
+    distances = get_interpolation_distances(mesh, weight, target_LOW, target_HIGH)
+    for vkey, d in zip(mesh.vertices(), distances.tolist()):
         mesh.vertex[vkey]['scalar_field'] = d
+    return distances
+
+
+def get_interpolation_distances(mesh, weight, target_LOW, target_HIGH):
+    """
+    Computes the interpolation distance of every vertex of the mesh, without writing it to the mesh.
+    The result can be passed directly to ScalarFieldContours(mesh, scalar_field=distances).
+
+    Parameters
+    ----------
+    mesh: :class: 'compas.datastructures.Mesh'
+    weight: float,
+        The weighting of the distances from the lower and the upper target, from 0 to 1.
+    target_LOW: :class: 'compas_slicer.pre_processing.CompoundTarget'
+        The lower compound target.
+    target_HIGH:  :class: 'compas_slicer.pre_processing.CompoundTarget'
+        The upper compound target.
+
+    Returns
+    ----------
+    np.array, float, one distance per vertex, in the order of mesh.vertices()
+    """
+    return get_interpolation_distances_batch(mesh, [weight], target_LOW, target_HIGH)[0]
+
+
+def get_interpolation_distances_batch(mesh, weights, target_LOW, target_HIGH):
+    """
+    Computes the interpolation distances of every vertex of the mesh for several weights at once, with array
+    operations over all the vertices (and over all the clusters of the targets). The distances are the same as the
+    ones of assign_interpolation_distance_to_mesh_vertex for each vertex and weight.
+
+    Parameters
+    ----------
+    mesh: :class: 'compas.datastructures.Mesh'
+    weights: list, float,
+        The weightings of the distances from the lower and the upper target, from 0 to 1.
+    target_LOW: :class: 'compas_slicer.pre_processing.CompoundTarget'
+        The lower compound target.
+    target_HIGH:  :class: 'compas_slicer.pre_processing.CompoundTarget', or None
+        The upper compound target. If None, the distances of the lower target are offset instead.
+
+    Returns
+    ----------
+    np.array, float, (#weights x #V), one row of distances per weight, in the order of mesh.vertices()
+    """
+    return get_interpolation_distances_of_vertices(list(mesh.vertices()), weights, target_LOW, target_HIGH)
+
+
+def get_interpolation_distances_of_vertices(vkeys, weights, target_LOW, target_HIGH):
+    """
+    Computes the interpolation distances of the given vertices for several weights at once, see
+    get_interpolation_distances_batch. Evaluating a few vertices over many weights is much cheaper than evaluating the
+    whole mesh, which is useful when searching for the weights whose iso-contours pass through these vertices.
+
+    Parameters
+    ----------
+    vkeys: list, int, the vertex keys
+    weights: list, float,
+        The weightings of the distances from the lower and the upper target, from 0 to 1.
+    target_LOW: :class: 'compas_slicer.pre_processing.CompoundTarget'
+        The lower compound target.
+    target_HIGH:  :class: 'compas_slicer.pre_processing.CompoundTarget', or None
+        The upper compound target. If None, the distances of the lower target are offset instead.
+
+    Returns
+    ----------
+    np.array, float, (#weights x #vkeys), one row of distances per weight, in the order of vkeys
+    """
+    vkeys = np.array(vkeys, dtype=np.int64)
+    weights = np.array(weights, dtype=np.float64).reshape((-1, 1))
+
+    if target_LOW and target_HIGH:  # then interpolate targets
+        d_low = target_LOW.get_union_distances()[vkeys]
+
+        # --- calculation with uneven weights
+        if target_HIGH.has_uneven_weights:
+            ds_high = target_HIGH.get_clusters_distances()[:, vkeys]
+            if target_HIGH.number_of_boundaries > 1:
+                # the weight of every cluster, same as remap_unbound(weight, 0, weight_max, 0, 1), (#weights x #clusters)
+                weights_max = np.array(target_HIGH.weight_max_per_cluster, dtype=np.float64)
+                cluster_weights = weights / weights_max
+            else:
+                cluster_weights = weights
+
+            # the distances of the clusters are generated one at a time, and reduced with the union method
+            distances = ((cluster_weights[:, i, np.newaxis] - 1) * d_low + cluster_weights[:, i, np.newaxis] * d_high
+                         for i, d_high in enumerate(ds_high))
+            return get_union_of_distances(distances, target_HIGH.union_method, target_HIGH.union_params)
+
+        # --- simple calculation (without uneven weights)
+        d_high = target_HIGH.get_union_distances()[vkeys]
+        return (d_low * (1 - weights)) - (d_high * weights)
+
+    elif target_LOW:  # then offset target
+        offset = weights * target_LOW.get_max_dist()
+        return target_LOW.get_union_distances()[vkeys] - offset
+    else:
+        raise ValueError('You need to provide at least one target')
 
 
 def assign_interpolation_distance_to_mesh_vertex(vkey, weight, target_LOW, target_HIGH):
@@ -1,18 +1,21 @@
 import numpy as np
 import math
+import functools
 from compas.datastructures import Mesh
 import compas_slicer.utilities as utils
 import logging
 import networkx as nx
 from compas_slicer.slicers.slice_utilities import create_graph_from_mesh_vkeys
-from compas_slicer.pre_processing.preprocessing_utils.geodesics import get_igl_EXACT_geodesic_distances, \
-    get_custom_HEAT_geodesic_distances
+from compas_slicer.pre_processing.preprocessing_utils.geodesics import get_igl_EXACT_geodesic_distances_batch, \
+    get_custom_HEAT_geodesic_distances, get_fast_HEAT_geodesic_distances_batch
+from compas_slicer.pre_processing.preprocessing_utils.geodesics_cache import get_geodesics_cache_key
 
 import statistics
 
 logger = logging.getLogger('logger')
 
 __all__ = ['CompoundTarget',
+           'get_union_of_distances',
            'blend_union_list',
            'stairs_union_list',
            'chamfer_union_list']
@@ -39,12 +42,20 @@ class CompoundTarget:
     geodesics_method: str
         'exact_igl'  exact igl geodesic distances
         'heat'   custom heat geodesic distances
+        'heat_fast'   heat geodesic distances with the operators of the mesh factorized once and shared by all the
+                      neighborhoods and targets of the mesh
     anisotropic_scaling: bool
         This is not yet implemented
+    geodesics_cache: :class: 'compas_slicer.pre_processing.GeodesicsCache', or None
+        If provided, the geodesic distances of each neighborhood are read from the cache when they have already been
+        computed for the same mesh, neighborhood and method, and they are stored in it otherwise.
+    geodesics_workers: int, or None
+        The number of processes that compute the 'exact_igl' geodesic distances of the neighborhoods. If None, they
+        are computed one after the other. The 'heat_fast' distances of all the neighborhoods are always solved together.
     """
 
     def __init__(self, mesh, v_attr, value, DATA_PATH, union_method='min', union_params=[],
-                 geodesics_method='exact_igl', anisotropic_scaling=False):
+                 geodesics_method='exact_igl', anisotropic_scaling=False, geodesics_cache=None, geodesics_workers=None):
 
         logger.info('Creating target with attribute : ' + v_attr + '=%d' % value)
         logger.info('union_method : ' + union_method + ', union_params =  ' + str(union_params))
@@ -59,6 +70,8 @@ class CompoundTarget:
 
         self.geodesics_method = geodesics_method
         self.anisotropic_scaling = anisotropic_scaling  # Anisotropic scaling not yet implemented
+        self.geodesics_cache = geodesics_cache
+        self.geodesics_workers = geodesics_workers
 
         self.offset = 0
         self.VN = len(list(self.mesh.vertices()))
@@ -72,10 +85,11 @@ class CompoundTarget:
 
         # geodesic distances
         # filled in by function 'self.update_distances_lists()'
-        self._distances_lists = []  # nested list. Shape: number_of_boundaries x number_of_vertices
-        self._distances_lists_flipped = []  # nested list. Shape: number_of_vertices x number_of_boundaries
-        self._np_distances_lists_flipped = np.array([])  # numpy array of self._distances_lists_flipped
+        self._distances = np.zeros((0, self.VN))  # np.array, float. Shape: number_of_boundaries x number_of_vertices
         self._max_dist = None  # maximum get_distance value from the target on any vertex of the mesh
+        # the union of the distances of all the boundaries, memoized until union_method or union_params change
+        self._union_distances = None  # np.array, float. Shape: number_of_vertices
+        self._union_key = None  # (union_method, union_params) of self._union_distances
 
         # compute
         self.find_targets_connected_components()
@@ -108,29 +122,63 @@ class CompoundTarget:
         Computes the geodesic distances from each of the target's neighborhoods  to all the mesh vertices.
         Fills in the distances attributes.
         """
-        if self.geodesics_method == 'exact_igl':
-            distances_lists = [get_igl_EXACT_geodesic_distances(self.mesh, vstarts) for vstarts in
-                               self.clustered_vkeys]
-        elif self.geodesics_method == 'heat':
-            distances_lists = [get_custom_HEAT_geodesic_distances(self.mesh, vstarts, self.OUTPUT_PATH) for vstarts in
-                               self.clustered_vkeys]
-        else:
+        if self.geodesics_method not in ['exact_igl', 'heat', 'heat_fast']:
             raise ValueError('Unknown geodesics method : ' + self.geodesics_method)
 
-        distances_lists = [list(dl) for dl in distances_lists]  # number_of_boundaries x #V
-        self.update_distances_lists(distances_lists)
+        self.update_distances_lists(self.get_clusters_geodesic_distances(self.clustered_vkeys))
+
+    def get_clusters_geodesic_distances(self, clusters):
+        """
+        Returns np.array, float, (#clusters x #V), the geodesic distances from each cluster of vertices to all the mesh
+        vertices. The distances that are found in the geodesics_cache of the target are read from it, and all the
+        others are computed in one batch and stored in it.
+
+        Parameters
+        ----------
+        clusters: list of lists, int, the vertex indices of each cluster
+        """
+        distances = np.zeros((len(clusters), self.VN))
+        keys = [None for _ in clusters]
+        missing = list(range(len(clusters)))
+        if self.geodesics_cache is not None:
+            keys = [get_geodesics_cache_key(self.mesh, vstarts, self.geodesics_method) for vstarts in clusters]
+            missing = []
+            for i, key in enumerate(keys):
+                cached = self.geodesics_cache.get(key)
+                if cached is not None and len(cached) == self.VN:
+                    logger.info('Geodesic distances found in cache : ' + key)
+                    distances[i] = cached
+                else:
+                    missing.append(i)
+
+        if len(missing) > 0:
+            vstarts_list = [clusters[i] for i in missing]
+            if self.geodesics_method == 'exact_igl':
+                computed = get_igl_EXACT_geodesic_distances_batch(self.mesh, vstarts_list, self.geodesics_workers)
+            elif self.geodesics_method == 'heat':
+                computed = [get_custom_HEAT_geodesic_distances(self.mesh, vstarts, self.OUTPUT_PATH)
+                            for vstarts in vstarts_list]
+            else:  # 'heat_fast'
+                computed = get_fast_HEAT_geodesic_distances_batch(self.mesh, vstarts_list)
+
+            for i, cluster_distances in zip(missing, computed):
+                distances[i] = cluster_distances
+                if keys[i] is not None:
+                    self.geodesics_cache.put(keys[i], distances[i])
+        return distances
 
     def update_distances_lists(self, distances_lists):
         """
         Fills in the distances attributes.
+
+        Parameters
+        ----------
+        distances_lists: np.array, float, (number_of_boundaries x #V), or nested list with the same shape
         """
-        self._distances_lists = distances_lists
-        self._distances_lists_flipped = []  # empty
-        for i in range(self.VN):
-            current_values = [self._distances_lists[list_index][i] for list_index in range(self.number_of_boundaries)]
-            self._distances_lists_flipped.append(current_values)
-        self._np_distances_lists_flipped = np.array(self._distances_lists_flipped)
-        self._max_dist = np.max(self._np_distances_lists_flipped)
+        self._distances = np.array(distances_lists, dtype=np.float64).reshape((self.number_of_boundaries, self.VN))
+        self._distances.flags.writeable = False
+        self._max_dist = np.max(self._distances)
+        self._union_distances = None
 
     #  --- Uneven weights
     @property
@@ -162,8 +210,9 @@ class CompoundTarget:
         That is the average of the distances of the vertices of that boundary neighborhood from the other_target.
         """
         distances = []
+        other_distances = other_target.get_union_distances()
         for vi_starts in self.clustered_vkeys:
-            ds = [other_target.get_distance(vi) for vi in vi_starts]
+            ds = other_distances[vi_starts].tolist()
             if avg_type == 'mean':
                 distances.append(statistics.mean(ds))
             else:  # 'median'
@@ -174,10 +223,7 @@ class CompoundTarget:
         """
         Returns the minimum and maximum distance of the vertices of this target from the other_target
         """
-        extreme_distances = []
-        for v_index in other_target.all_target_vkeys:
-            extreme_distances.append(self.get_all_distances()[v_index])
-        return np.average(np.array(extreme_distances))
+        return np.average(self.get_union_distances()[other_target.all_target_vkeys])
 
     #############################
     #  --- get all distances
@@ -185,11 +231,28 @@ class CompoundTarget:
     # All distances
     def get_all_distances(self):
         """ Returns the resulting distances per every vertex. """
-        return [self.get_distance(i) for i in range(self.VN)]
+        return self.get_union_distances().tolist()
+
+    def get_union_distances(self):
+        """
+        Returns np.array, float, (number_of_vertices), the resulting distances per every vertex, i.e. the union of the
+        distances of all the boundaries with the union_method. It is computed once, and then reused until the
+        union_method or the union_params change. The array is read-only.
+        """
+        union_key = (self.union_method, tuple(self.union_params))
+        if self._union_distances is None or self._union_key != union_key:
+            self._union_distances = get_union_of_distances(self._distances, self.union_method, self.union_params)
+            self._union_distances.flags.writeable = False
+            self._union_key = union_key
+        return self._union_distances
 
     def get_all_clusters_distances_dict(self):
         """ Returns dict. keys: index of connected target neighborhood, value: list, distances (one per vertex). """
-        return {i: self._distances_lists[i] for i in range(self.number_of_boundaries)}
+        return {i: self._distances[i].tolist() for i in range(self.number_of_boundaries)}
+
+    def get_clusters_distances(self):
+        """ Returns np.array, float, (number_of_boundaries x number_of_vertices), read-only, distances per cluster. """
+        return self._distances
 
     def get_max_dist(self):
         """ Returns the maximum distance that the target has on a mesh vertex. """
@@ -200,25 +263,11 @@ class CompoundTarget:
 
     def get_all_distances_for_vkey(self, i):
         """ Returns distances from each cluster separately for vertex i. Smooth union doesn't play here any role. """
-        return [self._distances_lists[list_index][i] for list_index in range(self.number_of_boundaries)]
+        return self._distances[:, i].tolist()
 
     def get_distance(self, i):
         """ Return get_distance for vertex with vkey i. """
-        if self.union_method == 'min':
-            # --- simple union
-            return np.min(self._np_distances_lists_flipped[i])
-        elif self.union_method == 'smooth':
-            # --- blend (smooth) union
-            return blend_union_list(values=self._np_distances_lists_flipped[i], r=self.union_params[0])
-        elif self.union_method == 'chamfer':
-            # --- blend (smooth) union
-            return chamfer_union_list(values=self._np_distances_lists_flipped[i], r=self.union_params[0])
-        elif self.union_method == 'stairs':
-            # --- stairs union
-            return stairs_union_list(values=self._np_distances_lists_flipped[i], r=self.union_params[0],
-                                     n=self.union_params[1])
-        else:
-            raise ValueError("Unknown Union method : ", self.union_method)
+        return self.get_union_distances()[i]
 
     #############################
     #  --- scalar field smoothing
@@ -226,16 +275,13 @@ class CompoundTarget:
     def laplacian_smoothing(self, iterations, strength):
         """ Smooth the distances on the mesh, using iterative laplacian smoothing. """
         L = utils.get_mesh_cotmatrix_igl(self.mesh, fix_boundaries=True)
-        new_distances_lists = []
 
         logger.info('Laplacian smoothing of all distances')
-        for i, a in enumerate(self._distances_lists):
-            a = np.array(a)  # a: numpy array containing the attribute to be smoothed
-            for _ in range(iterations):  # iterative smoothing
-                a_prime = a + strength * L * a
-                a = a_prime
-            new_distances_lists.append(list(a))
-        self.update_distances_lists(new_distances_lists)
+        a = self._distances.T  # a: numpy array containing the attributes to be smoothed, one column per boundary
+        strength_L = strength * L
+        for _ in range(iterations):  # iterative smoothing
+            a = a + strength_L @ a
+        self.update_distances_lists(a.T)
 
     #############################
     #  ------ output
@@ -259,8 +305,41 @@ class CompoundTarget:
         self.VN = len(list(self.mesh.vertices()))
 
 
+####################
+#  unions of all the distances
+
+def get_union_of_distances(distances, union_method, union_params):
+    """
+    Returns np.array, float, the union of the distances of all the boundaries for every vertex.
+
+    Parameters
+    ----------
+    distances: np.array, float, (number_of_boundaries x #V), or an iterable with the distances array of each boundary
+        (all with the same shape), that is reduced one boundary at a time.
+    union_method: str, 'min', 'smooth', 'chamfer' or 'stairs'
+    union_params: list, the parameters of the union method
+    """
+    if union_method == 'min':
+        # --- simple union
+        if isinstance(distances, np.ndarray):
+            return np.min(distances, axis=0)
+        return functools.reduce(np.minimum, distances)
+    elif union_method == 'smooth':
+        # --- blend (smooth) union
+        return blend_union_list(values=distances, r=union_params[0])
+    elif union_method == 'chamfer':
+        # --- chamfer union
+        return chamfer_union_list(values=distances, r=union_params[0])
+    elif union_method == 'stairs':
+        # --- stairs union
+        return stairs_union_list(values=distances, r=union_params[0], n=union_params[1])
+    else:
+        raise ValueError("Unknown Union method : ", union_method)
+
+
 ####################
 #  unions on lists
+#  The values can also be an array (number_of_values x #V), which is reduced over its first axis for all the vertices.
 
 def blend_union_list(values, r):
     """ Returns a smooth union of all the elements in the list, with blend radius blend_radius. """
@@ -288,22 +367,24 @@ def chamfer_union_list(values, r):
 ####################
 #  unions on pairs
 
+#  The elements can be floats or arrays of floats.
+
 def blend_union(da, db, r):
     """ Returns a smooth union of the two elements da, db with blend radius blend_radius. """
-    e = max(r - abs(da - db), 0)
-    return min(da, db) - e * e * 0.25 / r
+    e = np.maximum(r - np.abs(da - db), 0)
+    return np.minimum(da, db) - e * e * 0.25 / r
 
 
 def chamfer_union(a, b, r):
     """ Returns a chamfer union of the two elements da, db with radius r. """
-    return min(min(a, b), (a - r + b) * math.sqrt(0.5))
+    return np.minimum(np.minimum(a, b), (a - r + b) * math.sqrt(0.5))
 
 
 def stairs_union(a, b, r, n):
     """ Returns a stairs union of the two elements da, db with radius r. """
     s = r / n
     u = b - r
-    return min(min(a, b), 0.5 * (u + a + abs((u - a + s) % (2 * s) - s)))
+    return np.minimum(np.minimum(a, b), 0.5 * (u + a + np.abs(np.mod(u - a + s, 2 * s) - s)))
 
 
 if __name__ == "__main__":
@@ -4,12 +4,24 @@ import compas_slicer.utilities as utils
 from compas_slicer.pre_processing.preprocessing_utils.gradient import get_scalar_field_from_gradient, \
     get_face_gradient_from_scalar_field, normalize_gradient
 import scipy
+import scipy.sparse
+import scipy.sparse.csgraph
+import scipy.sparse.linalg
 import math
+import multiprocessing
+import weakref
+from compas_slicer.utilities.mesh_query import MeshSignature
 
 logger = logging.getLogger('logger')
 
 __all__ = ['get_igl_EXACT_geodesic_distances',
-           'get_custom_HEAT_geodesic_distances']
+           'get_custom_HEAT_geodesic_distances',
+           'get_igl_EXACT_geodesic_distances_batch',
+           'get_fast_HEAT_geodesic_distances',
+           'get_fast_HEAT_geodesic_distances_batch',
+           'HeatGeodesicsSolver',
+           'get_heat_geodesics_solver',
+           'invalidate_heat_geodesics_solver']
 
 
 def get_igl_EXACT_geodesic_distances(mesh, vertices_start):
@@ -33,6 +45,54 @@ def get_igl_EXACT_geodesic_distances(mesh, vertices_start):
     return distances
 
 
+def get_igl_EXACT_geodesic_distances_batch(mesh, vertices_starts, workers=None):
+    """
+    Calculate the geodesic distances from several sets of sources using libigl, optionally on a pool of processes.
+
+    Parameters
+    ----------
+    mesh: :class: 'compas.datastructures.Mesh'
+    vertices_starts: list of lists, int, one list of source vertices per distance field
+    workers: int (optional), the number of processes. If None, the distance fields are computed one after the other.
+
+    Returns
+    ----------
+    np.array, float, (#vertices_starts x #V), one distance field per set of sources.
+    """
+    if not workers or workers < 2 or len(vertices_starts) < 2:
+        return np.array([get_igl_EXACT_geodesic_distances(mesh, vstarts) for vstarts in vertices_starts],
+                        dtype=np.float64).reshape((len(vertices_starts), -1))
+
+    from compas_slicer.slicers.slice_utilities.parallel_contours import SharedArrays
+    v, f = mesh.to_vertices_and_faces()
+    arrays = {'V': np.array(v, dtype=np.float64), 'F': np.array(f, dtype=np.int64)}
+    with SharedArrays(arrays) as shared:
+        with multiprocessing.Pool(min(workers, len(vertices_starts)), initializer=_init_geodesics_worker,
+                                  initargs=(shared.descriptor,)) as pool:
+            distances = pool.map(_exact_geodesic_task, [list(vstarts) for vstarts in vertices_starts])
+    return np.array(distances, dtype=np.float64).reshape((len(vertices_starts), -1))
+
+
+_WORKER_ARRAYS = {}  # name : np.array, the shared arrays attached by the worker process
+_WORKER_BLOCKS = []  # the shared memory blocks need to stay referenced while their arrays are used
+
+
+def _init_geodesics_worker(descriptor):
+    """ Attaches the shared vertex and face arrays once per worker process. """
+    from multiprocessing import shared_memory
+    for name, (block_name, shape, dtype) in descriptor.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        _WORKER_BLOCKS.append(block)
+        _WORKER_ARRAYS[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+
+def _exact_geodesic_task(vertices_start):
+    """ Computes one exact distance field in a worker process. """
+    import igl
+    V, F = _WORKER_ARRAYS['V'], _WORKER_ARRAYS['F']
+    return igl.exact_geodesic(V, F, np.array(vertices_start), np.arange(len(V)))
+
+
 def get_custom_HEAT_geodesic_distances(mesh, vi_sources, OUTPUT_PATH, v_equalize=None, anisotropic_scaling=False):
     """ Calculate geodesic distances using the heat method. """
     geodesics_solver = GeodesicsSolver(mesh, OUTPUT_PATH)
@@ -41,6 +101,26 @@ def get_custom_HEAT_geodesic_distances(mesh, vi_sources, OUTPUT_PATH, v_equalize
     return geodesic_dist
 
 
+def get_fast_HEAT_geodesic_distances(mesh, vi_sources, v_equalize=None):
+    """
+    Calculate geodesic distances using the heat method, with the operators of the mesh factorized once and reused
+    for all the sources (see HeatGeodesicsSolver).
+    """
+    return get_heat_geodesics_solver(mesh).get_geodesic_distances(vi_sources, v_equalize)
+
+
+def get_fast_HEAT_geodesic_distances_batch(mesh, vi_sources_list, v_equalize=None):
+    """
+    Calculate the geodesic distances from several sets of sources using the heat method. All the distance fields are
+    solved together, as the columns of the right-hand sides of the factorized operators (see HeatGeodesicsSolver).
+
+    Returns
+    ----------
+    np.array, float, (#vi_sources_list x #V), one distance field per set of sources.
+    """
+    return get_heat_geodesics_solver(mesh).get_geodesic_distances_batch(vi_sources_list, v_equalize)
+
+
 ######################################
 # --- GeodesicsSolver
 
@@ -146,5 +226,185 @@ class GeodesicsSolver:
         return geodesic_dist
 
 
+######################################
+# --- HeatGeodesicsSolver
+
+class HeatGeodesicsSolver(object):
+    """
+    Computes geodesic distances with the same steps as the GeodesicsSolver (diffusion with HEAT_DIFFUSION_ITERATIONS
+    backwards Euler steps, normalized gradient, Poisson equation), but the matrix of the diffusion steps and the
+    cotangent Laplacian of the Poisson equation are factorized once, and the gradient and divergence are sparse
+    operators. All these are reused for every set of sources, so use get_heat_geodesics_solver(mesh) to share the
+    solver of a mesh. Unlike in the GeodesicsSolver, the faces where the heat is constant have zero gradient instead
+    of nan, and the divergence is taken along the edges that leave each vertex, so that the distances grow away from
+    the sources.
+
+    Attributes
+    ----------
+    mesh: :class: compas.datastructures.Mesh
+    """
+
+    def __init__(self, mesh):
+        # utils.check_package_is_installed('igl')
+        import igl
+
+        logger.info('HeatGeodesicsSolver')
+        self.signature = MeshSignature(mesh)
+        v, f = mesh.to_vertices_and_faces()
+        v = np.array(v, dtype=np.float64)
+        f = np.array(f, dtype=np.int64)
+        self.VN, self.FN = len(v), len(f)
+
+        L = igl.cotmatrix(v, f)
+        self.M = scipy.sparse.csc_matrix(igl.massmatrix(v, f))
+        self.G = scipy.sparse.csr_matrix(igl.grad(v, f))  # (3 * #F x #V), x of all faces, then y, then z
+        self.D = get_divergence_matrix(v, f, igl.cotmatrix_entries(v, f))  # (#V x 3 * #F), same layout as G
+
+        # diffusion step: (M - DELTA * L) * u_prime = M * u
+        self.diffusion_solver = scipy.sparse.linalg.splu(scipy.sparse.csc_matrix(self.M - DELTA * L))
+
+        # Poisson equation: L * u = div(X). L is singular (u is defined up to a constant per connected component),
+        # so one vertex of each component is fixed to 0; the result is shifted to its minimum afterwards anyway.
+        _, labels = scipy.sparse.csgraph.connected_components(L, directed=False)
+        _, pinned = np.unique(labels, return_index=True)
+        self.free = np.setdiff1d(np.arange(self.VN), pinned)
+        L = scipy.sparse.csr_matrix(L)
+        self.poisson_solver = scipy.sparse.linalg.splu(scipy.sparse.csc_matrix(L[self.free][:, self.free]))
+
+    def __repr__(self):
+        return "<HeatGeodesicsSolver with %d vertices>" % self.VN
+
+    def diffuse_heat(self, vi_sources, v_equalize=None):
+        """
+        Heat diffusion with backwards Euler steps, as in GeodesicsSolver.diffuse_heat with method='simulation'.
+
+        Parameters
+        ----------
+        vi_sources: list, int, the vertex indices of the sources
+        v_equalize: list, int, the vertex indices whose value should be equalized
+        """
+        return self.diffuse_heat_batch([vi_sources], v_equalize)[:, 0]
+
+    def diffuse_heat_batch(self, vi_sources_list, v_equalize=None):
+        """
+        Heat diffusion from several sets of sources at once.
+
+        Parameters
+        ----------
+        vi_sources_list: list of lists, int, the vertex indices of the sources of each diffusion
+        v_equalize: list, int, the vertex indices whose value should be equalized
+
+        Returns
+        ----------
+        np.array, float, (#V x #vi_sources_list), one column per set of sources.
+        """
+        is_source = np.zeros((self.VN, len(vi_sources_list)), dtype=bool)
+        for column, vi_sources in enumerate(vi_sources_list):
+            is_source[vi_sources, column] = True
+
+        u = is_source.astype(np.float64)
+        for i in range(HEAT_DIFFUSION_ITERATIONS):
+            u = self.diffusion_solver.solve(np.asarray(self.M @ u))
+            if v_equalize:
+                u[v_equalize] = np.min(u[v_equalize], axis=0)
+            u[is_source] = 1.0  # make sure sources remain fixed to 1
+
+        # reverse values (to make vstarts on 0)
+        return np.max(u, axis=0) - u
+
+    def get_geodesic_distances(self, vi_sources, v_equalize=None):
+        """
+        Returns np.array, float, (#V), the geodesic distances of all the vertices from the sources.
+
+        Parameters
+        ----------
+        vi_sources: list, int, the vertex indices of the sources
+        v_equalize: list, int, the vertex indices whose value should be equalized
+        """
+        return self.get_geodesic_distances_batch([vi_sources], v_equalize)[0]
+
+    def get_geodesic_distances_batch(self, vi_sources_list, v_equalize=None):
+        """
+        Returns np.array, float, (#vi_sources_list x #V), the geodesic distances of all the vertices from each set of
+        sources. All the sets are solved together, one column of the right-hand sides each.
+
+        Parameters
+        ----------
+        vi_sources_list: list of lists, int, the vertex indices of the sources of each distance field
+        v_equalize: list, int, the vertex indices whose value should be equalized
+        """
+        u = self.diffuse_heat_batch(vi_sources_list, v_equalize)
+
+        # normalized gradient, (#F x 3 x #fields)
+        X = (self.G @ u).reshape((3, self.FN, -1)).transpose((1, 0, 2))
+        norm = np.linalg.norm(X, axis=1)
+        X = np.divide(X, norm[:, np.newaxis, :], out=np.zeros_like(X), where=norm[:, np.newaxis, :] > 0)
+
+        # Poisson equation
+        div_X = self.D @ X.transpose((1, 0, 2)).reshape((3 * self.FN, -1))
+        geodesic_dist = np.zeros((self.VN, len(vi_sources_list)))
+        geodesic_dist[self.free] = self.poisson_solver.solve(np.ascontiguousarray(div_X[self.free]))
+        geodesic_dist = 2 * (geodesic_dist - np.amin(geodesic_dist, axis=0))
+        geodesic_dist = geodesic_dist.T
+        for row, vi_sources in enumerate(vi_sources_list):
+            geodesic_dist[row, vi_sources] = 0  # coerce boundary vertices to be on 0 (fixes small boundary imprecision)
+        return np.ascontiguousarray(geodesic_dist)
+
+
+def get_divergence_matrix(v, f, cotans):
+    """
+    Returns 'scipy.sparse.csr_matrix', (#V x 3 * #F), the matrix that computes the per vertex divergence of a per
+    face gradient laid out as in igl.grad (x of all faces, then y, then z), using cotangent weights and the edges that
+    leave each vertex. This is get_per_vertex_divergence with the opposite sign.
+
+    Parameters
+    ----------
+    v: np.array, float, (#V x 3)
+    f: np.array, int, (#F x 3)
+    cotans: np.array, (dimensions: #F x 3), 1/2*cotangents corresponding angles
+    """
+    cotans = cotans.reshape(-1, 3)
+    edges = v[np.roll(f, -1, axis=1)] - v[f]  # edge i of each face goes from its vertex i to its vertex i + 1
+    rows, cols, data = [], [], []
+    for i in range(3):
+        j, k = (i + 1) % 3, (i + 2) % 3
+        # the two edges that leave vertex i are edge i and the reversed edge k
+        coefficients = (cotans[:, k, np.newaxis] * edges[:, i] - cotans[:, j, np.newaxis] * edges[:, k]) / 2.0
+        for axis in range(3):
+            rows.append(f[:, i])
+            cols.append(axis * len(f) + np.arange(len(f)))
+            data.append(coefficients[:, axis])
+    return scipy.sparse.csr_matrix((np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+                                   shape=(len(v), 3 * len(f)))
+
+
+_SOLVERS = weakref.WeakKeyDictionary()  # mesh : HeatGeodesicsSolver
+
+
+def get_heat_geodesics_solver(mesh):
+    """
+    Returns the HeatGeodesicsSolver of the mesh. It is cached, and it is rebuilt if vertices or faces have been
+    added or deleted, if the mesh has been transformed, or after invalidate_mesh_caches(mesh) (see MeshSignature).
+
+    Parameters
+    ----------
+    mesh: :class: 'compas.datastructures.Mesh'
+
+    Returns
+    ----------
+    :class: 'compas_slicer.pre_processing.HeatGeodesicsSolver'
+    """
+    solver = _SOLVERS.get(mesh)
+    if solver is None or not solver.signature.matches(mesh):
+        solver = HeatGeodesicsSolver(mesh)
+        _SOLVERS[mesh] = solver
+    return solver
+
+
+def invalidate_heat_geodesics_solver(mesh):
+    """ Removes the cached HeatGeodesicsSolver of the mesh, so that it is rebuilt the next time that it is needed. """
+    _SOLVERS.pop(mesh, None)
+
+
 if __name__ == "__main__":
     pass
@@ -0,0 +1,120 @@
+import os
+import hashlib
+import logging
+import numpy as np
+
+logger = logging.getLogger('logger')
+
+__all__ = ['GeodesicsCache',
+           'get_geodesics_cache_key']
+
+
+class GeodesicsCache(object):
+    """
+    Content-addressed cache of geodesic distance fields, stored on disk as one .npy file per field.
+    The total size of the files is bounded, and when it is exceeded the least recently used fields are removed.
+    The fields are written to a temporary file that is then renamed, so that a file with the name of a key is complete.
+
+    Attributes
+    ----------
+    cache_dir: str, the directory where the .npy files are stored. It is created if it does not exist.
+    max_size: int, the maximum total size of the cached files in bytes.
+    """
+
+    def __init__(self, cache_dir, max_size=512 * 1024 ** 2):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+    def __repr__(self):
+        return "<GeodesicsCache with %d fields in %s>" % (len(self.get_entries()), self.cache_dir)
+
+    def get_filepath(self, key):
+        """ Returns the path of the .npy file of the key. """
+        return os.path.join(self.cache_dir, key + '.npy')
+
+    def get(self, key):
+        """
+        Returns np.array, float, the cached distances of the key, or None if they are not in the cache.
+        A hit marks the field as the most recently used one. Unreadable files (empty or truncated) are removed.
+        """
+        filepath = self.get_filepath(key)
+        if not os.path.exists(filepath):
+            return None
+        try:
+            distances = np.load(filepath)
+        except (IOError, OSError, ValueError, EOFError):
+            logger.warning('Removing unreadable geodesics cache file: ' + filepath)
+            try:
+                os.remove(filepath)
+            except OSError:
+                pass
+            return None
+        os.utime(filepath, None)
+        return distances
+
+    def put(self, key, distances):
+        """ Stores the distances (array of floats) with the key, and evicts the least recently used fields. """
+        filepath = self.get_filepath(key)
+        temp_filepath = filepath + '.%d.tmp' % os.getpid()
+        with open(temp_filepath, 'wb') as f:
+            np.save(f, np.asarray(distances, dtype=np.float64))
+        os.replace(temp_filepath, filepath)  # atomic, so that readers never see half-written files
+        self.evict()
+
+    def get_entries(self):
+        """ Returns list of (last used time, size, filepath) of the cached fields, the least recently used first. """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.npy'):
+                filepath = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(filepath)
+                except OSError:  # removed in the meantime
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, filepath))
+        return sorted(entries)
+
+    def evict(self):
+        """ Removes the least recently used fields until their total size is at most max_size. """
+        entries = self.get_entries()
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, filepath in entries:
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(filepath)
+            except OSError:
+                pass
+            total_size -= size
+
+    def clear(self):
+        """ Removes all the cached fields. """
+        for _, _, filepath in self.get_entries():
+            os.remove(filepath)
+
+
+def get_geodesics_cache_key(mesh, vertices_start, method):
+    """
+    Returns str, the hash of the vertex coordinates and the faces of the mesh, the sorted source vertices and the
+    geodesics method, which identifies a geodesic distance field.
+
+    Parameters
+    ----------
+    mesh: :class: 'compas.datastructures.Mesh'
+    vertices_start: list, int, the vertex indices of the sources
+    method: str, 'exact_igl', 'heat' or 'heat_fast'
+    """
+    v, f = mesh.to_vertices_and_faces()
+    h = hashlib.sha256()
+    h.update(np.array([len(v), len(f), len(vertices_start)], dtype=np.int64).tobytes())
+    h.update(np.ascontiguousarray(v, dtype=np.float64).tobytes())
+    h.update(np.ascontiguousarray(f, dtype=np.int64).tobytes())
+    h.update(np.array(sorted(vertices_start), dtype=np.int64).tobytes())
+    h.update(method.encode('utf-8'))
+    return h.hexdigest()
+
+
+if __name__ == "__main__":
+    pass
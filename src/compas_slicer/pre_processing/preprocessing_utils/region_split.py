@@ -6,9 +6,10 @@ import compas
 import compas_slicer.utilities as utils
 from compas_slicer.pre_processing.preprocessing_utils import restore_mesh_attributes, save_vertex_attributes
 from compas.datastructures import Mesh
-from compas_slicer.pre_processing.preprocessing_utils import assign_interpolation_distance_to_mesh_vertex
-from compas_slicer.slicers.slice_utilities import ScalarFieldContours
+from compas_slicer.slicers.slice_utilities import ScalarFieldContours, get_mesh_topology
 from compas_slicer.pre_processing.preprocessing_utils import assign_interpolation_distance_to_mesh_vertices
+from compas_slicer.pre_processing.preprocessing_utils import get_interpolation_distances
+from compas_slicer.pre_processing.preprocessing_utils import get_interpolation_distances_of_vertices
 from compas_slicer.pre_processing.gradient_evaluation import GradientEvaluation
 from compas.geometry import Line, distance_point_point_sqrd, project_point_line
 
@@ -110,8 +111,8 @@ class MeshSplitter:
             logger.info('vkey_exact : %d , t_exact : %.6f' % (vkey, t))
 
             # --- (2) find zero-crossing points
-            assign_interpolation_distance_to_mesh_vertices(self.mesh, t, self.target_LOW, self.target_HIGH)
-            zero_contours = ScalarFieldContours(self.mesh)
+            distances = get_interpolation_distances(self.mesh, t, self.target_LOW, self.target_HIGH)
+            zero_contours = ScalarFieldContours(self.mesh, topology=get_mesh_topology(self.mesh), scalar_field=distances)
             zero_contours.compute()
             keys_of_clusters_to_keep = merge_clusters_saddle_point(zero_contours, saddle_vkeys=[vkey])
 
@@ -220,34 +221,52 @@ class MeshSplitter:
         ----------
         list, float, the weights from 0 to 1. One for each saddle point.
         """
-        split_params = []
-        for vkey in saddles:
-            param = self.find_weight_intersecting_vkey(vkey, threshold=HIT_THRESHOLD, resolution=T_SEARCH_RESOLUTION)
-            split_params.append(param)
-        return split_params
+        return self.find_weights_intersecting_vkeys(saddles, threshold=HIT_THRESHOLD, resolution=T_SEARCH_RESOLUTION)
 
     def find_weight_intersecting_vkey(self, vkey, threshold, resolution):
         """
-        Find the weights that intersect the vertex.
+        Find the weight that intersects the vertex, see find_weights_intersecting_vkeys.
 
         Parameters
         ----------
-        vkey: list, int, the vertex key to intersect
+        vkey: int, the vertex key to intersect
         threshold: float, the d value below which we consider we have a hit. Should be a very small value
         resolution: int, the resolution of search, should be a value more than 10**4
 
         Returns
         ----------
-        float, the weights from 0 to 1.
+        float, the weight from 0 to 1.
         """
+        return self.find_weights_intersecting_vkeys([vkey], threshold, resolution)[0]
+
+    def find_weights_intersecting_vkeys(self, vkeys, threshold, resolution):
+        """
+        Find the weights that intersect the vertices. For each vertex, this is the first weight of the search list
+        whose distance is below the threshold and closer to zero than the distance of the next weight.
+        The distances of all the vertices are evaluated over all the weights at once, with array operations.
+
+        Parameters
+        ----------
+        vkeys: list, int, the vertex keys to intersect
+        threshold: float, the d value below which we consider we have a hit. Should be a very small value
+        resolution: int, the resolution of search, should be a value more than 10**4
+
+        Returns
+        ----------
+        list, float, the weights from 0 to 1. One for each vertex.
+        """
+        if len(vkeys) == 0:
+            return []
         weight_list = get_weights_list(n=resolution, start=0.001, end=0.999)
-        # TODO: save next d to avoid re-evaluating
-        for i, weight in enumerate(weight_list[:-1]):
-            current_d = assign_interpolation_distance_to_mesh_vertex(vkey, weight, self.target_LOW, self.target_HIGH)
-            next_d = assign_interpolation_distance_to_mesh_vertex(vkey, weight_list[i + 1], self.target_LOW, self.target_HIGH)
-            if abs(current_d) < abs(next_d) and current_d < threshold:
-                return weight
-        raise ValueError('Could NOT find param for saddle vkey %d!' % vkey)
+        ds = get_interpolation_distances_of_vertices(vkeys, weight_list, self.target_LOW, self.target_HIGH)
+        hits = (np.abs(ds[:-1]) < np.abs(ds[1:])) & (ds[:-1] < threshold)  # (#weights - 1 x #vkeys)
+
+        weights = []
+        for j, vkey in enumerate(vkeys):
+            if not np.any(hits[:, j]):
+                raise ValueError('Could NOT find param for saddle vkey %d!' % vkey)
+            weights.append(weight_list[int(np.argmax(hits[:, j]))])
+        return weights
 
 
 ###############################################
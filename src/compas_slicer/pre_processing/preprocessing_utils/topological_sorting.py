@@ -1,6 +1,8 @@
 import networkx as nx
-from compas.geometry import distance_point_point, distance_point_point_sqrd
+import numpy as np
+from compas.geometry import distance_point_point_sqrd
 import compas_slicer.utilities as utils
+from compas_slicer.utilities import PointCloudIndex
 import logging
 import copy
 from compas_slicer.pre_processing.preprocessing_utils import get_existing_cut_indices, \
@@ -128,48 +130,104 @@ class DirectedGraph(object):
     def get_all_topological_orders(self):
         """
         Finds  all topological orders from source to sink.
+        The number of orders can grow factorially with the number of independent nodes, so if only one order is
+        needed use get_best_order or iter_topological_orders instead.
+
         Returns
         ----------
         list of lists of integers. Each list represents the indices of one topological order.
         """
-        self.all_orders = []  # make sure list is empty
-        discovered = [False] * self.N
-        path = []  # list to store the topological order
-        self.get_orders(path, discovered)
+        self.all_orders = list(self.iter_topological_orders())
         logger.info('Found %d possible orders' % len(self.all_orders))
         return self.all_orders
 
     def get_orders(self, path, discovered):
         """
-        Finds all topological orders from source to sink.
+        Finds all topological orders from source to sink that start with the path, and appends them to all_orders.
+        """
+        self.all_orders.extend(self.iter_topological_orders(path, discovered))
+
+    def iter_topological_orders(self, path=None, discovered=None):
+        """
+        Generates the topological orders from source to sink one by one, in the same order as
+        get_all_topological_orders, without storing all of them.
         Sorting algorithm taken from https://www.techiedelight.com/find-all-possible-topological-orderings-of-dag/
+
+        Parameters
+        ----------
+        path: list of int, the start of the orders. If None the orders start from scratch.
+        discovered: list of bool, True for the nodes in the path. If None they are found from the path.
+
+        Yields
+        ----------
+        list of integers, the indices of one topological order.
         """
-        for v in range(self.N):  # for every node
-            # proceed only if in-degree of current node is 0 and current node is not processed yet
-            if self.in_degree[v] == 0 and not discovered[v]:
+        path = [] if path is None else list(path)
+        discovered = [v in path for v in range(self.N)] if discovered is None else list(discovered)
+        in_degree = list(self.in_degree)
+
+        def orders():
+            for v in range(self.N):  # for every node
+                # proceed only if in-degree of current node is 0 and current node is not processed yet
+                if in_degree[v] == 0 and not discovered[v]:
 
-                # for every adjacent vertex u of v, reduce in-degree of u by 1
-                for u in self.adj_list[v]:
-                    self.in_degree[u] = self.in_degree[u] - 1
+                    # for every adjacent vertex u of v, reduce in-degree of u by 1
+                    for u in self.adj_list[v]:
+                        in_degree[u] -= 1
 
-                # include current node in the path and mark it as discovered
-                path.append(v)
-                discovered[v] = True
+                    # include current node in the path and mark it as discovered
+                    path.append(v)
+                    discovered[v] = True
 
-                # recur
-                self.get_orders(path, discovered)
+                    # recur
+                    yield from orders()
 
-                # backtrack: reset in-degree information for the current node
-                for u in self.adj_list[v]:
-                    self.in_degree[u] = self.in_degree[u] + 1
+                    # backtrack: reset in-degree information for the current node
+                    for u in self.adj_list[v]:
+                        in_degree[u] += 1
 
-                # backtrack: remove current node from the path and mark it as undiscovered
-                path.pop()
-                discovered[v] = False
+                    # backtrack: remove current node from the path and mark it as undiscovered
+                    path.pop()
+                    discovered[v] = False
 
-        # print the topological order if all vertices are included in the path
-        if len(path) == self.N:
-            self.all_orders.append(copy.deepcopy(path))
+            # yield the topological order if all vertices are included in the path
+            if len(path) == self.N:
+                yield list(path)
+
+        return orders()
+
+    def get_best_order(self, cost_fn=None):
+        """
+        Finds one topological order without enumerating all of them. The order is built greedily: at each step, from
+        the nodes whose parents have all been placed, the one with the lowest cost is placed next, and ties are
+        broken by the lowest index. Without a cost function this is the first order of get_all_topological_orders.
+
+        Parameters
+        ----------
+        cost_fn: callable(previous, node) -> float, the cost of placing the node after the previous node (which is
+            None for the first node). For example the travel distance between the two nodes.
+
+        Returns
+        ----------
+        list of integers, the indices of the topological order.
+        """
+        in_degree = list(self.in_degree)
+        available = [v for v in range(self.N) if in_degree[v] == 0]
+        order = []
+        while len(available) > 0:
+            previous = order[-1] if len(order) > 0 else None
+            if cost_fn:
+                v = min(available, key=lambda node: (cost_fn(previous, node), node))
+            else:
+                v = min(available)
+            available.remove(v)
+            order.append(v)
+            for u in self.adj_list[v]:
+                in_degree[u] -= 1
+                if in_degree[u] == 0:
+                    available.append(u)
+        assert len(order) == self.N, 'The directed graph has cycles, no topological order was found.'
+        return order
 
     def get_parents_of_node(self, node_index):
         """ Returns the parents of node with i = node_index. """
@@ -188,6 +246,8 @@ class MeshDirectedGraph(DirectedGraph):
         self.all_meshes = all_meshes
         self.DATA_PATH = DATA_PATH
         self.OUTPUT_PATH = utils.get_output_directory(DATA_PATH)
+        # all the true adjacencies between the meshes are found at once, instead of comparing them pair by pair
+        self.true_adjacencies = get_true_mesh_adjacencies(all_meshes)
         DirectedGraph.__init__(self)
 
     def find_roots(self):
@@ -239,7 +299,7 @@ class MeshDirectedGraph(DirectedGraph):
                     and (key, root) not in self.G.edges() \
                     and (root, key) not in self.G.edges():
 
-                if is_true_mesh_adjacency(self.all_meshes, key, root):
+                if (key, root) in self.true_adjacencies:
                     if not len(common_cuts) == 1:  # if all cuts worked, this should be 1. But life is not perfect.
                         logger.error('More than one common cuts between two pieces in the following split \
                         meshes. ' 'Root : %d, child : %d' % (root, key) + ' . Common cuts : ' + str(common_cuts) +
@@ -275,15 +335,17 @@ class SegmentsDirectedGraph(DirectedGraph):
         self.max_d_threshold = max_d_threshold
         self.DATA_PATH = DATA_PATH
         self.OUTPUT_PATH = utils.get_output_directory(DATA_PATH)
+        # the first and last curves of the segments are compared many times, so their trees are built once
+        self.first_curve_indices = [PointCloudIndex(segment.paths[0].coords) for segment in self.segments]
+        self.last_curve_indices = [PointCloudIndex(segment.paths[-1].coords) for segment in self.segments]
         DirectedGraph.__init__(self)
 
     def find_roots(self):
         """ Roots are vertical_layers_print_data that lie on the build platform. Like that they can be print first. """
         boundary_pts = utils.get_mesh_vertex_coords_with_attribute(self.mesh, 'boundary', 1)
         root_segments = []
-        for i, segment in enumerate(self.segments):
-            first_curve_pts = segment.paths[0].points
-            if are_neighboring_point_clouds(boundary_pts, first_curve_pts, 2 * self.max_d_threshold):
+        for i, first_curve_index in enumerate(self.first_curve_indices):
+            if are_neighboring_point_clouds(boundary_pts, first_curve_index, 2 * self.max_d_threshold):
                 root_segments.append(i)
         return root_segments
 
@@ -291,9 +353,8 @@ class SegmentsDirectedGraph(DirectedGraph):
         """ Ends are vertical_layers_print_data that belong to exclusively one segment. Like that they can be print last. """
         boundary_pts = utils.get_mesh_vertex_coords_with_attribute(self.mesh, 'boundary', 2)
         end_segments = []
-        for i, segment in enumerate(self.segments):
-            last_curve_pts = segment.paths[-1].points
-            if are_neighboring_point_clouds(boundary_pts, last_curve_pts, self.max_d_threshold):
+        for i, last_curve_index in enumerate(self.last_curve_indices):
+            if are_neighboring_point_clouds(boundary_pts, last_curve_index, self.max_d_threshold):
                 end_segments.append(i)
         return end_segments
 
@@ -305,41 +366,46 @@ class SegmentsDirectedGraph(DirectedGraph):
     def get_children_of_node(self, root):
         """ Find all the nodes that lie on the current root. """
         children = []
-        root_segment = self.segments[root]
-        root_last_crv_pts = root_segment.paths[-1].points
-        # utils.save_to_json(utils.point_list_to_dict(root_last_crv_pts), self.OUTPUT_PATH, "root_last_crv_pts.json")
+        root_last_crv_pts = self.last_curve_indices[root].coords
 
-        for i, segment in enumerate(self.segments):
+        for i, first_curve_index in enumerate(self.first_curve_indices):
             if i != root:
-                segment_first_curve_pts = segment.paths[0].points
-                # utils.save_to_json(utils.point_list_to_dict(segment_first_curve_pts), self.OUTPUT_PATH,
-                #                    "segment_first_curve_pts.json")
-                if are_neighboring_point_clouds(root_last_crv_pts, segment_first_curve_pts, self.max_d_threshold):
+                if are_neighboring_point_clouds(root_last_crv_pts, first_curve_index, self.max_d_threshold):
                     children.append(i)
         return children, [None for _ in children]  # None because this graph doesn't have cut ids
 
+    def get_travel_distance(self, previous, node):
+        """
+        Returns the travel distance from the end of the last path of the previous segment to the start of the first
+        path of the segment node (0.0 if there is no previous segment). It can be used as the cost function of
+        get_best_order. The points are read from the coordinates of the first and last curves, so that the paths are
+        not converted to lists of points.
+        """
+        if previous is None:
+            return 0.0
+        end_pt = self.last_curve_indices[previous].coords[-1]
+        start_pt = self.first_curve_indices[node].coords[0]
+        return float(np.linalg.norm(end_pt - start_pt))
+
 
 #################################
 # --- helpers
 
 def are_neighboring_point_clouds(pts1, pts2, threshold):
     """
-    Returns True if 3 or more points of the point clouds are closer than the threshold. False otherwise.
+    Returns True if more than 5 points of pts1 are closer than the threshold to the point cloud pts2.
+    False otherwise.
 
     Parameters
     ----------
-    pts1: list, :class: 'compas.geometry.Point'
-    pts2: list, :class: 'compas.geometry.Point'
+    pts1: list, :class: 'compas.geometry.Point', or np.array, float, (#points x 3)
+    pts2: list, :class: 'compas.geometry.Point', or np.array, float, (#points x 3), or
+        :class: 'compas_slicer.utilities.PointCloudIndex' of the points, to reuse its tree
     threshold: float
     """
-    count = 0
-    for pt in pts1:
-        d = distance_point_point(pt, utils.get_closest_pt(pt, pts2))
-        if d < threshold:
-            count += 1
-            if count > 5:
-                return True
-    return False
+    if not isinstance(pts2, PointCloudIndex):
+        pts2 = PointCloudIndex(pts2)
+    return pts2.count_within(pts1, threshold) > 5
 
 
 def is_true_mesh_adjacency(all_meshes, key1, key2):
@@ -368,5 +434,71 @@ def is_true_mesh_adjacency(all_meshes, key1, key2):
     return False
 
 
+def get_true_mesh_adjacencies(all_meshes, tolerance_sqrd=0.00001):
+    """
+    Finds all the pairs of meshes (key1, key2) for which is_true_mesh_adjacency(all_meshes, key1, key2) is True,
+    i.e. 3 or more cut or boundary vertices of mesh1 lie closer than the tolerance to the cut or boundary vertices of
+    mesh2. Instead of comparing all the pairs of meshes, the cut and boundary vertices of all the meshes are hashed
+    once in a grid with cells of size equal to the tolerance, and each vertex is only compared to the vertices in its
+    own and in the 26 neighboring cells. Only the occupied cells are stored, so the extent of the meshes does not
+    matter.
+
+    Parameters
+    ----------
+    all_meshes: list, :class: 'compas.datastructures.Mesh'
+    tolerance_sqrd: float, the squared distance below which two vertices are considered shared
+
+    Returns
+    ----------
+    set, (int, int), the pairs (key1, key2) of adjacent meshes
+    """
+    coords, mesh_ids = [], []
+    for i, mesh in enumerate(all_meshes):
+        for vkey, data in mesh.vertices(data=True):
+            if data['cut'] > 0 or data['boundary'] > 0:
+                coords.append(mesh.vertex_coordinates(vkey))
+                mesh_ids.append(i)
+    if len(coords) == 0:
+        return set()
+    coords = np.array(coords, dtype=np.float64)
+    mesh_ids = np.array(mesh_ids, dtype=np.int64)
+
+    # --- integer cells, numbered by their order in the sorted unique cells
+    cells = np.floor(coords / np.sqrt(tolerance_sqrd)).astype(np.int64)
+    unique_cells, cell_ids = np.unique(cells, axis=0, return_inverse=True)
+    cell_ids = cell_ids.reshape(-1)
+    order = np.argsort(cell_ids, kind='stable')  # the vertices grouped by cell
+    cell_counts = np.bincount(cell_ids, minlength=len(unique_cells))
+    cell_starts = np.cumsum(cell_counts) - cell_counts
+    cell_index = {cell: i for i, cell in enumerate(map(tuple, unique_cells.tolist()))}
+
+    # --- candidate pairs (a, b) of vertices in the same or in neighboring cells
+    offsets = [(i, j, k) for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1)]
+    all_a, all_b = [], []
+    for offset in offsets:
+        neighbor_cells = map(tuple, (unique_cells + np.array(offset, dtype=np.int64)).tolist())
+        neighbor_ids = np.array([cell_index.get(cell, -1) for cell in neighbor_cells], dtype=np.int64)[cell_ids]
+        exists = neighbor_ids >= 0
+        counts = np.where(exists, cell_counts[neighbor_ids], 0)
+        start = np.where(exists, cell_starts[neighbor_ids], 0)
+        a = np.repeat(np.arange(len(cell_ids)), counts)
+        ends = np.cumsum(counts)
+        b = order[np.repeat(start, counts) + np.arange(ends[-1]) - np.repeat(ends - counts, counts)]
+        all_a.append(a)
+        all_b.append(b)
+    a, b = np.concatenate(all_a), np.concatenate(all_b)
+
+    # --- shared vertices: close enough and on different meshes
+    d = coords[a] - coords[b]
+    is_shared = (mesh_ids[a] != mesh_ids[b]) & (np.einsum('ij,ij->i', d, d) < tolerance_sqrd)
+    a, b = a[is_shared], b[is_shared]
+
+    # --- count for each pair of meshes the vertices of the first mesh that are shared with the second
+    vertex_mesh_pairs = np.unique(np.stack([a, mesh_ids[b]], axis=1), axis=0)
+    mesh_pairs, counts = np.unique(np.stack([mesh_ids[vertex_mesh_pairs[:, 0]], vertex_mesh_pairs[:, 1]], axis=1),
+                                   axis=0, return_counts=True)
+    return set(map(tuple, mesh_pairs[counts >= 3].tolist()))
+
+
 if __name__ == '__main__':
     pass
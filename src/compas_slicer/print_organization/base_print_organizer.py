@@ -5,6 +5,8 @@ from compas.geometry import Vector, distance_point_point, norm_vector, normalize
 from compas.utilities import pairwise
 import numpy as np
 from abc import abstractmethod
+from compas_slicer.geometry import PrintPointTable
+from compas_slicer.geometry.print_point_table import cross, normalize_rows
 
 logger = logging.getLogger('logger')
 
@@ -21,13 +23,19 @@ class BasePrintOrganizer(object):
     ----------
     slicer: :class:`compas_slicer.slicers.PlanarSlicer`
         An instance of the compas_slicer.slicers.PlanarSlicer.
+    printpoints_dict: dict
+        'layer_%d' -> dict, 'path_%d' -> list, :class:`compas_slicer.geometry.PrintPoint`
+    printpoints_table: :class:`compas_slicer.geometry.PrintPointTable`
+        The printpoints are stored either in the printpoints_dict or in the printpoints_table, and they are converted
+        to the other representation the first time that it is accessed.
     """
 
     def __init__(self, slicer):
         assert isinstance(slicer, compas_slicer.slicers.BaseSlicer)  # check input
         logger.info('Print Organizer')
         self.slicer = slicer
-        self.printpoints_dict = {}
+        self._printpoints_dict = {}  # dict, 'layer_%d' -> dict, 'path_%d' -> list of PrintPoints
+        self._printpoints_table = None  # compas_slicer.geometry.PrintPointTable
 
     def __repr__(self):
         return "<BasePrintOrganizer>"
@@ -41,6 +49,52 @@ class BasePrintOrganizer(object):
         """To be implemented by the inheriting classes"""
         pass
 
+    ######################
+    # PrintPoints storage
+    ######################
+
+    @property
+    def printpoints_dict(self):
+        """
+        dict, 'layer_%d' -> dict, 'path_%d' -> list, :class:`compas_slicer.geometry.PrintPoint`.
+        If the printpoints are stored in the printpoints_table, the PrintPoints are created from it the first time that
+        the dict is accessed. From then on the dict is the authoritative representation, since the PrintPoints can be
+        modified in place.
+        """
+        if self._printpoints_table is not None:
+            self._printpoints_dict = self._printpoints_table.to_printpoints_dict()
+            self._printpoints_table = None
+        return self._printpoints_dict
+
+    @printpoints_dict.setter
+    def printpoints_dict(self, printpoints_dict):
+        self._printpoints_dict = printpoints_dict
+        self._printpoints_table = None
+
+    @property
+    def printpoints_table(self):
+        """
+        :class:`compas_slicer.geometry.PrintPointTable`.
+        If the printpoints are stored in the printpoints_dict, the table is created from it the first time that it is
+        accessed. From then on the table is the authoritative representation, and the print organization utilities
+        work on its columns.
+        """
+        if self._printpoints_table is None:
+            self._printpoints_table = PrintPointTable.from_printpoints_dict(self._printpoints_dict)
+            self._printpoints_dict = None
+        return self._printpoints_table
+
+    @printpoints_table.setter
+    def printpoints_table(self, printpoints_table):
+        self._printpoints_table = printpoints_table
+        self._printpoints_dict = None
+
+    @property
+    def is_backed_by_table(self):
+        """ bool: True if the printpoints are stored in the printpoints_table, False if they are stored in the
+        printpoints_dict. """
+        return self._printpoints_table is not None
+
     ######################
     # Iterators
     ######################
@@ -82,6 +136,8 @@ class BasePrintOrganizer(object):
     @property
     def number_of_printpoints(self):
         """int: Total number of points in the PrintOrganizer."""
+        if self.is_backed_by_table:
+            return self.printpoints_table.number_of_printpoints
         total_number_of_pts = 0
         for layer_key in self.printpoints_dict:
             for path_key in self.printpoints_dict[layer_key]:
@@ -91,6 +147,9 @@ class BasePrintOrganizer(object):
 
     @property
     def number_of_paths(self):
+        """int: Total number of paths in the PrintOrganizer."""
+        if self.is_backed_by_table:
+            return self.printpoints_table.number_of_paths
         total_number_of_paths = 0
         for layer_key in self.printpoints_dict:
             for _ in self.printpoints_dict[layer_key]:
@@ -100,11 +159,16 @@ class BasePrintOrganizer(object):
     @property
     def number_of_layers(self):
         """int: Number of layers in the PrintOrganizer."""
+        if self.is_backed_by_table:
+            return self.printpoints_table.number_of_layers
         return len(self.printpoints_dict)
 
     @property
     def total_length_of_paths(self):
         """ Returns the total length of all paths. Does not consider extruder toggle. """
+        if self.is_backed_by_table:
+            d = self.printpoints_table.distances_to_previous()
+            return sum(d[~np.isnan(d)].tolist())  # summed in order, like the loop below
         total_length = 0
         for layer_key in self.printpoints_dict:
             for path_key in self.printpoints_dict[layer_key]:
@@ -116,6 +180,13 @@ class BasePrintOrganizer(object):
     @property
     def total_print_time(self):
         """ If the print speed is defined, it returns the total time of the print, else returns None"""
+        if self.is_backed_by_table:
+            table = self.printpoints_table
+            if not np.isnan(table.velocity[0]):  # assume that all ppts are set or none
+                d = table.distances_to_previous()
+                valid = ~np.isnan(d)
+                return sum((d[valid] / table.velocity[valid]).tolist())
+            return None
         if self.printpoints_dict['layer_0']['path_0'][0].velocity is not None:  # assume that all ppts are set or none
             total_time = 0
             for layer_key in self.printpoints_dict:
@@ -127,6 +198,8 @@ class BasePrintOrganizer(object):
 
     def number_of_paths_on_layer(self, layer_index):
         """int: Number of paths within a Layer of the PrintOrganizer."""
+        if self.is_backed_by_table:
+            return self.printpoints_table.number_of_paths_on_layer(layer_index)
         return len(self.printpoints_dict['layer_%d' % layer_index])
 
     ######################
@@ -167,6 +240,39 @@ class BasePrintOrganizer(object):
             for ppt in duplicate_ppts:
                 self.printpoints_dict[layer_key][path_key].remove(ppt)
 
+    def remove_duplicate_points(self, tolerance=0.0001):
+        """Remove subsequent points that are within a certain threshold, on all the paths.
+
+        Parameters
+        ----------
+        tolerance: float, optional
+            Distance between points to remove. Defaults to 0.0001.
+        """
+        if not self.is_backed_by_table:
+            for layer_key in self.printpoints_dict:
+                for path_key in self.printpoints_dict[layer_key]:
+                    self.remove_duplicate_points_in_path(layer_key, path_key, tolerance)
+            return
+
+        table = self.printpoints_table
+        d_next = np.append(table.distances_to_previous()[1:], np.nan)  # nan at the end of each path
+        is_duplicate = d_next < tolerance
+        if not np.any(is_duplicate):
+            return
+
+        # warn user
+        rows = np.flatnonzero(is_duplicate)
+        path_starts = table.path_offsets[table.path_id[rows]]
+        for p in np.unique(table.path_id[rows]).tolist():
+            in_path = table.path_id[rows] == p
+            i, j = table.layer_index[rows[in_path][0]], table.path_index[rows[in_path][0]]
+            logger.warning(
+                'Attention! %d Duplicate printpoint(s) ' % np.count_nonzero(in_path) + 'on layer_%d, path_%d' % (i, j) +
+                ', indices: ' + str((rows - path_starts)[in_path].tolist()) + '. They will be removed.')
+
+        # remove duplicates
+        self.printpoints_table = table.take(np.flatnonzero(~is_duplicate))
+
     def get_printpoint_neighboring_items(self, layer_key, path_key, i):
         """
         layer_key: str
@@ -194,8 +300,13 @@ class BasePrintOrganizer(object):
     def printout_info(self):
         """Prints out information from the PrintOrganizer"""
         ppts_attributes = {}
-        for key in self.printpoints_dict['layer_0']['path_0'][0].attributes:
-            ppts_attributes[key] = str(type(self.printpoints_dict['layer_0']['path_0'][0].attributes[key]))
+        if self.is_backed_by_table:
+            table = self.printpoints_table
+            first_ppt_attributes = table.attributes[0] if table.attributes and table.attributes[0] else {}
+        else:
+            first_ppt_attributes = self.printpoints_dict['layer_0']['path_0'][0].attributes
+        for key in first_ppt_attributes:
+            ppts_attributes[key] = str(type(first_ppt_attributes[key]))
 
         print("\n---- PrintOrganizer Info ----")
         print("Number of layers: %d" % self.number_of_layers)
@@ -241,6 +352,38 @@ class BasePrintOrganizer(object):
             up_vec = Vector(0, 0, 1)
         return Vector(*up_vec)
 
+    def get_printpoints_up_vectors(self, coords, path_offsets, normals):
+        """
+        Returns the up-vectors of all the printpoints at once. Same result as get_printpoint_up_vector for each point.
+
+        Parameters
+        ----------
+        coords: np.array, float, (#points x 3), the points of all the paths
+        path_offsets: np.array, int, (#paths + 1), the points of path p are coords[path_offsets[p]:path_offsets[p + 1]]
+        normals: np.array, float, (#points x 3)
+
+        Returns
+        -------
+        np.array, float, (#points x 3)
+        """
+        coords = np.asarray(coords, dtype=np.float64).reshape((-1, 3))
+        normals = np.asarray(normals, dtype=np.float64).reshape((-1, 3))
+        n = len(coords)
+
+        # the other point is the next one, or the previous one for the last point of each path
+        other = np.arange(1, n + 1)
+        path_ends = path_offsets[1:][np.diff(path_offsets) > 0] - 1
+        other[path_ends] = path_ends - 1
+        single_point_paths = path_offsets[:-1][np.diff(path_offsets) == 1]
+        other[single_point_paths] = single_point_paths  # path.points[-1] is the point itself
+        other = np.minimum(other, n - 1)
+
+        diff = normalize_rows(coords - coords[other])
+        up_vectors = normalize_rows(cross(normals, diff))
+        up_vectors[path_ends] *= -1.0
+        up_vectors[~np.any(up_vectors, axis=1)] = (0.0, 0.0, 1.0)  # normalized rows are zero or have length 1
+        return up_vectors
+
     ######################
     # Output data
     ######################
@@ -255,6 +398,14 @@ class BasePrintOrganizer(object):
         data = {}
 
         count = 0
+        if self.is_backed_by_table:
+            self.remove_duplicate_points()
+            for printpoint in self.printpoints_table.to_printpoints():
+                data[count] = printpoint.to_data()
+                count += 1
+            logger.info("Generated %d print points" % count)
+            return data
+
         for layer_key in self.printpoints_dict:
             for path_key in self.printpoints_dict[layer_key]:
                 self.remove_duplicate_points_in_path(layer_key, path_key)
@@ -275,6 +426,19 @@ class BasePrintOrganizer(object):
         data = {}
 
         count = 0
+        if self.is_backed_by_table:
+            self.remove_duplicate_points()
+            table = self.printpoints_table
+            ppts = table.to_printpoints()
+            for i in range(table.number_of_layers):
+                layer_key = 'layer_%d' % i
+                data[layer_key] = {}
+                for j, p in enumerate(table.layer_path_indices(i)):
+                    start, end = table.path_offsets[p], table.path_offsets[p + 1]
+                    data[layer_key]['path_%d' % j] = {k: ppts[start + k].to_data() for k in range(end - start)}
+            logger.info("Generated %d print points" % len(ppts))
+            return data
+
         for layer_key in self.printpoints_dict:
             data[layer_key] = {}
             for path_key in self.printpoints_dict[layer_key]:
@@ -315,6 +479,12 @@ class BasePrintOrganizer(object):
         -------
         list of size len(ppts) with whatever type the ppts.attribute[attr_name] is.
         """
+        if self.is_backed_by_table:
+            attributes = self.printpoints_table.attributes
+            assert attributes and all(attr_name in attrs for attrs in attributes), \
+                "The attribute '%s' is not in the printpoint.attributes" % attr_name
+            return [attrs[attr_name] for attrs in attributes]
+
         attr_values = []
         for layer_key in self.printpoints_dict:
             for path_key in self.printpoints_dict[layer_key]:
@@ -109,10 +109,11 @@ class InterpolationPrintOrganizer(BasePrintOrganizer):
         if len(self.horizontal_layers) > 0:  # first add horizontal brim layers
             paths = self.horizontal_layers[0].paths
             for j, path in enumerate(paths):
+                normals = utils.get_normals_of_path_on_xy_plane(path, self.slicer.mesh)
                 self.printpoints_dict['layer_0']['path_%d' % j] = \
                     [PrintPoint(pt=point, layer_height=get_param(self.parameters, 'avg_layer_height', 'layers'),
-                                mesh_normal=utils.get_normal_of_path_on_xy_plane(k, point, path, self.slicer.mesh))
-                     for k, point in enumerate(path.points)]
+                                mesh_normal=normal)
+                     for point, normal in zip(path.points, normals)]
             current_layer_index += 1
 
         # (2) --- Select order of vertical layers
@@ -122,8 +123,8 @@ class InterpolationPrintOrganizer(BasePrintOrganizer):
                 logger.error("no topology graph found, cannnot set the order of vertical layers")
                 self.selected_order = [0]
             else:
-                all_orders = self.topo_sort_graph.get_all_topological_orders()
-                self.selected_order = all_orders[0]  # TODO: add more elaborate selection strategy
+                # the next vertical layer is the one that starts closest to the end of the previous one
+                self.selected_order = self.topo_sort_graph.get_best_order(self.topo_sort_graph.get_travel_distance)
         else:
             self.selected_order = [0]  # there is only one segment, only this option
 
@@ -181,7 +182,6 @@ class InterpolationPrintOrganizer(BasePrintOrganizer):
                 ppt.up_vector = self.get_printpoint_up_vector(path, k, normal)
                 if dot_vectors(subtract_vectors(p, ppt.closest_support_pt), ppt.up_vector) < 0:
                     ppt.up_vector = Vector(*scale_vector(ppt.up_vector, -1))
-                ppt.frame = ppt.get_frame()
 
                 layer_ppts['path_%d' % i].append(ppt)
                 count += 1
@@ -1,9 +1,8 @@
 import logging
+import numpy as np
 from compas_slicer.print_organization import BasePrintOrganizer
 import compas_slicer.utilities as utils
-from compas_slicer.geometry import PrintPoint
-from compas.geometry import Vector
-import progressbar
+from compas_slicer.geometry import Toolpath, PrintPointTable
 import compas_slicer
 
 logger = logging.getLogger('logger')
@@ -29,45 +28,43 @@ class PlanarPrintOrganizer(BasePrintOrganizer):
         return "<PlanarPrintOrganizer with %i layers>" % len(self.slicer.layers)
 
     def create_printpoints(self, generate_mesh_normals=True):
-        """Create the print points of the fabrication process
+        """Create the print points of the fabrication process.
+        The up vectors and the layer heights of all the points are computed at once, and they are stored in the
+        printpoints_table of the organizer. The PrintPoints are only created if the printpoints_dict is accessed.
 
         Parameters
         ----------
         generate_mesh_normals: bool
             Boolean toggle that controls whether to generate mesh normals or not.
-            If False, mesh normals will be set to Vector(0, 0, 1)
+            If False, mesh normals will be set to Vector(0, 1, 0)
         """
 
-        count = 0
         logger.info('Creating print points ...')
-        with progressbar.ProgressBar(max_value=self.slicer.number_of_points) as bar:
-
-            if generate_mesh_normals:
-                logger.info('Generating mesh normals ...')
-                # fast method for getting the closest mesh normals to all the printpoints
-                all_pts = [pt for layer in self.slicer.layers for path in layer.paths for pt in path.points]
-                closest_fks, projected_pts = utils.pull_pts_to_mesh_faces(self.slicer.mesh, all_pts)
-                normals = [Vector(*self.slicer.mesh.face_normal(fkey)) for fkey in closest_fks]
-
-            for i, layer in enumerate(self.slicer.layers):
-                self.printpoints_dict['layer_%d' % i] = {}
-
-                for j, path in enumerate(layer.paths):
-                    self.printpoints_dict['layer_%d' % i]['path_%d' % j] = []
-
-                    for k, point in enumerate(path.points):
-
-                        n = normals[count] if generate_mesh_normals else Vector(0, 1, 0)
-                        printpoint = PrintPoint(pt=point, layer_height=self.slicer.layer_height, mesh_normal=n)
-
-                        if layer.is_brim or layer.is_raft:
-                            printpoint.up_vector = Vector(0, 0, 1)
-                        else:
-                            printpoint.up_vector = self.get_printpoint_up_vector(path, k, n)
-
-                        self.printpoints_dict['layer_%d' % i]['path_%d' % j].append(printpoint)
-                        bar.update(count)
-                        count += 1
+        toolpath = Toolpath.from_layers(self.slicer.layers)
+        coords = toolpath.coords
+        n = toolpath.number_of_points
+
+        if generate_mesh_normals:
+            logger.info('Generating mesh normals ...')
+            # the normals of the closest mesh faces to all the printpoints
+            query = utils.get_mesh_query(self.slicer.mesh)
+            closest_faces, _, _ = query.closest_points(coords)
+            faces, inverse = np.unique(closest_faces, return_inverse=True)
+            face_normals = np.array([self.slicer.mesh.face_normal(fkey) for fkey in query.fkeys[faces].tolist()],
+                                    dtype=np.float64)
+            normals = face_normals.reshape((-1, 3))[inverse.reshape(-1)]
+        else:
+            normals = np.tile([0.0, 1.0, 0.0], (n, 1))
+
+        up_vectors = self.get_printpoints_up_vectors(coords, toolpath.path_offsets, normals)
+        points_per_path = np.diff(toolpath.path_offsets)
+        is_brim_or_raft = np.repeat(toolpath.is_brim | toolpath.is_raft, points_per_path)
+        up_vectors[is_brim_or_raft] = (0.0, 0.0, 1.0)
+
+        self.printpoints_table = PrintPointTable(pt=coords, path_offsets=toolpath.path_offsets,
+                                                 layer_offsets=toolpath.layer_offsets, mesh_normal=normals,
+                                                 up_vector=up_vectors,
+                                                 layer_height=np.full(n, self.slicer.layer_height, dtype=np.float64))
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 from compas.geometry import norm_vector, Vector
 import logging
+import numpy as np
 
 logger = logging.getLogger('logger')
 
@@ -21,6 +22,10 @@ def set_blend_radius(print_organizer, d_fillet=10, buffer=0.3):
 
     logger.info("Setting blend radius")
 
+    if print_organizer.is_backed_by_table:
+        set_blend_radius_on_table(print_organizer.printpoints_table, d_fillet, buffer)
+        return
+
     extruder_state = 0
 
     for printpoint, i, j, k in print_organizer.printpoints_indices_iterator():
@@ -52,5 +57,25 @@ def set_blend_radius(print_organizer, d_fillet=10, buffer=0.3):
         printpoint.blend_radius = radius
 
 
+def set_blend_radius_on_table(table, d_fillet=10, buffer=0.3):
+    """ Same as set_blend_radius, on the columns of a :class:`compas_slicer.geometry.PrintPointTable`. """
+    radius = np.zeros(table.number_of_printpoints)  # 0.0 blend radius for points where the robot will pause and wait
+
+    # the extruder state of each printpoint without wait time is the extruder_toggle of the previous printpoint without
+    # wait time. If the extruder_toggle changes, it must be a new path and therefore the blend radius should be 0
+    rows = np.flatnonzero(np.isnan(table.wait_time) | (table.wait_time == 0))
+    toggles = table.extruder_toggle[rows]
+    extruder_state = np.concatenate([[0], toggles[:-1]])
+    rows = rows[toggles == extruder_state]
+
+    d_prev = table.distances_to_previous()
+    d_next = np.append(d_prev[1:], np.nan)  # nan at the end of each path
+    r = np.full(len(rows), float(d_fillet))
+    r = np.fmin(r, d_prev[rows] * buffer)
+    r = np.fmin(r, d_next[rows] * buffer)
+    radius[rows] = [round(value, 5) for value in r.tolist()]
+    table.blend_radius[:] = radius
+
+
 if __name__ == "__main__":
     pass
@@ -1,4 +1,5 @@
 import logging
+import numpy as np
 from copy import deepcopy
 
 logger = logging.getLogger('logger')
@@ -54,6 +55,13 @@ def smooth_printpoint_attribute(print_organizer, iterations, strength, get_attr_
 def smooth_printpoints_layer_heights(print_organizer, iterations, strength):
     """ This function is an example for how the 'smooth_printpoint_attribute' function can be used. """
 
+    if print_organizer.is_backed_by_table:
+        table = print_organizer.printpoints_table
+        assert np.all(table.layer_height != 0) and not np.any(np.isnan(table.layer_height)), \
+            'The attribute you are trying to smooth has not been assigned a value'
+        table.layer_height[:] = smooth_values(table.layer_height, iterations, strength)
+        return
+
     def get_ppt_layer_height(printpoint):
         return printpoint.layer_height  # get value
 
@@ -66,6 +74,11 @@ def smooth_printpoints_layer_heights(print_organizer, iterations, strength):
 def smooth_printpoints_up_vectors(print_organizer, iterations, strength):
     """ This function is an example for how the 'smooth_printpoint_attribute' function can be used. """
 
+    if print_organizer.is_backed_by_table:
+        table = print_organizer.printpoints_table
+        table.up_vector[:] = smooth_values(table.up_vector, iterations, strength)
+        return
+
     def get_ppt_up_vec(printpoint):
         return printpoint.up_vector  # get value
 
@@ -73,6 +86,38 @@ def smooth_printpoints_up_vectors(print_organizer, iterations, strength):
         printpoint.up_vector = v  # set value
 
     smooth_printpoint_attribute(print_organizer, iterations, strength, get_ppt_up_vec, set_ppt_up_vec)
-    # finally update any values in the printpoints that are affected by the changed attribute
-    for ppt in print_organizer.printpoints_iterator():
-        ppt.frame = ppt.get_frame()
+    # the frames of the printpoints are recomputed lazily from the new up vectors
+
+
+def smooth_values(values, iterations, strength):
+    """
+    Same smoothing as 'smooth_printpoint_attribute', on an array of values.
+
+    Parameters
+    ----------
+    values: np.array, float, (#values) or (#values x d), the values of the printpoints in the printing order.
+    iterations: int, smoothing iterations
+    strength: float. in the range [0.0 - 1.0]
+
+    Returns
+    -------
+    np.array, float, the smoothened values, same shape as the input values
+    """
+    values = np.array(values, dtype=np.float64)
+    if iterations < 1 or len(values) < 3:
+        return values
+
+    # the first iteration averages the neighbors of the input values
+    new_values = values.copy()
+    new_values[1:-1] = ((values[:-2] + values[2:]) * 0.5) * strength + values[1:-1] * (1 - strength)
+
+    # the next iterations update the values in place, as 'smooth_printpoint_attribute' does, so each value is averaged
+    # with the already updated value of its previous neighbor
+    if iterations > 1:
+        columns = new_values.reshape((len(values), -1)).T.tolist()
+        for column in columns:
+            for _ in range(iterations - 1):
+                for i in range(1, len(column) - 1):
+                    column[i] = ((column[i - 1] + column[i + 1]) * 0.5) * strength + column[i] * (1 - strength)
+        new_values = np.array(columns).T.reshape(values.shape)
+    return new_values
@@ -1,5 +1,6 @@
 import compas_slicer
 import logging
+import numpy as np
 
 logger = logging.getLogger('logger')
 
@@ -19,38 +20,18 @@ def set_extruder_toggle(print_organizer, slicer):
 
     logger.info("Setting extruder toggle")
 
+    if print_organizer.is_backed_by_table:
+        set_extruder_toggle_on_table(print_organizer.printpoints_table, slicer)
+        return
+
     pp_dict = print_organizer.printpoints_dict
 
     for i, layer in enumerate(slicer.layers):
         layer_key = 'layer_%d' % i
-        is_vertical_layer = isinstance(layer, compas_slicer.geometry.VerticalLayer)
-        is_brim_layer = layer.is_brim
 
         for j, path in enumerate(layer.paths):
             path_key = 'path_%d' % j
-            is_closed_path = path.is_closed
-
-            # --- decide if the path should be interrupted at the end
-            interrupt_path = False
-
-            if not is_closed_path:
-                interrupt_path = True
-                # open paths should always be interrupted
-
-            if not is_vertical_layer and len(layer.paths) > 1:
-                interrupt_path = True
-                # horizontal layers with multiple paths should be interrupted so that the extruder
-                # can travel from one path to the other, exception is added for the brim layers
-                if is_brim_layer and (j + 1) % layer.number_of_brim_offsets != 0:
-                    interrupt_path = False
-
-            if is_vertical_layer and j == len(layer.paths) - 1:
-                interrupt_path = True
-                # the last path of a vertical layer should be interrupted
-
-            if i < len(slicer.layers)-1:
-                if not slicer.layers[i+1].paths[0].is_closed:
-                    interrupt_path = True
+            interrupt_path = is_interrupted_path(slicer, i, j)
 
             # --- create extruder toggles
             try:
@@ -77,6 +58,54 @@ def set_extruder_toggle(print_organizer, slicer):
             logger.exception(e)
 
 
+def set_extruder_toggle_on_table(table, slicer):
+    """ Same as set_extruder_toggle, on the columns of a :class:`compas_slicer.geometry.PrintPointTable`. """
+    paths, interrupted_paths = [], []
+    for i, layer in enumerate(slicer.layers):
+        for j, path in enumerate(layer.paths):
+            if i >= table.number_of_layers or j >= table.number_of_paths_on_layer(i):
+                logger.error("no path found for layer layer_%d" % i)
+                continue
+            paths.append(table.layer_offsets[i] + j)
+            if is_interrupted_path(slicer, i, j):
+                interrupted_paths.append(table.layer_offsets[i] + j)
+
+    table.extruder_toggle[np.isin(table.path_id, paths)] = 1
+    interrupted_paths = np.array(interrupted_paths, dtype=np.int64)
+    ends = table.path_offsets[interrupted_paths + 1] - 1
+    table.extruder_toggle[ends[ends >= table.path_offsets[interrupted_paths]]] = 0  # the ends of non-empty paths
+    if table.number_of_printpoints > 0:
+        table.extruder_toggle[-1] = 0  # set extruder toggle of last print point to false
+
+
+def is_interrupted_path(slicer, i, j):
+    """ Returns True if the extruder should be interrupted at the end of the path j of the layer i of the slicer. """
+    layer = slicer.layers[i]
+    is_vertical_layer = isinstance(layer, compas_slicer.geometry.VerticalLayer)
+    interrupt_path = False
+
+    if not layer.paths[j].is_closed:
+        interrupt_path = True
+        # open paths should always be interrupted
+
+    if not is_vertical_layer and len(layer.paths) > 1:
+        interrupt_path = True
+        # horizontal layers with multiple paths should be interrupted so that the extruder
+        # can travel from one path to the other, exception is added for the brim layers
+        if layer.is_brim and (j + 1) % layer.number_of_brim_offsets != 0:
+            interrupt_path = False
+
+    if is_vertical_layer and j == len(layer.paths) - 1:
+        interrupt_path = True
+        # the last path of a vertical layer should be interrupted
+
+    if i < len(slicer.layers) - 1:
+        if not slicer.layers[i + 1].paths[0].is_closed:
+            interrupt_path = True
+
+    return interrupt_path
+
+
 def override_extruder_toggle(print_organizer, override_value):
     """Overrides the extruder_toggle value for the printpoints with a user-defined value.
 
@@ -88,12 +117,17 @@ def override_extruder_toggle(print_organizer, override_value):
 
     """
     assert isinstance(override_value, bool), "Override value must be of type bool"
+    if print_organizer.is_backed_by_table:
+        print_organizer.printpoints_table.extruder_toggle[:] = int(override_value)
+        return
     for printpoint in print_organizer.printpoints_iterator():
         printpoint.extruder_toggle = override_value
 
 
 def check_assigned_extruder_toggle(print_organizer):
     """ Checks that all the printpoints have an assigned extruder toggle. """
+    if print_organizer.is_backed_by_table:
+        return bool(np.all(print_organizer.printpoints_table.extruder_toggle >= 0))
     all_toggles_assigned = True
     for printpoint in print_organizer.printpoints_iterator():
         if printpoint.extruder_toggle is None:
@@ -2,10 +2,11 @@ import logging
 import math
 from math import degrees, radians
 from compas_slicer.parameters import get_param
-from compas.geometry import Point, Vector, Rotation
+from compas.geometry import Rotation
 from compas.geometry import euler_angles_from_matrix,matrix_from_basis_vectors,multiply_matrices
-from compas_slicer.geometry import PrintPoint
+from compas_slicer.geometry.print_point_table import cross
 from datetime import datetime
+import numpy as np
 
 logger = logging.getLogger('logger')
 
@@ -109,67 +110,60 @@ def create_gcode_text(print_organizer, parameters):
     # global parameters
     # retraction_on = True  # boolean; is true when retraction is toggled
     fan_on = False  # boolean; is true when fan is toggled
-    prev_point = PrintPoint(Point(0, 0, 0), layer_height=1.0,
-                            mesh_normal=Vector(1.0, 0.0, 0.0))  # dummy print_point that is overwritten
+    prev_x, prev_y, prev_z = 0.0, 0.0, 0.0  # dummy position of the previous print_point that is overwritten
     layer_height = 0.2  # dummy value that is overwritten
     # ______________________________________________________________________/ global parameters
 
     # ######################################################################
     # iterate all layers, paths
     print('')
-    for point_v, i, j, k in print_organizer.printpoints_indices_iterator():  # i: layer; j: path; k: point index
-        layer_height = point_v.layer_height
+    # i: layer; k: point index in the path; a, b, c: tool orientation (euler angles in degrees)
+    for x, y, z, a, b, c, layer_height, extruder_toggle, i, k in get_gcode_printpoints_data(print_organizer):
         # Calculate relative length
-        re_l = ((point_v.pt.x - prev_point.pt.x) ** 2 + (point_v.pt.y - prev_point.pt.y) ** 2 + (
-                point_v.pt.z - prev_point.pt.z) ** 2) ** 0.5
-        # Calculate the tool orientation
-        R= Rotation.from_frame(point_v.frame)
-        Ry = Rotation.from_axis_and_angle([0, 1, 0], math.pi)
-        R = R * Ry
-        ea = euler_angles_from_matrix(R.matrix)
+        re_l = ((x - prev_x) ** 2 + (y - prev_y) ** 2 + (z - prev_z) ** 2) ** 0.5
         if k == 0:  # 'First point
             # retract before moving to first point in path if necessary
-            if (retraction_min_travel < re_l) and (point_v.extruder_toggle is False):
+            if (retraction_min_travel < re_l) and (extruder_toggle is False):
                 gcode += "G1 F" + str(feedrate_retraction) + "    ;set retraction feedrate" + n_l
                 gcode += "G1" + " E-" + str(retraction_length) + "      ;retract" + n_l
                 # ZHOP
-                gcode += "G1" + " Z" + '{:.3f}'.format(prev_point.pt.z + z_hop) + "  ;z-hop" + n_l
+                gcode += "G1" + " Z" + '{:.3f}'.format(prev_z + z_hop) + "  ;z-hop" + n_l
                 # move to first point in path:
                 gcode += "G1" + " F" + str(feedrate_travel) + "    ;set travel feedrate" + n_l
-                if prev_point.pt.z != point_v.pt.z:
-                    gcode += "G1 X" + '{:.3f}'.format(point_v.pt.x) + " Y" + '{:.3f}'.format(point_v.pt.y) + " Z" + '{:.3f}'.format(point_v.pt.z) \
-                    + " A" + '{:.3f}'.format(degrees(ea[0])) + " B" + '{:.3f}'.format(degrees(ea[1])) + " C" + '{:.3f}'.format(degrees(ea[2])) \
+                if prev_z != z:
+                    gcode += "G1 X" + '{:.3f}'.format(x) + " Y" + '{:.3f}'.format(y) + " Z" + '{:.3f}'.format(z) \
+                    + " A" + '{:.3f}'.format(a) + " B" + '{:.3f}'.format(b) + " C" + '{:.3f}'.format(c) \
                     + n_l
                 else:
-                    gcode += "G1 X" + '{:.3f}'.format(point_v.pt.x) + " Y" + '{:.3f}'.format(point_v.pt.y) \
-                    + " A" + '{:.3f}'.format(degrees(ea[0])) + " B" + '{:.3f}'.format(degrees(ea[1])) + " C" + '{:.3f}'.format(degrees(ea[2])) \
+                    gcode += "G1 X" + '{:.3f}'.format(x) + " Y" + '{:.3f}'.format(y) \
+                    + " A" + '{:.3f}'.format(a) + " B" + '{:.3f}'.format(b) + " C" + '{:.3f}'.format(c) \
                     + n_l
                 # reverse z-hop after reaching the first point
                 gcode += "G1 F" + str(feedrate_retraction) + "    ;set retraction feedrate" + n_l
-                gcode += "G1" + " Z" + '{:.3f}'.format(point_v.pt.z) + "  ;reverse z-hop" + n_l
+                gcode += "G1" + " Z" + '{:.3f}'.format(z) + "  ;reverse z-hop" + n_l
                 # reverse retract after reaching the first point
                 gcode += "G1" + " E" + str(retraction_length) + "       ;reverse retraction" + n_l
             else:
-                if prev_point.pt.z != point_v.pt.z:
-                    gcode += "G1 X" + '{:.3f}'.format(point_v.pt.x) + " Y" + '{:.3f}'.format(point_v.pt.y) + " Z" + '{:.3f}'.format(point_v.pt.z) \
-                    + " A" + '{:.3f}'.format(degrees(ea[0])) + " B" + '{:.3f}'.format(degrees(ea[1])) + " C" + '{:.3f}'.format(degrees(ea[2])) + n_l                     
+                if prev_z != z:
+                    gcode += "G1 X" + '{:.3f}'.format(x) + " Y" + '{:.3f}'.format(y) + " Z" + '{:.3f}'.format(z) \
+                    + " A" + '{:.3f}'.format(a) + " B" + '{:.3f}'.format(b) + " C" + '{:.3f}'.format(c) + n_l                     
                 else:
-                    gcode += "G1 X" + '{:.3f}'.format(point_v.pt.x) + " Y" + '{:.3f}'.format(point_v.pt.y) \
-                    + " A" + '{:.3f}'.format(degrees(ea[0])) + " B" + '{:.3f}'.format(degrees(ea[1])) + " C" + '{:.3f}'.format(degrees(ea[2])) + n_l
+                    gcode += "G1 X" + '{:.3f}'.format(x) + " Y" + '{:.3f}'.format(y) \
+                    + " A" + '{:.3f}'.format(a) + " B" + '{:.3f}'.format(b) + " C" + '{:.3f}'.format(c) + n_l
             # set extrusion feedrate: low for adhesion to bed and normal otherwise
-            if point_v.pt.z < min_over_z:
+            if z < min_over_z:
                 gcode += "G1" + " F" + str(feedrate_low) + "    ;set low feedrate" + n_l
             else:
                 gcode += "G1" + " F" + str(feedrate) + "    ;set extrusion feedrate" + n_l
         else:  # from 2nd point in each path onwards
             # Calculate feedrate : TODO: just a basic formula for now, better ones in the future
             e_val = flowrate * 4 * re_l * layer_height * path_width / (math.pi * (filament_diameter ** 2))
-            if point_v.pt.z < min_over_z:
+            if z < min_over_z:
                 e_val *= flow_over
-            gcode += "G1 X" + '{:.3f}'.format(point_v.pt.x) + " Y" + '{:.3f}'.format(point_v.pt.y) + " Z" + '{:.3f}'.format(point_v.pt.z) \
-            + " A" + '{:.3f}'.format(degrees(ea[0])) + " B" + '{:.3f}'.format(degrees(ea[1])) + " C" + '{:.3f}'.format(degrees(ea[2])) \
+            gcode += "G1 X" + '{:.3f}'.format(x) + " Y" + '{:.3f}'.format(y) + " Z" + '{:.3f}'.format(z) \
+            + " A" + '{:.3f}'.format(a) + " B" + '{:.3f}'.format(b) + " C" + '{:.3f}'.format(c) \
             + " E" + '{:.3f}'.format(e_val) + n_l
-        prev_point = point_v
+        prev_x, prev_y, prev_z = x, y, z
         if fan_on is False:
             if i * layer_height >= fan_start_z:  # 'Fan On:
                 gcode += "M106 S" + str(fan_speed) + "     ;set fan on to set speed" + n_l
@@ -178,7 +172,7 @@ def create_gcode_text(print_organizer, parameters):
     # 'retract after last path
     gcode += "G1 F" + str(feedrate_retraction) + "     ;set ret spd" + n_l
     gcode += "G1" + " E-" + str(retraction_length) + "       ;ret fil" + n_l
-    gcode += "G1" + " Z" + '{:.3f}'.format(3 * (prev_point.pt.z + z_hop)) + "  ;ZHop" + n_l
+    gcode += "G1" + " Z" + '{:.3f}'.format(3 * (prev_z + z_hop)) + "  ;ZHop" + n_l
     gcode += "G1 F" + str(feedrate_travel) + "    ;set ret spd" + n_l
 
     #######################################################################
@@ -193,3 +187,58 @@ def create_gcode_text(print_organizer, parameters):
     # ______________________________________________________________________/ footer
 
     return gcode
+
+
+def get_gcode_printpoints_data(print_organizer):
+    """
+    Returns a list with the data of each printpoint that is needed for the gcode, in the printing order:
+    (x, y, z, a, b, c, layer_height, extruder_toggle, i, k), where a, b, c are the euler angles of the tool orientation
+    in degrees, i is the layer index and k is the index of the printpoint in its path.
+    """
+    if print_organizer.is_backed_by_table:
+        table = print_organizer.printpoints_table
+        x_axis, y_axis = table.frames_axes()
+        angles = np.degrees(get_tool_euler_angles(x_axis, y_axis))
+        toggles = [None if toggle < 0 else bool(toggle) for toggle in table.extruder_toggle.tolist()]
+        k = np.arange(table.number_of_printpoints) - table.path_offsets[table.path_id]
+        return zip(*table.pt.T.tolist(), *angles.T.tolist(), table.layer_height.tolist(), toggles,
+                   table.layer_index.tolist(), k.tolist())
+
+    data = []
+    Ry = Rotation.from_axis_and_angle([0, 1, 0], math.pi)
+    for point_v, i, j, k in print_organizer.printpoints_indices_iterator():  # i: layer; j: path; k: point index
+        # Calculate the tool orientation
+        R = Rotation.from_frame(point_v.frame)
+        R = R * Ry
+        ea = euler_angles_from_matrix(R.matrix)
+        data.append((point_v.pt.x, point_v.pt.y, point_v.pt.z, degrees(ea[0]), degrees(ea[1]), degrees(ea[2]),
+                     point_v.layer_height, point_v.extruder_toggle, i, k))
+    return data
+
+
+def get_tool_euler_angles(x_axis, y_axis):
+    """
+    Returns np.array, float, (#frames x 3), the euler angles of the tool orientation of many frames at once,
+    same as euler_angles_from_matrix(Rotation.from_frame(frame) * Rotation.from_axis_and_angle([0, 1, 0], math.pi)).
+
+    Parameters
+    ----------
+    x_axis: np.array, float, (#frames x 3)
+    y_axis: np.array, float, (#frames x 3)
+    """
+    R = np.stack([x_axis, y_axis, cross(x_axis, y_axis), np.zeros_like(x_axis)], axis=2)  # the frame axes as columns
+    Ry = Rotation.from_axis_and_angle([0, 1, 0], math.pi).matrix
+
+    # multiply R * Ry with the same order of operations as compas.geometry.multiply_matrices
+    M = np.zeros((len(R), 3, 3))
+    for col in range(3):
+        for row in range(4):
+            M[:, :, col] += R[:, :, row] * Ry[row][col]
+
+    # euler_angles_from_matrix, static xyz axes
+    cy = np.sqrt(M[:, 0, 0] * M[:, 0, 0] + M[:, 1, 0] * M[:, 1, 0])
+    regular = cy > 1e-16
+    ax = np.where(regular, np.arctan2(M[:, 2, 1], M[:, 2, 2]), np.arctan2(-M[:, 1, 2], M[:, 1, 1]))
+    ay = np.arctan2(-M[:, 2, 0], cy)
+    az = np.where(regular, np.arctan2(M[:, 1, 0], M[:, 0, 0]), 0.0)
+    return np.stack([ax, ay, az], axis=1)
@@ -1,6 +1,7 @@
 from compas.geometry import Vector, dot_vectors
 from compas_slicer.utilities import remap, remap_unbound
 import logging
+import numpy as np
 
 logger = logging.getLogger('logger')
 
@@ -20,6 +21,9 @@ def set_linear_velocity_constant(print_organizer, v=25.0):
     """
 
     logger.info("Setting constant linear velocity")
+    if print_organizer.is_backed_by_table:
+        print_organizer.printpoints_table.velocity[:] = v
+        return
     for printpoint in print_organizer.printpoints_iterator():
         printpoint.velocity = v
 
@@ -37,6 +41,10 @@ def set_linear_velocity_per_layer(print_organizer, per_layer_velocities):
     logger.info("Setting per-layer linear velocity")
     assert len(per_layer_velocities) == print_organizer.number_of_layers, 'Wrong number of velocity values. You need \
         to provide one velocity value per layer, on the "per_layer_velocities" list.'
+    if print_organizer.is_backed_by_table:
+        table = print_organizer.printpoints_table
+        table.velocity[:] = np.asarray(per_layer_velocities, dtype=np.float64)[table.layer_index]
+        return
     for printpoint, i, j, k in print_organizer.printpoints_indices_iterator():
         printpoint.velocity = per_layer_velocities[i]
 
@@ -85,10 +93,30 @@ def set_linear_velocity_by_overhang(print_organizer, overhang_range, velocity_ra
     bound_remapping: bool
     """
 
+    if print_organizer.is_backed_by_table:
+        logger.info("Setting linear velocity based on parameter range")
+        table = print_organizer.printpoints_table
+        n = table.mesh_normal
+        params = n[:, 0] * 0.0 + n[:, 1] * 0.0 + n[:, 2] * 1.0  # dot product with the z axis
+        assert np.all(params != 0.0), 'The param_func does not return any value for calculating the velocity range.'
+        table.velocity[:] = remap_array(params, parameter_range=overhang_range, velocity_range=velocity_range,
+                                        bound_remapping=bound_remapping)
+        return
+
     def param_func(ppt): return dot_vectors(ppt.mesh_normal, Vector(0.0, 0.0, 1.0))
     # returns values from 0.0 (no overhang) to 1.0 (horizontal overhang)
     set_linear_velocity_by_range(print_organizer, param_func, overhang_range, velocity_range, bound_remapping)
 
 
+def remap_array(params, parameter_range, velocity_range, bound_remapping=True):
+    """ Same as remap (if bound_remapping) or remap_unbound applied on each one of the params. """
+    in_from, in_to = parameter_range
+    out_from, out_to = velocity_range
+    v = out_from + ((params - in_from) / (in_to - in_from)) * (out_to - out_from)
+    if bound_remapping:
+        v = np.where(params <= in_from, out_from, np.where(params >= in_to, out_to, v))
+    return v
+
+
 if __name__ == "__main__":
     pass
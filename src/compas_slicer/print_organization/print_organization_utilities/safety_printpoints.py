@@ -3,6 +3,7 @@ from compas_slicer.print_organization.print_organization_utilities.extruder_togg
 from compas_slicer.utilities import find_next_printpoint
 import copy
 import logging
+import numpy as np
 
 logger = logging.getLogger('logger')
 
@@ -23,6 +24,10 @@ def add_safety_printpoints(print_organizer, z_hop=10.0):
         'You need to set the extruder toggles first, before you can create safety points'
     logger.info("Generating safety print points with height " + str(z_hop) + " mm")
 
+    if print_organizer.is_backed_by_table:
+        print_organizer.printpoints_table = add_safety_printpoints_to_table(print_organizer.printpoints_table, z_hop)
+        return
+
     pp_dict = print_organizer.printpoints_dict
     pp_copy_dict = {}  # should not be altering the dict that we are iterating through > copy
 
@@ -59,6 +64,44 @@ def add_safety_printpoints(print_organizer, z_hop=10.0):
     print_organizer.printpoints_dict = pp_copy_dict
 
 
+def add_safety_printpoints_to_table(table, z_hop=10.0):
+    """
+    Same as add_safety_printpoints, on a :class:`compas_slicer.geometry.PrintPointTable`.
+
+    Returns
+    ----------
+    :class:`compas_slicer.geometry.PrintPointTable`, with the safety printpoints
+    """
+    n = table.number_of_printpoints
+    if n == 0:
+        return table
+    rows = np.arange(n)
+    is_stop = table.extruder_toggle == 0
+    next_is_start = np.append(table.extruder_toggle[1:] == 1, False)
+
+    # each printpoint is followed by a safety copy of itself if it is an interruption, and then by a safety copy of
+    # the next printpoint if that one is a printing printpoint
+    copies = [rows, np.where(is_stop, rows, -1), np.where(is_stop & next_is_start, rows + 1, -1)]
+    new_rows = np.stack(copies, axis=1).reshape(-1)
+    is_safety = np.tile([False, True, True], n)
+    path_id = np.repeat(table.path_id, 3)
+    keep = new_rows >= 0
+    new_rows, is_safety, path_id = new_rows[keep], is_safety[keep], path_id[keep]
+
+    #  finally, insert a safety print point at the beginning of the entire print
+    new_rows = np.concatenate([[0], new_rows])
+    is_safety = np.concatenate([[True], is_safety])
+    path_id = np.concatenate([[table.path_id[0]], path_id])
+
+    new_table = table.take(new_rows, path_id=path_id)
+    new_table.pt[is_safety, 2] += z_hop
+    new_table.extruder_toggle[is_safety] = 0
+    if new_table.attributes:  # the safety printpoints are copies of the printpoints
+        for row in np.flatnonzero(is_safety).tolist():
+            new_table.attributes[row] = copy.deepcopy(new_table.attributes[row])
+    return new_table
+
+
 def create_safety_printpoint(printpoint, z_hop, extruder_toggle):
     """
 
@@ -75,8 +118,10 @@ def create_safety_printpoint(printpoint, z_hop, extruder_toggle):
 
     pt0 = printpoint.pt
     safety_printpoint = copy.deepcopy(printpoint)
+    frame = safety_printpoint.frame  # keep the orientation of the frame, which may have been set explicitly
     safety_printpoint.pt = pt0 + Vector(0, 0, z_hop)
-    safety_printpoint.frame.point = safety_printpoint.pt
+    frame.point = safety_printpoint.pt
+    safety_printpoint.frame = frame  # after pt, whose setter discards the frame
     safety_printpoint.extruder_toggle = extruder_toggle
     return safety_printpoint
 
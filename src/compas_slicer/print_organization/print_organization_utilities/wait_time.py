@@ -1,7 +1,9 @@
 import logging
 from compas_slicer.utilities import find_next_printpoint
 import math
+import numpy as np
 from compas.geometry import Vector, normalize_vector
+from compas_slicer.geometry.print_point_table import normalize_rows
 
 logger = logging.getLogger('logger')
 
@@ -22,6 +24,20 @@ def set_wait_time_on_sharp_corners(print_organizer, threshold=0.5 * math.pi, wai
     wait_time: float
         Time in seconds to introduce to add as a wait time
     """
+    if print_organizer.is_backed_by_table:
+        table = print_organizer.printpoints_table
+        rows = np.flatnonzero(~table.is_path_start & ~table.is_path_end)  # printpoints with prev and next printpoints
+        v_to_prev = normalize_rows(table.pt[rows - 1] - table.pt[rows])
+        v_to_next = normalize_rows(table.pt[rows + 1] - table.pt[rows])
+        lengths = np.linalg.norm(v_to_prev, axis=1) * np.linalg.norm(v_to_next, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cos_a = np.clip(np.sum(v_to_prev * v_to_next, axis=1) / lengths, -1.0, 1.0)
+        wait_rows = rows[np.arccos(cos_a) < threshold]
+        table.wait_time[wait_rows] = wait_time
+        table.blend_radius[wait_rows] = 0.0  # 0.0 blend radius for points where the robot will wait
+        logger.info('Added wait times for %d points' % len(wait_rows))
+        return
+
     number_of_wait_points = 0
     for printpoint, i, j, k in print_organizer.printpoints_indices_iterator():
         neighbors = print_organizer.get_printpoint_neighboring_items('layer_%d' % i, 'path_%d' % j, k)
@@ -57,6 +73,10 @@ def set_wait_time_based_on_extruder_toggle(print_organizer, wait_type, wait_time
         Time in seconds to introduce to add as a wait time
     """
 
+    if print_organizer.is_backed_by_table:
+        set_wait_time_based_on_extruder_toggle_on_table(print_organizer, wait_type, wait_time)
+        return
+
     for printpoint in print_organizer.printpoints_iterator():
         assert printpoint.extruder_toggle is not None, \
             'You need to set the extruder toggles first, before you can automatically set the wait time'
@@ -94,6 +114,38 @@ def set_wait_time_based_on_extruder_toggle(print_organizer, wait_type, wait_time
         logger.info('Added wait times for %d points' % number_of_wait_points)
 
 
+def set_wait_time_based_on_extruder_toggle_on_table(print_organizer, wait_type, wait_time=0.3):
+    """ Same as set_wait_time_based_on_extruder_toggle, on the columns of the printpoints_table. """
+    table = print_organizer.printpoints_table
+    toggle = table.extruder_toggle
+    assert np.all(toggle >= 0), 'You need to set the extruder toggles first, before you can automatically set the ' \
+                                'wait time'
+
+    logger.info("Setting wait time")
+
+    # for the brim layer don't add any wait times
+    is_brim_layer = np.array([layer.is_brim for layer in print_organizer.slicer.layers], dtype=bool)
+    has_next = np.arange(table.number_of_printpoints) < table.number_of_printpoints - 1
+    rows = np.flatnonzero(has_next & ~is_brim_layer[table.layer_index])
+    starts = (toggle[rows] == 0) & (toggle[rows + 1] == 1)  # extruder_toggle False to True
+    stops = (toggle[rows] == 1) & (toggle[rows + 1] == 0)  # extruder_toggle True to False
+
+    if wait_type == "wait_before_extrusion":
+        is_wait = starts
+    elif wait_type == "wait_after_extrusion":
+        is_wait = stops
+    elif wait_type == "wait_before_and_after_extrusion":
+        is_wait = starts | stops
+    else:
+        logger.error('Unknown wait type : ' + str(wait_type))
+        return
+
+    next_rows = rows[is_wait] + 1
+    table.wait_time[next_rows] = wait_time
+    table.blend_radius[next_rows] = 0.0
+    logger.info('Added wait times for %d points' % len(next_rows))
+
+
 def override_wait_time(print_organizer, override_value):
     """
     Overrides the wait_time value for the printpoints with a user-defined value.
@@ -104,6 +156,9 @@ def override_wait_time(print_organizer, override_value):
     override_value: float
         Value to override the wait_time values with.
     """
+    if print_organizer.is_backed_by_table:
+        print_organizer.printpoints_table.wait_time[:] = np.nan if override_value is None else override_value
+        return
     for printpoint in print_organizer.printpoints_iterator():
         printpoint.wait_time = override_value
 
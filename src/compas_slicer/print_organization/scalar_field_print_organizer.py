@@ -58,9 +58,8 @@ class ScalarFieldPrintOrganizer(BasePrintOrganizer):
                 for j, path in enumerate(layer.paths):
                     self.printpoints_dict['layer_%d' % i]['path_%d' % j] = []
 
-                    for k, point in enumerate(path.points):
-                        normal = utils.get_normal_of_path_on_xy_plane(k, point, path, self.slicer.mesh)
-
+                    normals = utils.get_normals_of_path_on_xy_plane(path, self.slicer.mesh)
+                    for point, normal in zip(path.points, normals):
                         h = get_param(self.parameters, 'avg_layer_height', defaults_type='layers')
                         printpoint = PrintPoint(pt=point, layer_height=h, mesh_normal=normal)
 
@@ -82,7 +81,6 @@ class ScalarFieldPrintOrganizer(BasePrintOrganizer):
                     pp.distance_to_support = grad_norm
                     pp.layer_height = grad_norm
                     pp.up_vector = Vector(*normalize_vector(grad))
-                    pp.frame = pp.get_frame()
 
     def add_gradient_to_vertices(self):
         g_evaluation = GradientEvaluation(self.slicer.mesh, self.DATA_PATH)
@@ -2,7 +2,7 @@ import compas
 import numpy as np
 from compas.datastructures import Mesh
 from compas_slicer.utilities import utils
-from compas_slicer.geometry import Layer, VerticalLayer
+from compas_slicer.geometry import Layer, VerticalLayer, Toolpath
 from compas_slicer.post_processing import seams_align
 from compas_slicer.post_processing import unify_paths_orientation
 from random import sample
@@ -48,11 +48,11 @@ class BaseSlicer(object):
 
     @property
     def number_of_points(self):
-        """ Returns int: Total number of points in the slicer."""
+        """ Returns int: Total number of points in the slicer. Walks all the paths, see to_toolpath for O(1) counts."""
         total_number_of_pts = 0
         for layer in self.layers:
             for path in layer.paths:
-                total_number_of_pts += len(path.points)
+                total_number_of_pts += path.number_of_points
         return total_number_of_pts
 
     @property
@@ -62,7 +62,10 @@ class BaseSlicer(object):
 
     @property
     def number_of_paths(self):
-        """ Returns tuple (int, int, int): Total number of paths, number of open paths, number of closed paths. """
+        """
+        Returns tuple (int, int, int): Total number of paths, number of open paths, number of closed paths.
+        Walks all the paths, see to_toolpath for O(1) counts.
+        """
         total_number_of_paths = 0
         closed_paths = 0
         open_paths = 0
@@ -180,6 +183,28 @@ class BaseSlicer(object):
         print("Number of sampling printpoints on layers: %d" % self.number_of_points)
         print("")
 
+    ##############################
+    #  --- To toolpath, from toolpath
+
+    def to_toolpath(self):
+        """Returns a :class: 'compas_slicer.geometry.Toolpath' with all the paths of the slicer.
+
+        The Toolpath is a snapshot of the current layers, the counts and bounds of the sliced print can be read from
+        it in O(1).
+        """
+        return Toolpath.from_layers(self.layers, layer_height=self.layer_height)
+
+    def from_toolpath(self, toolpath):
+        """Replaces the layers of the slicer with the layers of the toolpath.
+
+        Parameters
+        ----------
+        toolpath: :class: 'compas_slicer.geometry.Toolpath'
+        """
+        self.layers = toolpath.to_layers()
+        if toolpath.layer_height is not None:
+            self.layer_height = toolpath.layer_height
+
     ##############################
     #  --- To data, from data
 
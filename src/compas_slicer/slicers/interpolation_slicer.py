@@ -3,8 +3,9 @@ from compas_slicer.slicers import BaseSlicer
 import logging
 import progressbar
 from compas_slicer.parameters import get_param
-from compas_slicer.pre_processing import assign_interpolation_distance_to_mesh_vertices
-from compas_slicer.slicers.slice_utilities import ScalarFieldContours
+from compas_slicer.pre_processing import get_interpolation_distances, get_interpolation_distances_batch
+from compas_slicer.slicers.slice_utilities import ScalarFieldContours, get_mesh_topology
+from compas_slicer.slicers.slice_utilities import create_scalar_field_contours_parallel
 from compas_slicer.geometry import VerticalLayersManager
 
 logger = logging.getLogger('logger')
@@ -24,9 +25,11 @@ class InterpolationSlicer(BaseSlicer):
         We recommend to 1)re-topologize, 2) triangulate, and 3) weld your mesh in advance.
     preprocessor: :class: 'compas_slicer.pre_processing.InterpolationSlicingPreprocessor'
     parameters: dict
+    workers: int (optional)
+        If more than 1, the isocontours are extracted on a pool of that many processes. Defaults to None (serial).
     """
 
-    def __init__(self, mesh, preprocessor=None, parameters=None):
+    def __init__(self, mesh, preprocessor=None, parameters=None, workers=None):
         logger.info('InterpolationSlicer')
         BaseSlicer.__init__(self, mesh)
 
@@ -36,6 +39,7 @@ class InterpolationSlicer(BaseSlicer):
         self.parameters = parameters if parameters else {}
         self.preprocessor = preprocessor
         self.n_multiplier = 1.0
+        self.workers = workers
 
     def generate_paths(self):
         """ Generates curved paths. """
@@ -47,13 +51,19 @@ class InterpolationSlicer(BaseSlicer):
         logger.info('%d paths will be generated' % n)
 
         vertical_layers_manager = VerticalLayersManager(avg_layer_height)
+        topology = get_mesh_topology(self.mesh)
+
+        if self.workers and self.workers > 1:
+            self.generate_paths_parallel(params_list, topology, vertical_layers_manager)
+            self.layers = vertical_layers_manager.layers
+            return
 
         # create paths + layers
         with progressbar.ProgressBar(max_value=len(params_list)) as bar:
             for i, param in enumerate(params_list):
-                assign_interpolation_distance_to_mesh_vertices(self.mesh, param, self.preprocessor.target_LOW,
-                                                               self.preprocessor.target_HIGH)
-                contours = ScalarFieldContours(self.mesh)
+                distances = get_interpolation_distances(self.mesh, param, self.preprocessor.target_LOW,
+                                                        self.preprocessor.target_HIGH)
+                contours = ScalarFieldContours(self.mesh, topology=topology, scalar_field=distances)
                 contours.compute()
                 contours.add_to_vertical_layers_manager(vertical_layers_manager)
 
@@ -61,6 +71,16 @@ class InterpolationSlicer(BaseSlicer):
 
         self.layers = vertical_layers_manager.layers
 
+    def generate_paths_parallel(self, params_list, topology, vertical_layers_manager):
+        """ Generates the paths of all the interpolation parameters on a pool of self.workers processes. """
+        fields = get_interpolation_distances_batch(self.mesh, params_list, self.preprocessor.target_LOW,
+                                                   self.preprocessor.target_HIGH)
+        all_contours = create_scalar_field_contours_parallel(self.mesh, fields, [0.0 for _ in params_list],
+                                                             rows=list(range(len(params_list))), topology=topology,
+                                                             workers=self.workers)
+        for contours in all_contours:
+            contours.add_to_vertical_layers_manager(vertical_layers_manager)
+
 
 def find_no_of_isocurves(target_0, target_1, avg_layer_height=1.1):
     """ Returns the average number of isocurves that can cover the get_distance from target_0 to target_1. """
@@ -1,5 +1,6 @@
 import compas_slicer
 from compas_slicer.slicers import BaseSlicer
+from compas_slicer.slicers.slice_utilities import EdgeIntervalIndex
 from compas.geometry import Vector, Plane, Point
 import logging
 
@@ -18,7 +19,7 @@ class PlanarSlicer(BaseSlicer):
         Input mesh, it must be a triangular mesh (i.e. no quads or n-gons allowed).
     slicer_type: str
         String representing which slicing method to use.
-        options: 'default', 'cgal'
+        options: 'default', 'cgal', 'numpy'
     layer_height: float
         Distance between layers (slices).
     slice_height_range: tuple (optional)
@@ -27,15 +28,25 @@ class PlanarSlicer(BaseSlicer):
         First value is the Z height to start slicing from, second value is the Z height to end.
         The range values are not absolute height values, but relative to the current minimum height value of the mesh.
         I.e. if you want to only slice the first 100 mm of the mesh, you use (0,100) regardless of the position of the mesh.
+    edge_index: :class: 'compas_slicer.slicers.slice_utilities.EdgeIntervalIndex' (optional)
+        Precomputed index of the mesh edges by their z-range, used by the 'default' slicer_type.
+        If None, it is built the first time that paths are generated, and then reused when re-slicing
+        the same mesh with a different layer_height or slice_height_range.
+    workers: int (optional)
+        If more than 1, the 'default' slicer_type shards the planes across a pool of that many processes.
+        Defaults to None (serial).
     """
 
-    def __init__(self, mesh, slicer_type="default", layer_height=2.0, slice_height_range=None):
+    def __init__(self, mesh, slicer_type="default", layer_height=2.0, slice_height_range=None, edge_index=None,
+                 workers=None):
         logger.info('PlanarSlicer')
         BaseSlicer.__init__(self, mesh)
 
         self.layer_height = layer_height
         self.slicer_type = slicer_type
         self.slice_height_range = slice_height_range
+        self.edge_index = edge_index
+        self.workers = workers
 
     def __repr__(self):
         return "<PlanarSlicer with %d layers and layer_height : %.2f mm>" % \
@@ -62,13 +73,21 @@ class PlanarSlicer(BaseSlicer):
         if self.slicer_type == "default":
             logger.info('')
             logger.info("Planar slicing using default function ...")
-            self.layers = compas_slicer.slicers.create_planar_paths(self.mesh, planes)
+            if self.edge_index is None or not self.edge_index.topology.is_up_to_date():
+                self.edge_index = EdgeIntervalIndex(self.mesh)
+            self.layers = compas_slicer.slicers.create_planar_paths(self.mesh, planes, edge_index=self.edge_index,
+                                                                    workers=self.workers)
 
         elif self.slicer_type == "cgal":
             logger.info('')
             logger.info("Planar slicing using CGAL ...")
             self.layers = compas_slicer.slicers.create_planar_paths_cgal(self.mesh, planes)
 
+        elif self.slicer_type == "numpy":
+            logger.info('')
+            logger.info("Planar slicing using vectorized numpy function ...")
+            self.layers = compas_slicer.slicers.create_planar_paths_numpy(self.mesh, planes)
+
         else:
             raise NameError("Invalid slicing type : " + self.slicer_type)
 
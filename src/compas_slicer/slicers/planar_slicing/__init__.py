@@ -4,5 +4,6 @@ from __future__ import print_function
 
 from .planar_slicing import *  # noqa: F401 E402 F403
 from .planar_slicing_cgal import *  # noqa: F401 E402 F403
+from .planar_slicing_numpy import *  # noqa: F401 E402 F403
 
 __all__ = [name for name in dir() if not name.startswith('_')]
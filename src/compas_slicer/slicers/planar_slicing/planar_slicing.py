@@ -1,49 +1,89 @@
+import numpy as np
 from compas_slicer.geometry import Path
 from compas_slicer.geometry import Layer
 import logging
 import progressbar
 from compas.geometry import intersection_segment_plane
-from compas_slicer.slicers.slice_utilities import ContoursBase
+from compas_slicer.slicers.slice_utilities import ContoursBase, EdgeIntervalIndex
+from compas_slicer.slicers.slice_utilities import find_level_chains_parallel
+from compas_slicer.slicers.slice_utilities.multi_level_contours import PLANAR_EDGE_TOLERANCE
+from compas_slicer.slicers.planar_slicing.planar_slicing_numpy import paths_are_valid
 
 logger = logging.getLogger('logger')
 
 __all__ = ['create_planar_paths']
 
 
-def create_planar_paths(mesh, planes):
+def create_planar_paths(mesh, planes, edge_index=None, workers=None):
     """
     Creates planar contours. Does not rely on external libraries.
     It is currently the only method that can return identify OPEN versus CLOSED paths.
+    Each plane only tests the edges whose z-range contains it, found with an EdgeIntervalIndex.
 
     Parameters
     ----------
     mesh: :class: 'compas.datastructures.Mesh'
         The mesh to be sliced
     planes: list, :class: 'compas.geometry.Plane'
+    edge_index: :class: 'compas_slicer.slicers.slice_utilities.EdgeIntervalIndex' (optional)
+        A precomputed index of the mesh edges by their z-range. If None, it is built from the mesh.
+    workers: int (optional)
+        If more than 1, the planes are sharded across a pool of that many processes, see create_planar_paths_parallel.
     """
+    if edge_index is None:
+        edge_index = EdgeIntervalIndex(mesh)
+    if workers and workers > 1:
+        return create_planar_paths_parallel(mesh, planes, edge_index.topology, workers)
+
+    edges_per_plane = edge_index.sweep_indices([plane.point[2] for plane in planes])
 
     layers = []
 
     with progressbar.ProgressBar(max_value=len(planes)) as bar:
         for i, plane in enumerate(planes):
 
-            intersection = PlanarContours(mesh, plane)
+            intersection = PlanarContours(mesh, plane, edges=edges_per_plane[i], topology=edge_index.topology)
             intersection.compute()
 
-            paths = []
             if len(intersection.sorted_point_clusters) > 0 and intersection.is_valid:
-                for key in intersection.sorted_point_clusters:
-                    is_closed = intersection.closed_paths_booleans[key]
-                    path = Path(points=intersection.sorted_point_clusters[key], is_closed=is_closed)
-                    paths.append(path)
-
-                layers.append(Layer(paths))
+                layers.append(Layer(intersection.get_paths()))
 
             bar.update(i)
 
     return layers
 
 
+def create_planar_paths_parallel(mesh, planes, topology, workers):
+    """
+    Creates planar contours on a pool of processes that share the mesh arrays. The layers are returned in the order
+    of the planes. The zero-crossings are found with the same test as the numpy planar slicer (min z <= h < max z),
+    and the planes whose intersections cannot be chained are contoured in the main process with PlanarContours.
+
+    Parameters
+    ----------
+    mesh: :class: 'compas.datastructures.Mesh'
+    planes: list, :class: 'compas.geometry.Plane'
+    topology: :class: 'compas_slicer.slicers.slice_utilities.MeshTopology'
+    workers: int, the number of processes
+    """
+    heights = [plane.point[2] for plane in planes]
+    chains_per_plane = find_level_chains_parallel(topology, topology.V[:, 2], heights, include_end=False,
+                                                  workers=workers)
+
+    layers = []
+    for plane, chains in zip(planes, chains_per_plane):
+        if chains is not None:
+            paths = [Path.from_coords(pts, is_closed=is_closed) for _, pts, is_closed in chains]
+        else:  # the intersections could not be chained in the worker
+            intersection = PlanarContours(mesh, plane, topology=topology)
+            intersection.compute()
+            paths = intersection.get_paths()
+
+        if len(paths) > 0 and paths_are_valid(paths):
+            layers.append(Layer(paths))
+    return layers
+
+
 class PlanarContours(ContoursBase):
     """
     Finds the iso-contours of the function f(x) = vertex_coords.z - plane.z
@@ -53,10 +93,23 @@ class PlanarContours(ContoursBase):
     ----------
     mesh: :class: 'compas.datastructures.Mesh'
     plane: list, :class: 'compas.geometry.Plane'
+    edges: list, tuple (int, int) or np.array, int (optional)
+        The edges to be tested for intersections, either as vertex key pairs or as indices in topology.edges.
+        If None, all the edges of the mesh are tested.
+    topology: :class: 'compas_slicer.slicers.slice_utilities.MeshTopology' (optional)
     """
-    def __init__(self, mesh, plane):
+    def __init__(self, mesh, plane, edges=None, topology=None):
         self.plane = plane
-        ContoursBase.__init__(self, mesh)  # initialize from parent class
+        self.edges = edges
+        ContoursBase.__init__(self, mesh, topology)  # initialize from parent class
+
+    def candidate_edge_indices(self):
+        """ Returns the indices (in topology.edges) of the edges that are tested for zero-crossings. """
+        if self.edges is None:
+            return np.arange(self.topology.number_of_edges)
+        if isinstance(self.edges, np.ndarray):
+            return self.edges
+        return np.array([self.topology.edge_to_index[edge] for edge in self.edges], dtype=np.int64)
 
     def edge_is_intersected(self, u, v):
         """ Returns True if the edge u,v has a zero-crossing, False otherwise. """
@@ -71,6 +124,16 @@ class PlanarContours(ContoursBase):
         b = self.mesh.vertex_attributes(v, 'xyz')
         return intersection_segment_plane((a, b), self.plane)
 
+    def find_zero_crossings_batch(self, vkeys, X, u, v):
+        """ Finds the zero-crossings of the arrays of edges u,v. """
+        za, zb = X[u, 2], X[v, 2]
+        h = self.plane.point[2]
+        mask = (np.minimum(za, zb) <= h) & (h < np.maximum(za, zb))
+        mask &= np.abs(zb - za) > PLANAR_EDGE_TOLERANCE  # same tolerance as intersection_segment_plane
+        t = np.zeros(len(u))
+        t[mask] = (h - za[mask]) / (zb[mask] - za[mask])
+        return mask, t
+
 
 if __name__ == "__main__":
     pass
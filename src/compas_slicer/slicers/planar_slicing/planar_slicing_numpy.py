@@ -0,0 +1,95 @@
+import numpy as np
+from compas_slicer.geometry import Path
+from compas_slicer.geometry import Layer
+from compas_slicer.slicers.slice_utilities import get_mesh_topology, sort_neighbors_array_into_chains
+from compas_slicer.slicers.slice_utilities import find_level_crossings, find_level_crossings_neighbors
+import logging
+import progressbar
+
+logger = logging.getLogger('logger')
+
+__all__ = ['create_planar_paths_numpy']
+
+
+def create_planar_paths_numpy(mesh, planes, topology=None):
+    """
+    Creates planar contours using vectorized numpy operations.
+    The vertex and edge arrays are taken from the topology of the mesh, and the zero-crossings of all the planes
+    are computed together in a single pass. Like the default method, it identifies OPEN versus CLOSED paths.
+
+    Parameters
+    ----------
+    mesh: :class: 'compas.datastructures.Mesh'
+        The mesh to be sliced
+    planes: list, :class: 'compas.geometry.Plane'
+        The planes should all be parallel to the xy plane.
+    topology: :class: 'compas_slicer.slicers.slice_utilities.MeshTopology' (optional)
+        If None, the cached topology of the mesh is used.
+    """
+    if len(planes) == 0:
+        return []
+
+    topology = topology if topology else get_mesh_topology(mesh)
+    V, E = topology.V, topology.E
+    heights = np.array([plane.point[2] for plane in planes], dtype=np.float64)
+
+    edge_ids, plane_ids, pts = find_all_planar_crossings(V, E, heights)
+    neighbors = find_level_crossings_neighbors(edge_ids, plane_ids, topology)
+
+    # crossings are sorted per plane, so each plane owns a contiguous range of them
+    plane_starts = np.searchsorted(plane_ids, np.arange(len(planes) + 1), side='left')
+
+    layers = []
+    with progressbar.ProgressBar(max_value=len(planes)) as bar:
+        for i in range(len(planes)):
+            start, end = plane_starts[i], plane_starts[i + 1]
+            paths = []
+            for chain in sort_neighbors_array_into_chains(neighbors, start, end):
+                first_edge, last_edge = E[edge_ids[chain[0]]], E[edge_ids[chain[-1]]]
+                is_closed = first_edge[0] in last_edge or first_edge[1] in last_edge
+                paths.append(Path.from_coords(pts[chain], is_closed=bool(is_closed)))
+
+            if len(paths) > 0 and paths_are_valid(paths):
+                layers.append(Layer(paths))
+
+            bar.update(i)
+
+    return layers
+
+
+def find_all_planar_crossings(V, E, heights):
+    """
+    Finds the zero-crossings of all the edges with all the planes at the given heights.
+    An edge (a, b) is intersected by the plane at height h if min(a.z, b.z) <= h < max(a.z, b.z).
+
+    Parameters
+    ----------
+    V: np.array, float, (#V x 3)
+    E: np.array, int, (#E x 2)
+    heights: np.array, float, the z coordinates of the planes
+
+    Returns
+    ----------
+    edge_ids: np.array, int, the intersected edge of each crossing
+    plane_ids: np.array, int, the index (in heights) of the plane of each crossing
+    pts: np.array, float, (#crossings x 3), the crossing points
+    Crossings are sorted by plane, and then by edge index.
+    """
+    edge_ids, plane_ids, t = find_level_crossings(V[:, 2], E, heights, include_end=False)
+    a, b = V[E[edge_ids, 0]], V[E[edge_ids, 1]]
+    pts = a + t[:, None] * (b - a)
+    return edge_ids, plane_ids, pts
+
+
+def paths_are_valid(paths):
+    """ Returns True if there is at least one path with acceptable length, same as ContoursBase.is_valid. """
+    for path in paths:
+        if path.number_of_points > 3:
+            pts = path.coords
+            if np.sum(np.square(pts[1:] - pts[:-1])) > 1.0:
+                return True
+    return False
+
+
+if __name__ == "__main__":
+    pass
@@ -1,7 +1,8 @@
 import numpy as np
 from compas_slicer.slicers import BaseSlicer
 import logging
-from compas_slicer.slicers.slice_utilities import ScalarFieldContours
+from compas_slicer.slicers.slice_utilities import create_scalar_field_contours_multi_level, get_mesh_topology
+from compas_slicer.slicers.slice_utilities import create_scalar_field_contours_parallel
 import progressbar
 from compas_slicer.geometry import VerticalLayersManager
 from compas_slicer.parameters import get_param
@@ -23,15 +24,18 @@ class ScalarFieldSlicer(BaseSlicer):
         We recommend to 1)re-topologize, 2) triangulate, and 3) weld your mesh in advance.
     scalar_field: list, Vx1 (one float per vertex that represents the scalar field)
     no_of_isocurves: int, how many isocontours to be generated
+    workers: int (optional)
+        If more than 1, the isocontours are extracted on a pool of that many processes. Defaults to None (serial).
     """
 
-    def __init__(self, mesh, scalar_field, no_of_isocurves, parameters=None):
+    def __init__(self, mesh, scalar_field, no_of_isocurves, parameters=None, workers=None):
         logger.info('ScalarFieldSlicer')
         BaseSlicer.__init__(self, mesh)
 
         self.no_of_isocurves = no_of_isocurves
         self.scalar_field = list(np.array(scalar_field) - np.min(np.array(scalar_field)))
         self.parameters = parameters if parameters else {}
+        self.workers = workers
 
         mesh.update_default_vertex_attributes({'scalar_field': 0})
 
@@ -42,20 +46,21 @@ class ScalarFieldSlicer(BaseSlicer):
 
         max_dist = get_param(self.parameters, key='vertical_layers_max_centroid_dist', defaults_type='layers')
         vertical_layers_manager = VerticalLayersManager(max_dist)
+        topology = get_mesh_topology(self.mesh)
+
+        # all the isocontours are extracted in a single pass, without writing the shifted field to the mesh
+        levels = [0.05 * step] + [i * step for i in range(1, self.no_of_isocurves + 1)]  # things can be tricky in the edge
+        scalar_field = np.array([self.scalar_field[vkey] for vkey in topology.vkeys], dtype=np.float64)
+        if self.workers and self.workers > 1:
+            all_contours = create_scalar_field_contours_parallel(self.mesh, scalar_field, levels, topology=topology,
+                                                                 workers=self.workers)
+        else:
+            all_contours = create_scalar_field_contours_multi_level(self.mesh, scalar_field, levels, topology=topology)
 
         # create paths + layers
         with progressbar.ProgressBar(max_value=self.no_of_isocurves) as bar:
-            for i in range(0, self.no_of_isocurves + 1):
-                for vkey, data in self.mesh.vertices(data=True):
-                    if i == 0:
-                        data['scalar_field'] = self.scalar_field[vkey] - 0.05 * step  # things can be tricky in the edge
-                    else:
-                        data['scalar_field'] = self.scalar_field[vkey] - i * step
-
-                contours = ScalarFieldContours(self.mesh)
-                contours.compute()
+            for i, contours in enumerate(all_contours):
                 contours.add_to_vertical_layers_manager(vertical_layers_manager)
-
                 bar.update(i)  # advance progress bar
 
         self.layers = vertical_layers_manager.layers
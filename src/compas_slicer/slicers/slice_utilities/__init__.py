@@ -2,9 +2,13 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from .mesh_topology import *  # noqa: F401 E402 F403
 from .graph_connectivity import *  # noqa: F401 E402 F403
+from .edge_interval_index import *  # noqa: F401 E402 F403
 from .contours_base import *  # noqa: F401 E402 F403
 from .scalar_field_contours import *  # noqa: F401 E402 F403
 from .uv_contours import *  # noqa: F401 E402 F403
+from .multi_level_contours import *  # noqa: F401 E402 F403
+from .parallel_contours import *  # noqa: F401 E402 F403
 
 __all__ = [name for name in dir() if not name.startswith('_')]
@@ -1,10 +1,14 @@
 from compas.geometry import Point, distance_point_point_sqrd
 from compas.utilities import pairwise
+from compas_slicer.slicers.slice_utilities import get_mesh_topology
 from compas_slicer.slicers.slice_utilities import create_graph_from_mesh_edges, sort_graph_connected_components
+from compas_slicer.slicers.slice_utilities import create_neighbors_array_from_mesh_edges
+from compas_slicer.slicers.slice_utilities import sort_neighbors_array_connected_components
 import compas_slicer.utilities as utils
 import logging
+import numpy as np
 from abc import abstractmethod
-from compas_slicer.geometry import Path
+from compas_slicer.geometry import Path, points_to_coords
 
 logger = logging.getLogger('logger')
 
@@ -18,16 +22,20 @@ class ContoursBase(object):
     1)find intersected edges and 2)sort intersections using a graph to generate coherent polylines.
 
     The inheriting classes only have to implement the test that checks if an edge is intersected,
-    and the method to find the zero crossing of an intersection.
+    and the method to find the zero crossing of an intersection. For speed, they can also implement
+    find_zero_crossings_batch, which does the same for arrays of edges.
 
     Attributes
     ----------
     mesh : :class: 'compas.datastructures.Mesh'
-
+    topology : :class: 'compas_slicer.slicers.slice_utilities.MeshTopology' (optional)
+        The topology arrays of the mesh, shared by all the contouring passes on the same mesh.
+        If None, the cached topology of the mesh is used.
     """
 
-    def __init__(self, mesh):
+    def __init__(self, mesh, topology=None):
         self.mesh = mesh
+        self.topology = topology if topology else get_mesh_topology(mesh)
         self.intersection_data = {}  # dict: (ui,vi) : {compas.Point}
         # key: tuple (int, int), The edge from which the intersection point originates.
         # value: :class: 'compas.geometry.Point', The zero-crossing point.
@@ -44,19 +52,72 @@ class ContoursBase(object):
         # key: int, The index of the connected component.
         # value: bool, True if path is closed, False otherwise.
 
-    def compute(self):
+    def compute(self, use_graph=False):
+        """
+        Finds the intersections and sorts them into polylines.
+
+        Parameters
+        ----------
+        use_graph: bool
+            If False (default), the intersections are chained by walking along their neighbors on the mesh faces.
+            If True, a networkx graph of the intersections is created and sorted with depth first traversal. The
+            graph method is also used as fallback in degenerate cases where the chaining is not possible.
+        """
         self.find_intersections()
-        G = create_graph_from_mesh_edges(self.mesh, self.intersection_data, self.edge_to_index)
-        sorted_indices_dict = sort_graph_connected_components(G)
+        self.sort_intersections(use_graph)
+
+    def sort_intersections(self, use_graph=False):
+        """
+        Sorts the intersections (that have already been found) into polylines, and labels the closed ones.
+        Fills in the dicts self.sorted_edge_clusters, self.sorted_point_clusters and self.closed_paths_booleans.
+
+        Parameters
+        ----------
+        use_graph: bool, see compute
+        """
+        neighbors = None
+        if not use_graph:
+            neighbors = create_neighbors_array_from_mesh_edges(self.mesh, self.intersection_data, self.edge_to_index,
+                                                               topology=self.topology)
+
+        if neighbors is not None:
+            sorted_indices_dict = sort_neighbors_array_connected_components(neighbors)
+            edges = list(self.intersection_data)
+        else:
+            G = create_graph_from_mesh_edges(self.mesh, self.intersection_data, self.edge_to_index,
+                                             topology=self.topology)
+            sorted_indices_dict = sort_graph_connected_components(G)
+            edges = [data['mesh_edge'] for _, data in G.nodes(data=True)]
 
-        nodeDict = dict(G.nodes(data=True))
         for key in sorted_indices_dict:
             sorted_indices = sorted_indices_dict[key]
-            self.sorted_edge_clusters[key] = [nodeDict[node_index]['mesh_edge'] for node_index in sorted_indices]
+            self.sorted_edge_clusters[key] = [edges[node_index] for node_index in sorted_indices]
             self.sorted_point_clusters[key] = [self.intersection_data[e] for e in self.sorted_edge_clusters[key]]
 
         self.label_closed_paths()
 
+    def set_sorted_clusters(self, chains):
+        """
+        Fills in the sorted clusters from intersections that were already found and sorted elsewhere,
+        i.e. in a worker process (see compas_slicer.slicers.slice_utilities.find_level_chains_parallel).
+        Only the intersections that belong to the chains are added to self.intersection_data.
+
+        Parameters
+        ----------
+        chains: list of tuples (edge_ids, pts, is_closed), one per cluster
+            edge_ids: np.array, int, the indices (in topology.edges) of the sorted intersected edges
+            pts: np.array, float, (#edge_ids x 3), the sorted zero-crossing points
+            is_closed: bool
+        """
+        edges = self.topology.edges
+        for key, (edge_ids, pts, is_closed) in enumerate(chains):
+            self.sorted_edge_clusters[key] = [edges[i] for i in edge_ids.tolist()]
+            self.sorted_point_clusters[key] = [Point(pt[0], pt[1], pt[2]) for pt in pts.tolist()]
+            self.closed_paths_booleans[key] = is_closed
+            for edge, point in zip(self.sorted_edge_clusters[key], self.sorted_point_clusters[key]):
+                self.edge_to_index[edge] = len(self.intersection_data)
+                self.intersection_data[edge] = point
+
     def label_closed_paths(self):
         for key in self.sorted_edge_clusters:
             first_edge = self.sorted_edge_clusters[key][0]
@@ -68,19 +129,62 @@ class ContoursBase(object):
         """
         Fills in the
         dict self.intersection_data: key=(ui,vi) : [xi,yi,zi],
-        dict self.edge_to_index: key=(u1,v1) : point_index. """
-        for edge in list(self.mesh.edges()):
-            if self.edge_is_intersected(edge[0], edge[1]):
-                point = self.find_zero_crossing_data(edge[0], edge[1])
-                if point:  # Sometimes the result can be None
-                    if edge not in self.intersection_data and tuple(reversed(edge)) not in self.intersection_data:
-                        # create [edge - point] dictionary
-                        self.intersection_data[edge] = {}
-                        self.intersection_data[edge] = Point(point[0], point[1], point[2])
-
-            # create [edge - point] dictionary
-            for i, e in enumerate(self.intersection_data):
-                self.edge_to_index[e] = i
+        dict self.edge_to_index: key=(u1,v1) : point_index.
+
+        If the inheriting class implements the batched kernel find_zero_crossings_batch, all the candidate edges
+        are tested at once. Otherwise, each edge is tested with edge_is_intersected and find_zero_crossing_data.
+        """
+        edge_ids = np.asarray(self.candidate_edge_indices(), dtype=np.int64)
+        edges = self.topology.edges
+
+        if len(edge_ids) > 0:
+            X = self.topology.V
+            u, v = self.topology.E[edge_ids, 0], self.topology.E[edge_ids, 1]
+            batch = self.find_zero_crossings_batch(self.topology.vkeys, X, u, v)
+
+            if batch is not None:
+                mask, t = batch
+                indices = np.nonzero(mask)[0]
+                a, b = X[u[indices]], X[v[indices]]
+                pts = a + t[indices][:, None] * (b - a)
+                self.set_intersections(edge_ids[indices], pts)
+                return
+
+            for edge in [edges[i] for i in edge_ids]:
+                if self.edge_is_intersected(edge[0], edge[1]):
+                    point = self.find_zero_crossing_data(edge[0], edge[1])
+                    if point:  # Sometimes the result can be None
+                        if edge not in self.intersection_data and tuple(reversed(edge)) not in self.intersection_data:
+                            # create [edge - point] dictionary
+                            self.intersection_data[edge] = Point(point[0], point[1], point[2])
+
+        # create [edge - point] dictionary
+        for i, e in enumerate(self.intersection_data):
+            self.edge_to_index[e] = i
+
+    def set_intersections(self, edge_ids, pts):
+        """
+        Fills in the dicts self.intersection_data and self.edge_to_index from arrays.
+
+        Parameters
+        ----------
+        edge_ids: np.array, int, the indices (in topology.edges) of the intersected edges
+        pts: np.array, float, (#edge_ids x 3), the zero-crossing points
+        """
+        edges = self.topology.edges
+        self.intersection_data = {edges[i]: Point(pt[0], pt[1], pt[2]) for i, pt in zip(edge_ids.tolist(), pts.tolist())}
+        self.edge_to_index = {edges[i]: j for j, i in enumerate(edge_ids.tolist())}
+
+    def candidate_edge_indices(self):
+        """
+        Returns the indices (in topology.edges) of the edges that are tested for zero-crossings.
+        By default, all the edges of the mesh.
+        """
+        return np.arange(self.topology.number_of_edges)
+
+    def candidate_edges(self):
+        """ Returns the edges (u, v) that are tested for zero-crossings. """
+        return [self.topology.edges[i] for i in self.candidate_edge_indices()]
 
     def save_point_clusters_as_polylines_to_json(self, DATA_PATH, name):
         all_points = {}
@@ -101,11 +205,40 @@ class ContoursBase(object):
         # to be implemented by the inheriting classes
         pass
 
+    def find_zero_crossings_batch(self, vkeys, X, u, v):
+        """
+        Batched kernel that tests many edges at once. Equivalent to calling edge_is_intersected and
+        find_zero_crossing_data on every edge. Can optionally be implemented by the inheriting classes,
+        by default it returns None so that the per-edge methods are used.
+
+        Parameters
+        ----------
+        vkeys: list, int, the vertex keys (see MeshTopology.vkeys)
+        X: np.array, float, (#vkeys x 3), the vertex coordinates (see MeshTopology.V)
+        u: np.array, int, the index (in vkeys) of the first vertex of each edge
+        v: np.array, int, the index (in vkeys) of the second vertex of each edge
+
+        Returns
+        ----------
+        mask: np.array, bool, True for the edges that have a valid zero-crossing.
+        t: np.array, float, the interpolation parameter of the zero-crossing on each edge, so that the
+            zero-crossing point is X[u] + t * (X[v] - X[u]). Only meaningful where mask is True.
+        """
+        return None
+
+    def get_paths(self):
+        """
+        Returns the sorted clusters as a list of Paths. The paths are backed by both the point clusters and an array
+        of their coordinates, so that the array can be used without converting the points again.
+        """
+        return [Path(pts, is_closed=self.closed_paths_booleans[key], coords=points_to_coords(pts))
+                for key, pts in self.sorted_point_clusters.items()]
+
     def add_to_vertical_layers_manager(self, vertical_layers_manager):
         for key in self.sorted_point_clusters:
             pts = self.sorted_point_clusters[key]
             if len(pts) > 3:  # discard curves that are too small
-                path = Path(pts, is_closed=self.closed_paths_booleans[key])
+                path = Path(pts, is_closed=self.closed_paths_booleans[key], coords=points_to_coords(pts))
 
                 vertical_layers_manager.add(path)
 
@@ -0,0 +1,108 @@
+import numpy as np
+import logging
+from compas_slicer.slicers.slice_utilities import get_mesh_topology
+
+logger = logging.getLogger('logger')
+
+__all__ = ['EdgeIntervalIndex']
+
+
+class EdgeIntervalIndex(object):
+    """
+    Index of the mesh edges based on the interval of values that each edge spans.
+    By default the values are the z coordinates of the vertices, so the interval of an edge is [min(z), max(z)].
+    The edges are sorted once by the start and by the end of their intervals, so that each level
+    (i.e. a slicing plane) only visits the edges whose interval contains it, instead of all the edges of the mesh.
+
+    The index only depends on the mesh, so it can be reused for slicing with a different layer height or slice range.
+
+    Attributes
+    ----------
+    mesh: :class: 'compas.datastructures.Mesh'
+    values: list or np.array, float (optional)
+        One value per vertex, in the order of mesh.vertices(). If None, the z coordinates of the vertices are used.
+    topology: :class: 'compas_slicer.slicers.slice_utilities.MeshTopology' (optional)
+        If None, the cached topology of the mesh is used.
+    """
+
+    def __init__(self, mesh, values=None, topology=None):
+        self.mesh = mesh
+        self.topology = topology if topology else get_mesh_topology(mesh)
+
+        if values is None:
+            values = self.topology.V[:, 2]
+        values = np.array(values, dtype=np.float64)
+
+        self.edges = self.topology.edges  # list of tuples (u, v)
+        E = self.topology.E
+        self.interval_start = np.minimum(values[E[:, 0]], values[E[:, 1]])
+        self.interval_end = np.maximum(values[E[:, 0]], values[E[:, 1]])
+
+        self.order_by_start = np.argsort(self.interval_start, kind='stable')
+        self.order_by_end = np.argsort(self.interval_end, kind='stable')
+        self.sorted_starts = self.interval_start[self.order_by_start]
+        self.sorted_ends = self.interval_end[self.order_by_end]
+
+    def __repr__(self):
+        return "<EdgeIntervalIndex with %d edges>" % len(self.edges)
+
+    def edges_spanning(self, level):
+        """
+        Returns the list of edges (u, v) whose interval contains the level, i.e. start <= level < end.
+        """
+        return [self.edges[i] for i in self.edge_indices_spanning(level)]
+
+    def edge_indices_spanning(self, level):
+        """
+        Returns np.array, int, the indices (in topology.edges) of the edges whose interval contains the level.
+        """
+        candidates = self.order_by_start[:np.searchsorted(self.sorted_starts, level, side='right')]
+        return np.sort(candidates[self.interval_end[candidates] > level])
+
+    def sweep(self, levels):
+        """
+        Sweeps through the levels in increasing order while maintaining the set of active edges,
+        i.e. the edges whose interval contains the current level (start <= level < end).
+        Every edge enters and leaves the active set only once, so the cost is proportional to the number of
+        edges plus the total number of edge-level crossings.
+
+        Parameters
+        ----------
+        levels: list, float
+
+        Returns
+        ----------
+        list of lists of tuples (u, v), the active edges of each level, in the order of the input levels.
+        The edges of each level are in the order of mesh.edges().
+        """
+        return [[self.edges[i] for i in indices] for indices in self.sweep_indices(levels)]
+
+    def sweep_indices(self, levels):
+        """
+        Same as sweep, but returns the indices (in topology.edges) of the active edges of each level.
+
+        Returns
+        ----------
+        list of np.array, int
+        """
+        levels = np.array(levels, dtype=np.float64)
+        active_edges = [None for _ in range(len(levels))]
+
+        active = set()
+        i_start, i_end = 0, 0
+        n = len(self.edges)
+        for level_index in np.argsort(levels, kind='stable'):
+            level = levels[level_index]
+            while i_start < n and self.sorted_starts[i_start] <= level:
+                active.add(self.order_by_start[i_start])
+                i_start += 1
+            while i_end < n and self.sorted_ends[i_end] <= level:
+                active.discard(self.order_by_end[i_end])
+                i_end += 1
+            active_edges[level_index] = np.array(sorted(active), dtype=np.int64)
+
+        return active_edges
+
+
+if __name__ == "__main__":
+    pass
@@ -1,11 +1,16 @@
 import networkx as nx
+import numpy as np
+from compas_slicer.slicers.slice_utilities import get_mesh_topology
 
 __all__ = ['create_graph_from_mesh_edges',
            'sort_graph_connected_components',
-           'create_graph_from_mesh_vkeys']
+           'create_graph_from_mesh_vkeys',
+           'create_neighbors_array_from_mesh_edges',
+           'sort_neighbors_array_connected_components',
+           'sort_neighbors_array_into_chains']
 
 
-def create_graph_from_mesh_edges(mesh, intersection_data, edge_to_index):
+def create_graph_from_mesh_edges(mesh, intersection_data, edge_to_index, topology=None):
     """
     Creates a graph with one node for every intersected edge.
     The connectivity of nodes (i.e. edges between them) is based on their neighboring on the mesh.
@@ -18,6 +23,8 @@ def create_graph_from_mesh_edges(mesh, intersection_data, edge_to_index):
     edge_to_index: dict
         key: tuple (int, int) edge
         value: int, index of the intersection point
+    topology: :class: 'compas_slicer.slicers.slice_utilities.MeshTopology' (optional)
+        If None, the cached topology of the mesh is used.
 
     Returns
     ----------
@@ -30,31 +37,24 @@ def create_graph_from_mesh_edges(mesh, intersection_data, edge_to_index):
     for i, edge in enumerate(intersection_data):
         G.add_node(i, mesh_edge=edge)  # node, attribute
 
-    for node_index, data in G.nodes(data=True):
-        mesh_edge = data['mesh_edge']
+    topology = topology if topology else get_mesh_topology(mesh)
+    edge_ids, intersection_of_edge = get_intersected_edges_arrays(intersection_data, topology)
 
+    for node_index, edge_id in enumerate(edge_ids):
         # find current neighboring edges that are also intersected
-        current_edge_connections = []
-        for f in mesh.edge_faces(u=mesh_edge[0], v=mesh_edge[1]):
-            if f is not None:
-                face_edges = mesh.face_halfedges(f)
-                for e in face_edges:
-                    if (e != mesh_edge and tuple(reversed(e)) != mesh_edge) \
-                            and (e in intersection_data or tuple(reversed(e)) in intersection_data):
-                        current_edge_connections.append(e)
-
-        for e in current_edge_connections:
-            # find other_node_index
-            other_node_index = edge_to_index[e] if e in edge_to_index \
-                else edge_to_index[tuple(reversed(e))]
-            # add edges to the graph (only if the edge doesn't exist already)
-            if not G.has_edge(node_index, other_node_index) and not G.has_edge(other_node_index, node_index):
-                G.add_edge(node_index, other_node_index)
+        for f in topology.edge_faces[edge_id]:
+            if f >= 0:
+                for other_edge_id in topology.face_edges[f]:
+                    other_node_index = intersection_of_edge[other_edge_id]
+                    if other_edge_id != edge_id and other_node_index >= 0:
+                        # add edges to the graph (only if the edge doesn't exist already)
+                        if not G.has_edge(node_index, other_node_index):
+                            G.add_edge(node_index, int(other_node_index))
 
     return G
 
 
-def create_graph_from_mesh_vkeys(mesh, v_keys):
+def create_graph_from_mesh_vkeys(mesh, v_keys, topology=None):
     """
     Creates a graph with one node for every vertex, and edges between neighboring vertices.
 
@@ -63,18 +63,21 @@ def create_graph_from_mesh_vkeys(mesh, v_keys):
     mesh: :class: 'compas.datastructures.Mesh'
     v_keys: list int
         The vertex keys
+    topology: :class: 'compas_slicer.slicers.slice_utilities.MeshTopology' (optional)
+        If None, the cached topology of the mesh is used.
 
     Returns
     ----------
     G: :class: 'networkx.Graph'
     """
+    topology = topology if topology else get_mesh_topology(mesh)
     G = nx.Graph()
     [G.add_node(v) for v in v_keys]
-    for v in v_keys:
-        v_neighbors = mesh.vertex_neighbors(v)
-        for other_v in v_neighbors:
-            if other_v != v and other_v in v_keys:
-                G.add_edge(v, other_v)
+
+    selected = np.zeros(topology.number_of_vertices, dtype=bool)
+    selected[[topology.key_index[v] for v in v_keys]] = True
+    E = topology.E[selected[topology.E[:, 0]] & selected[topology.E[:, 1]]]
+    G.add_edges_from((topology.vkeys[a], topology.vkeys[b]) for a, b in E.tolist() if a != b)
     return G
 
 
@@ -133,3 +136,141 @@ def sort_graph_connected_components(G):
             current_index += 1
 
     return sorted_indices_dict
+
+
+def create_neighbors_array_from_mesh_edges(mesh, intersection_data, edge_to_index, topology=None):
+    """
+    Finds the neighbors of every intersected edge, using the edge -> face lookup table of the mesh topology.
+    In a triangular mesh every intersected face has exactly two intersected edges, so each intersected edge
+    has at most two neighbors (one on each of its faces). This makes it possible to sort the intersections
+    by walking along the neighbors, without creating a graph.
+
+    Parameters
+    ----------
+    mesh: :class: 'compas.datastructures.Mesh'
+    intersection_data: dict, (ui,vi) : {'pt':[xi,yi,zi], 'attrs':{...}}
+        The keys-tuples are all the edges which have a zero crossing.
+    edge_to_index: dict
+        key: tuple (int, int) edge
+        value: int, index of the intersection point
+    topology: :class: 'compas_slicer.slicers.slice_utilities.MeshTopology' (optional)
+        If None, the cached topology of the mesh is used.
+
+    Returns
+    ----------
+    np.array, int, (#intersections x 2), the indices of the neighboring intersections (-1 if there is no neighbor).
+    None if some face has more than two intersected edges (i.e. when the zero-crossing passes exactly through a
+    vertex), in which case the intersections cannot be chained and the graph method should be used instead.
+    """
+    topology = topology if topology else get_mesh_topology(mesh)
+    edge_ids = np.array([topology.edge_to_index[e] for e in intersection_data], dtype=np.int64)
+    neighbors = np.full((len(edge_ids), 2), -1, dtype=np.int64)
+    if len(edge_ids) == 0:
+        return neighbors
+
+    faces = topology.edge_faces[edge_ids]
+    _, intersections_per_face = np.unique(faces[faces >= 0], return_counts=True)
+    if np.any(intersections_per_face > 2):
+        return None
+
+    # lookup of the intersection index of an edge index, through the sorted intersected edges
+    order = np.argsort(edge_ids)
+    sorted_edge_ids = edge_ids[order]
+
+    for j in range(2):
+        has_face = faces[:, j] >= 0
+        for k in range(3):
+            other_edge_ids = topology.face_edges[faces[:, j], k]
+            positions = np.minimum(np.searchsorted(sorted_edge_ids, other_edge_ids), len(edge_ids) - 1)
+            found = has_face & (other_edge_ids != edge_ids) & (sorted_edge_ids[positions] == other_edge_ids)
+            neighbors[found, j] = order[positions[found]]
+
+    # both faces of an edge can point to the same neighbor on degenerate geometry
+    duplicates = neighbors[:, 0] == neighbors[:, 1]
+    neighbors[duplicates, 1] = -1
+    return neighbors
+
+
+def get_intersected_edges_arrays(intersection_data, topology):
+    """
+    Returns
+    ----------
+    edge_ids: np.array, int, the index (in topology.edges) of each intersected edge
+    intersection_of_edge: np.array, int, (#E), the intersection index of each edge of the mesh (-1 if not intersected)
+    """
+    edge_ids = np.array([topology.edge_to_index[e] for e in intersection_data], dtype=np.int64)
+    intersection_of_edge = np.full(topology.number_of_edges, -1, dtype=np.int64)
+    intersection_of_edge[edge_ids] = np.arange(len(edge_ids))
+    return edge_ids, intersection_of_edge
+
+
+def sort_neighbors_array_connected_components(neighbors):
+    """
+    Sorts the intersections into connected components, equivalent to sort_graph_connected_components but using
+    the neighbors array instead of a graph.
+
+    Parameters
+    ----------
+    neighbors: np.array, int, (#intersections x 2), see create_neighbors_array_from_mesh_edges
+
+    Returns
+    ----------
+    sorted_indices_dict: dict
+        key: int, The index of the connected component
+        value: list, int, The sorted intersection indices.
+    """
+    chains = sort_neighbors_array_into_chains(neighbors, 0, len(neighbors))
+    return {i: chain for i, chain in enumerate(chains)}
+
+
+def sort_neighbors_array_into_chains(neighbors, start, end):
+    """
+    Sorts the intersections with indices in the range [start, end) into chains of neighboring intersections.
+    Open chains start from one of their ends, closed chains can start from any of their intersections.
+    Chains that consist of a single intersection are discarded. The cost is linear to the number of intersections.
+
+    Parameters
+    ----------
+    neighbors: np.array, int, (#intersections x 2), see create_neighbors_array_from_mesh_edges
+    start: int
+    end: int
+
+    Returns
+    ----------
+    list of lists of int, the sorted intersection indices of each chain
+    """
+    chains = []
+    visited = np.zeros(end - start, dtype=bool)
+    nbrs = neighbors[start:end].tolist()
+
+    for c in range(start, end):
+        if visited[c - start]:
+            continue
+
+        # (1) find start index by walking towards one of the ends of the chain
+        first, prev, current = c, -1, c
+        while True:
+            nxt = other_neighbor(nbrs[current - start], prev)
+            if nxt == -1:  # reached an end, the chain is open
+                first = current
+                break
+            if nxt == c or visited[nxt - start]:  # the chain is closed
+                break
+            prev, current = current, nxt
+
+        # (2) walk from the start index to the other end
+        chain = []
+        prev, current = -1, first
+        while current != -1 and not visited[current - start]:
+            visited[current - start] = True
+            chain.append(current)
+            prev, current = current, other_neighbor(nbrs[current - start], prev)
+
+        if len(chain) > 1:  # we need at least 2 elements to have an edge
+            chains.append(chain)
+    return chains
+
+
+def other_neighbor(nbrs, prev):
+    """ Returns the neighbor that is not prev. """
+    return nbrs[1] if nbrs[0] == prev else nbrs[0]
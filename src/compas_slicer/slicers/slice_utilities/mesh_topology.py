@@ -0,0 +1,124 @@
+import weakref
+import numpy as np
+import logging
+from compas_slicer.utilities.mesh_query import MeshSignature
+
+logger = logging.getLogger('logger')
+
+__all__ = ['MeshTopology',
+           'get_mesh_topology',
+           'invalidate_mesh_topology']
+
+
+class MeshTopology(object):
+    """
+    Holds the topology and the vertex coordinates of a triangular mesh in contiguous numpy arrays.
+    It is built once from the dict-based compas mesh, and can then be shared by all the contouring passes
+    on the same mesh, instead of each of them walking the mesh dictionaries again.
+
+    All the arrays use indices in the order of mesh.vertices(), mesh.faces() and mesh.edges().
+    Use get_mesh_topology(mesh) to get a cached instance that is rebuilt only when the mesh changes.
+
+    Attributes
+    ----------
+    mesh: :class: 'compas.datastructures.Mesh'
+    vkeys: list, int, the vertex keys
+    fkeys: list, int, the face keys
+    edges: list, tuple (int, int), the edges as vertex keys
+    key_index: dict, vertex key : vertex index
+    edge_to_index: dict, (u, v) : edge index, with both orientations of each edge
+    V: np.array, float, (#V x 3), the vertex coordinates
+    F: np.array, int, (#F x 3), the vertex indices of each face
+    E: np.array, int, (#E x 2), the vertex indices of each edge
+    edge_faces: np.array, int, (#E x 2), the face indices on either side of each edge (-1 on naked edges)
+    face_edges: np.array, int, (#F x 3), the edge indices of each face
+    """
+
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self.signature = MeshSignature(mesh)
+
+        self.vkeys = list(mesh.vertices())
+        self.fkeys = list(mesh.faces())
+        self.edges = list(mesh.edges())
+        self.key_index = {vkey: i for i, vkey in enumerate(self.vkeys)}
+
+        self.V = np.array([mesh.vertex_coordinates(vkey) for vkey in self.vkeys], dtype=np.float64).reshape((-1, 3))
+        self.F = np.array([[self.key_index[vkey] for vkey in mesh.face_vertices(fkey)] for fkey in self.fkeys],
+                          dtype=np.int64).reshape((-1, 3))
+        self.E = np.array([[self.key_index[u], self.key_index[v]] for u, v in self.edges],
+                          dtype=np.int64).reshape((-1, 2))
+
+        self.edge_to_index = {}
+        for i, (u, v) in enumerate(self.edges):
+            self.edge_to_index[(u, v)] = i
+            self.edge_to_index[(v, u)] = i
+
+        self.face_edges = np.array([[self.edge_to_index[e] for e in mesh.face_halfedges(fkey)] for fkey in self.fkeys],
+                                   dtype=np.int64).reshape((-1, 3))
+
+        self.edge_faces = np.full((len(self.edges), 2), -1, dtype=np.int64)
+        face_ids = np.repeat(np.arange(len(self.fkeys)), 3)
+        flat_edges = self.face_edges.ravel()
+        order = np.argsort(flat_edges, kind='stable')
+        flat_edges, face_ids = flat_edges[order], face_ids[order]
+        first_occurrence = np.ones(len(flat_edges), dtype=bool)
+        first_occurrence[1:] = flat_edges[1:] != flat_edges[:-1]
+        self.edge_faces[flat_edges[first_occurrence], 0] = face_ids[first_occurrence]
+        self.edge_faces[flat_edges[~first_occurrence], 1] = face_ids[~first_occurrence]
+
+    def __repr__(self):
+        return "<MeshTopology with %d vertices, %d faces, %d edges>" % (len(self.vkeys), len(self.fkeys),
+                                                                        len(self.edges))
+
+    @property
+    def number_of_vertices(self):
+        return len(self.vkeys)
+
+    @property
+    def number_of_edges(self):
+        return len(self.edges)
+
+    def is_up_to_date(self):
+        """ Returns True if the mesh has not changed since the MeshTopology was built, checked in O(1) with its
+        MeshSignature. """
+        return self.signature.matches(self.mesh)
+
+    def update_vertex_coordinates(self):
+        """ Re-reads the vertex coordinates of the mesh. Use this when the geometry of the mesh changed in place. """
+        self.V = np.array([self.mesh.vertex_coordinates(vkey) for vkey in self.vkeys],
+                          dtype=np.float64).reshape((-1, 3))
+        self.signature = MeshSignature(self.mesh)
+
+
+_TOPOLOGIES = weakref.WeakKeyDictionary()  # mesh : MeshTopology
+
+
+def get_mesh_topology(mesh):
+    """
+    Returns the MeshTopology of the mesh. It is cached, and it is rebuilt if vertices or faces have been
+    added or deleted, if the mesh has been transformed, or after invalidate_mesh_caches(mesh) (see MeshSignature).
+    The check is O(1), but inside loops over the same mesh, pass the topology explicitly.
+
+    Parameters
+    ----------
+    mesh: :class: 'compas.datastructures.Mesh'
+
+    Returns
+    ----------
+    :class: 'compas_slicer.slicers.slice_utilities.MeshTopology'
+    """
+    topology = _TOPOLOGIES.get(mesh)
+    if topology is None or not topology.is_up_to_date():
+        topology = MeshTopology(mesh)
+        _TOPOLOGIES[mesh] = topology
+    return topology
+
+
+def invalidate_mesh_topology(mesh):
+    """ Removes the cached MeshTopology of the mesh, so that it is rebuilt the next time that it is needed. """
+    _TOPOLOGIES.pop(mesh, None)
+
+
+if __name__ == "__main__":
+    pass
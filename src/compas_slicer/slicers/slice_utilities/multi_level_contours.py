@@ -0,0 +1,217 @@
+import numpy as np
+import logging
+from compas_slicer.slicers.slice_utilities import get_mesh_topology
+from compas_slicer.slicers.slice_utilities import ScalarFieldContours, UVContours
+
+logger = logging.getLogger('logger')
+
+# Edges whose values differ by at most this are parallel to the planes, and have no planar crossing. This is the
+# tolerance of compas.geometry.intersection_segment_plane, which the PlanarContours use.
+PLANAR_EDGE_TOLERANCE = 1e-6
+
+__all__ = ['find_level_crossings',
+           'find_level_crossings_neighbors',
+           'create_scalar_field_contours_multi_level',
+           'find_uv_lines_candidate_edges',
+           'create_uv_contours_multi_level']
+
+
+def find_level_crossings(values, E, levels, include_end=False, tolerance=0.0):
+    """
+    Finds the zero-crossings of all the edges with all the levels in one pass. Every edge is bucketed into the
+    range of (sorted) levels that its interval of values spans, so only the actual crossings are computed.
+
+    With include_end=False, the edge (a, b) crosses the level l if min(va, vb) <= l < max(va, vb) and
+    |vb - va| > PLANAR_EDGE_TOLERANCE, which is the test of PlanarContours. With include_end=True, it crosses it if min(va, vb) <= l <= max(va, vb)
+    and va, vb are not both equal to l, which is the test of ScalarFieldContours on the field (values - l).
+    A positive tolerance widens the interval of every edge on both sides, to find candidate edges for another test.
+
+    Parameters
+    ----------
+    values: np.array, float, (#V), one value per vertex
+    E: np.array, int, (#E x 2), the vertex indices of each edge
+    levels: list or np.array, float
+    include_end: bool
+    tolerance: float
+
+    Returns
+    ----------
+    edge_ids: np.array, int, the intersected edge of each crossing
+    level_ids: np.array, int, the index (in levels) of the level of each crossing
+    t: np.array, float, the interpolation parameter of each crossing on its edge (0 on a, 1 on b)
+    The crossings are sorted by level, and then by edge index.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    levels = np.asarray(levels, dtype=np.float64)
+    order = np.argsort(levels, kind='stable')
+    sorted_levels = levels[order]
+
+    va, vb = values[E[:, 0]], values[E[:, 1]]
+    v_min, v_max = np.minimum(va, vb), np.maximum(va, vb)
+    first = np.searchsorted(sorted_levels, v_min - tolerance, side='left')
+    last = np.searchsorted(sorted_levels, v_max + tolerance, side='right' if include_end else 'left')
+    counts = np.maximum(last - first, 0)
+    if include_end:
+        counts[v_min == v_max] = 0  # constant edges have no zero-crossing
+    else:
+        counts[v_max - v_min <= PLANAR_EDGE_TOLERANCE] = 0  # edges parallel to the planes have no crossing
+
+    # expand every edge into one crossing per level that it spans
+    edge_ids = np.repeat(np.arange(len(E)), counts)
+    offsets = np.arange(len(edge_ids)) - np.repeat(np.cumsum(counts) - counts, counts)
+    level_ids = order[np.repeat(first, counts) + offsets]
+
+    sorting = np.lexsort((edge_ids, level_ids))
+    edge_ids, level_ids = edge_ids[sorting], level_ids[sorting]
+
+    d1 = np.abs(va[edge_ids] - levels[level_ids])
+    d2 = np.abs(vb[edge_ids] - levels[level_ids])
+    t = d1 / (d1 + d2)
+    return edge_ids, level_ids, t
+
+
+def find_level_crossings_neighbors(edge_ids, level_ids, topology):
+    """
+    Finds the neighbors of every crossing. Two crossings of the same level are neighbors if their edges
+    belong to the same face. Since every intersected triangle has exactly two intersected edges,
+    each crossing has at most two neighbors.
+
+    Parameters
+    ----------
+    edge_ids: np.array, int, sorted by level, see find_level_crossings
+    level_ids: np.array, int, see find_level_crossings
+    topology: :class: 'compas_slicer.slicers.slice_utilities.MeshTopology'
+
+    Returns
+    ----------
+    np.array, int, (#crossings x 2), the indices of the neighboring crossings (-1 if there is no neighbor)
+    """
+    number_of_edges = topology.number_of_edges
+    keys = level_ids.astype(np.int64) * number_of_edges + edge_ids
+    neighbors = np.full((len(keys), 2), -1, dtype=np.int64)
+    if len(keys) == 0:
+        return neighbors
+
+    for j in range(2):
+        faces = topology.edge_faces[edge_ids, j]
+        has_face = faces >= 0
+        for k in range(3):
+            other_edges = topology.face_edges[faces, k]
+            other_keys = level_ids.astype(np.int64) * number_of_edges + other_edges
+            positions = np.minimum(np.searchsorted(keys, other_keys), len(keys) - 1)
+            found = has_face & (other_edges != edge_ids) & (keys[positions] == other_keys)
+            neighbors[found, j] = positions[found]
+
+    # both faces of an edge can point to the same neighbor on degenerate geometry
+    duplicates = neighbors[:, 0] == neighbors[:, 1]
+    neighbors[duplicates, 1] = -1
+    return neighbors
+
+
+def create_scalar_field_contours_multi_level(mesh, scalar_field, levels, topology=None):
+    """
+    Extracts the isocontours of the scalar field at all the levels in a single pass.
+    This is equivalent to computing a ScalarFieldContours(mesh, scalar_field=scalar_field, iso_value=level)
+    for every level, but without testing all the edges for every level.
+
+    Parameters
+    ----------
+    mesh: :class: 'compas.datastructures.Mesh'
+    scalar_field: list or np.array, float, one value per vertex, in the order of mesh.vertices()
+    levels: list or np.array, float, the iso-values
+    topology: :class: 'compas_slicer.slicers.slice_utilities.MeshTopology' (optional)
+        If None, the cached topology of the mesh is used.
+
+    Returns
+    ----------
+    list, :class: 'compas_slicer.slicers.slice_utilities.ScalarFieldContours'
+        One computed contours object per level, in the order of the input levels.
+    """
+    topology = topology if topology else get_mesh_topology(mesh)
+    scalar_field = np.asarray(scalar_field, dtype=np.float64)
+    edge_ids, level_ids, t = find_level_crossings(scalar_field, topology.E, levels, include_end=True)
+
+    a, b = topology.V[topology.E[edge_ids, 0]], topology.V[topology.E[edge_ids, 1]]
+    pts = a + t[:, None] * (b - a)
+
+    # crossings are sorted per level, so each level owns a contiguous range of them
+    level_starts = np.searchsorted(level_ids, np.arange(len(levels) + 1), side='left')
+
+    all_contours = []
+    for i in range(len(levels)):
+        start, end = level_starts[i], level_starts[i + 1]
+        contours = ScalarFieldContours(mesh, topology=topology, scalar_field=scalar_field, iso_value=float(levels[i]))
+        contours.set_intersections(edge_ids[start:end], pts[start:end])
+        contours.sort_intersections()
+        all_contours.append(contours)
+    return all_contours
+
+
+def find_uv_lines_candidate_edges(uv, E, lines, tolerance=1e-6):
+    """
+    Buckets the edges into the lines in the uv domain that they can intersect. The lines have to be parallel, like
+    the lines of the 'flat' and the 'spiral' paths of the UVSlicer. Then they are level sets of the same linear
+    function s(u, v) = n . (u, v), where n is their normal, so each edge is a candidate only for the lines whose level
+    is within the interval of s on the edge.
+
+    Parameters
+    ----------
+    uv: np.array, float, (#V x 2), the uv coordinates of the vertices
+    E: np.array, int, (#E x 2), the vertex indices of each edge
+    lines: list of tuples (p1, p2), the lines in the uv domain
+    tolerance: float, the intervals of the edges are widened by tolerance, so that no intersected edge is missed
+
+    Returns
+    ----------
+    list of np.array, int, the candidate edges of each line, in the order of the lines.
+    None if the lines are not parallel.
+    """
+    p1 = np.array([line[0] for line in lines], dtype=np.float64).reshape((-1, 2))
+    p2 = np.array([line[1] for line in lines], dtype=np.float64).reshape((-1, 2))
+    directions = p2 - p1
+    lengths = np.linalg.norm(directions, axis=1)
+    if len(lines) == 0 or np.any(lengths == 0):
+        return None
+    directions /= lengths[:, None]
+    if np.any(np.abs(directions[:, 0] * directions[0, 1] - directions[:, 1] * directions[0, 0]) > 1e-9):
+        return None
+
+    normal = np.array([-directions[0, 1], directions[0, 0]])
+    edge_ids, line_ids, _ = find_level_crossings(np.asarray(uv, dtype=np.float64).dot(normal), E, p1.dot(normal),
+                                                 include_end=True, tolerance=tolerance)
+    line_starts = np.searchsorted(line_ids, np.arange(len(lines) + 1), side='left')
+    return [edge_ids[line_starts[i]:line_starts[i + 1]] for i in range(len(lines))]
+
+
+def create_uv_contours_multi_level(mesh, uv, lines, topology=None):
+    """
+    Finds the contours of all the lines in the uv domain. If the lines are parallel, every line only tests the edges
+    that can intersect it (see find_uv_lines_candidate_edges), so the cost scales with the number of intersected
+    edges instead of the number of edges times the number of lines.
+
+    Parameters
+    ----------
+    mesh: :class: 'compas.datastructures.Mesh'
+    uv: np.array, float, (#V x 2), the uv coordinates of the vertices, in the order of mesh.vertices()
+    lines: list of tuples (p1, p2), the lines in the uv domain
+    topology: :class: 'compas_slicer.slicers.slice_utilities.MeshTopology' (optional)
+
+    Returns
+    ----------
+    list, :class: 'compas_slicer.slicers.slice_utilities.UVContours', one computed contours object per line.
+    """
+    topology = topology if topology else get_mesh_topology(mesh)
+    uv = np.asarray(uv, dtype=np.float64).reshape((-1, 2))
+    candidates = find_uv_lines_candidate_edges(uv, topology.E, lines)
+
+    all_contours = []
+    for i, (p1, p2) in enumerate(lines):
+        edges = candidates[i] if candidates is not None else None
+        contours = UVContours(mesh, p1, p2, topology=topology, uv=uv, edges=edges)
+        contours.compute()
+        all_contours.append(contours)
+    return all_contours
+
+
+if __name__ == "__main__":
+    pass
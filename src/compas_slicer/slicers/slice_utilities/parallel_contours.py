@@ -0,0 +1,280 @@
+import numpy as np
+import logging
+import multiprocessing
+from multiprocessing import shared_memory
+import progressbar
+from compas_slicer.slicers.slice_utilities import get_mesh_topology
+from compas_slicer.slicers.slice_utilities import ScalarFieldContours, UVContours, intersect_segments_with_line_xy
+from compas_slicer.slicers.slice_utilities import find_level_crossings, find_level_crossings_neighbors
+from compas_slicer.slicers.slice_utilities import find_uv_lines_candidate_edges
+from compas_slicer.slicers.slice_utilities import sort_neighbors_array_into_chains
+
+logger = logging.getLogger('logger')
+
+__all__ = ['SharedArrays',
+           'find_level_chains_parallel',
+           'find_uv_chains_parallel',
+           'create_scalar_field_contours_parallel',
+           'create_uv_contours_parallel',
+           'set_or_compute']
+
+
+class SharedArrays(object):
+    """
+    Copies named numpy arrays to shared memory blocks, so that the processes of a pool can read them
+    without pickling them (or the compas mesh that they come from) for every task.
+    The blocks are released when the SharedArrays is closed, so it is best used as a context manager.
+
+    Attributes
+    ----------
+    arrays: dict, name : np.array
+    """
+
+    def __init__(self, arrays):
+        self.blocks = []
+        self.descriptor = {}  # name : (shared memory name, shape, dtype), picklable description of the arrays
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self.blocks.append(block)
+            self.descriptor[name] = (block.name, array.shape, array.dtype.str)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+# --- worker processes
+
+_WORKER_ARRAYS = {}  # name : np.array, the shared arrays attached by the worker process
+_WORKER_BLOCKS = []  # the shared memory blocks need to stay referenced while their arrays are used
+
+
+def _init_worker(descriptor):
+    """ Attaches the shared arrays once per worker process. """
+    for name, (block_name, shape, dtype) in descriptor.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        _WORKER_BLOCKS.append(block)
+        _WORKER_ARRAYS[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+
+def _find_level_chains_task(task):
+    """ Finds the chains of a chunk of levels of the scalar fields. task: (include_end, [(level index, row, iso)]) """
+    include_end, items = task
+    fields, E = _WORKER_ARRAYS['fields'], _WORKER_ARRAYS['E']
+
+    results = []
+    for row in sorted(set(item[1] for item in items)):  # all the levels of the same field are found in one pass
+        row_items = [item for item in items if item[1] == row]
+        edge_ids, level_ids, t = find_level_crossings(fields[row], E, [item[2] for item in row_items], include_end)
+        level_starts = np.searchsorted(level_ids, np.arange(len(row_items) + 1), side='left')
+        for i, item in enumerate(row_items):
+            start, end = level_starts[i], level_starts[i + 1]
+            results.append((item[0], _sort_crossings_into_chains(edge_ids[start:end], t[start:end])))
+    return sorted(results, key=lambda result: result[0])
+
+
+def _find_uv_chains_task(items):
+    """ Finds the chains of a chunk of lines in the uv domain. items: [(level index, p1, p2, candidate edges)] """
+    uv, E = _WORKER_ARRAYS['uv'], _WORKER_ARRAYS['E']
+    results = []
+    for level_index, p1, p2, candidates in items:
+        candidates = candidates if candidates is not None else np.arange(len(E))
+        mask, t = intersect_segments_with_line_xy(uv[E[candidates, 0]], uv[E[candidates, 1]], p1, p2)
+        edge_ids = candidates[mask]
+        results.append((level_index, _sort_crossings_into_chains(edge_ids, t[mask])))
+    return results
+
+
+def _sort_crossings_into_chains(edge_ids, t):
+    """
+    Sorts the crossings of a single level (sorted by edge index) into chains, in the same way as
+    ContoursBase.sort_intersections. Returns None if some face has more than two crossings, in which case
+    the level has to be sorted with the graph method in the main process.
+
+    Returns
+    ----------
+    list of tuples (edge_ids, pts, is_closed), one per chain
+    """
+    V, E = _WORKER_ARRAYS['V'], _WORKER_ARRAYS['E']
+    edge_faces, face_edges = _WORKER_ARRAYS['edge_faces'], _WORKER_ARRAYS['face_edges']
+
+    faces = edge_faces[edge_ids]
+    _, crossings_per_face = np.unique(faces[faces >= 0], return_counts=True)
+    if np.any(crossings_per_face > 2):
+        return None
+
+    a, b = V[E[edge_ids, 0]], V[E[edge_ids, 1]]
+    pts = a + t[:, None] * (b - a)
+    neighbors = find_level_crossings_neighbors(edge_ids, np.zeros(len(edge_ids), dtype=np.int64),
+                                               _WorkerTopology(edge_faces, face_edges, len(E)))
+
+    chains = []
+    for chain in sort_neighbors_array_into_chains(neighbors, 0, len(edge_ids)):
+        first_edge, last_edge = E[edge_ids[chain[0]]], E[edge_ids[chain[-1]]]
+        is_closed = bool(first_edge[0] in last_edge or first_edge[1] in last_edge)
+        chains.append((edge_ids[chain], pts[chain], is_closed))
+    return chains
+
+
+class _WorkerTopology(object):
+    """ The part of MeshTopology that find_level_crossings_neighbors needs, built from the shared arrays. """
+
+    def __init__(self, edge_faces, face_edges, number_of_edges):
+        self.edge_faces = edge_faces
+        self.face_edges = face_edges
+        self.number_of_edges = number_of_edges
+
+
+# --- main process
+
+def run_chunks_in_pool(topology, arrays, task_function, tasks, workers):
+    """
+    Runs the tasks on a pool of worker processes that share the topology arrays and the given arrays.
+    The results are returned in the order of the tasks, regardless of the order in which the workers finish.
+    """
+    arrays = dict(arrays, V=topology.V, E=topology.E, edge_faces=topology.edge_faces, face_edges=topology.face_edges)
+    results = []
+    with SharedArrays(arrays) as shared:
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(shared.descriptor,)) as pool:
+            with progressbar.ProgressBar(max_value=len(tasks)) as bar:
+                for i, chunk_results in enumerate(pool.imap(task_function, tasks)):
+                    results.extend(chunk_results)
+                    bar.update(i)
+    return [chains for _, chains in results]
+
+
+def split_into_chunks(items, workers):
+    """ Splits the items into contiguous chunks, a few per worker so that the load is balanced. """
+    number_of_chunks = max(1, min(len(items), 4 * workers))
+    return [list(chunk) for chunk in np.array_split(np.arange(len(items)), number_of_chunks) if len(chunk) > 0]
+
+
+def find_level_chains_parallel(topology, fields, levels, rows=None, include_end=True, workers=2):
+    """
+    Finds the sorted zero-crossings of the scalar fields at the levels, sharded across a pool of processes.
+
+    Parameters
+    ----------
+    topology: :class: 'compas_slicer.slicers.slice_utilities.MeshTopology'
+    fields: np.array, float, (#fields x #V), one or more scalar fields, indexed by vertex index
+    levels: list, float, the iso-values
+    rows: list, int (optional), the field (row of fields) of each level. If None, the first field is used.
+    include_end: bool, see find_level_crossings
+    workers: int, the number of processes
+
+    Returns
+    ----------
+    list, one item per level in the order of the levels. Each item is a list of tuples (edge_ids, pts, is_closed),
+    one per chain, or None if the level could not be chained (see ContoursBase.sort_intersections).
+    """
+    fields = np.array(fields, dtype=np.float64).reshape((-1, topology.number_of_vertices))
+    rows = rows if rows is not None else [0 for _ in levels]
+    items = [(i, int(row), float(level)) for i, (row, level) in enumerate(zip(rows, levels))]
+    tasks = [(include_end, [items[i] for i in chunk]) for chunk in split_into_chunks(items, workers)]
+    return run_chunks_in_pool(topology, {'fields': fields}, _find_level_chains_task, tasks, workers)
+
+
+def find_uv_chains_parallel(topology, uv, lines, workers=2):
+    """
+    Finds the sorted intersections of the mesh edges with the lines in the uv domain,
+    sharded across a pool of processes.
+
+    Parameters
+    ----------
+    topology: :class: 'compas_slicer.slicers.slice_utilities.MeshTopology'
+    uv: np.array, float, (#V x 2), the uv coordinates of the vertices, indexed by vertex index
+    lines: list of tuples (p1, p2), the cutting lines in the uv domain
+    workers: int, the number of processes
+
+    Returns
+    ----------
+    list, one item per line, see find_level_chains_parallel
+    """
+    uv = np.array(uv, dtype=np.float64).reshape((-1, 2))
+    candidates = find_uv_lines_candidate_edges(uv, topology.E, lines)
+    items = [(i, tuple(p1), tuple(p2), candidates[i] if candidates is not None else None)
+             for i, (p1, p2) in enumerate(lines)]
+    tasks = [[items[i] for i in chunk] for chunk in split_into_chunks(items, workers)]
+    return run_chunks_in_pool(topology, {'uv': uv}, _find_uv_chains_task, tasks, workers)
+
+
+def create_scalar_field_contours_parallel(mesh, fields, levels, rows=None, topology=None, workers=2):
+    """
+    Extracts the isocontours of one or more scalar fields at the levels on a pool of processes.
+    Equivalent to ScalarFieldContours(mesh, scalar_field=fields[row], iso_value=level).compute() for every level.
+
+    Parameters
+    ----------
+    mesh: :class: 'compas.datastructures.Mesh'
+    fields: np.array, float, (#fields x #V), see find_level_chains_parallel
+    levels: list, float
+    rows: list, int (optional), see find_level_chains_parallel
+    topology: :class: 'compas_slicer.slicers.slice_utilities.MeshTopology' (optional)
+    workers: int, the number of processes
+
+    Returns
+    ----------
+    list, :class: 'compas_slicer.slicers.slice_utilities.ScalarFieldContours', one per level, in the order of levels.
+    """
+    topology = topology if topology else get_mesh_topology(mesh)
+    fields = np.array(fields, dtype=np.float64).reshape((-1, topology.number_of_vertices))
+    rows = rows if rows is not None else [0 for _ in levels]
+    chains_per_level = find_level_chains_parallel(topology, fields, levels, rows, include_end=True, workers=workers)
+
+    all_contours = []
+    for level, row, chains in zip(levels, rows, chains_per_level):
+        contours = ScalarFieldContours(mesh, topology=topology, scalar_field=fields[row], iso_value=float(level))
+        set_or_compute(contours, chains)
+        all_contours.append(contours)
+    return all_contours
+
+
+def create_uv_contours_parallel(mesh, uv, lines, topology=None, workers=2):
+    """
+    Finds the contours of the lines in the uv domain on a pool of processes.
+    Equivalent to UVContours(mesh, p1, p2).compute() for every line.
+
+    Parameters
+    ----------
+    mesh: :class: 'compas.datastructures.Mesh'
+    uv: np.array, float, (#V x 2), see find_uv_chains_parallel
+    lines: list of tuples (p1, p2)
+    topology: :class: 'compas_slicer.slicers.slice_utilities.MeshTopology' (optional)
+    workers: int, the number of processes
+
+    Returns
+    ----------
+    list, :class: 'compas_slicer.slicers.slice_utilities.UVContours', one per line, in the order of lines.
+    """
+    topology = topology if topology else get_mesh_topology(mesh)
+    uv = np.array(uv, dtype=np.float64).reshape((-1, 2))
+    chains_per_line = find_uv_chains_parallel(topology, uv, lines, workers=workers)
+
+    all_contours = []
+    for (p1, p2), chains in zip(lines, chains_per_line):
+        contours = UVContours(mesh, p1, p2, topology=topology, uv=uv)
+        set_or_compute(contours, chains)
+        all_contours.append(contours)
+    return all_contours
+
+
+def set_or_compute(contours, chains):
+    """ Fills in the contours with the chains of a worker, or computes them here if the worker could not chain them. """
+    if chains is not None:
+        contours.set_sorted_clusters(chains)
+    else:
+        contours.compute()
+
+
+if __name__ == "__main__":
+    pass
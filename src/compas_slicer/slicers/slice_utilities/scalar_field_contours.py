@@ -1,3 +1,4 @@
+import numpy as np
 from compas_slicer.slicers.slice_utilities import ContoursBase
 from compas.geometry import Vector, add_vectors, scale_vector
 
@@ -6,20 +7,41 @@ __all__ = ['ScalarFieldContours']
 
 class ScalarFieldContours(ContoursBase):
     """
-    Finds the iso-contours of the function f(x) = vertex_data['scalar_field']
+    Finds the iso-contours of the function f(x) = vertex_data['scalar_field'] - iso_value
     on the mesh.
 
+    The scalar field can also be given directly as an array, in which case it is not read from the vertex
+    attributes and nothing has to be written to the mesh.
+
     Attributes
     ----------
     mesh: :class: 'compas.datastructures.Mesh'
+    topology: :class: 'compas_slicer.slicers.slice_utilities.MeshTopology' (optional)
+    scalar_field: list or np.array, float (optional)
+        One value per vertex, in the order of mesh.vertices() (i.e. indexed by vertex index, see MeshTopology.vkeys).
+        If None, the 'scalar_field' attribute of the vertices is used.
+    iso_value: float
+        The value of the scalar field on the iso-contour. Defaults to 0.
     """
-    def __init__(self, mesh):
-        ContoursBase.__init__(self, mesh)  # initialize from parent class
+    def __init__(self, mesh, topology=None, scalar_field=None, iso_value=0.0):
+        ContoursBase.__init__(self, mesh, topology)  # initialize from parent class
+        if scalar_field is not None:
+            scalar_field = np.asarray(scalar_field, dtype=np.float64)
+            assert len(scalar_field) == self.topology.number_of_vertices, \
+                'The scalar field should have one value per vertex of the mesh.'
+        self.scalar_field = scalar_field
+        self.iso_value = iso_value
+
+    def get_value(self, vkey):
+        """ Returns the value of the function f(x) = scalar_field - iso_value on the vertex with vkey. """
+        if self.scalar_field is not None:
+            return self.scalar_field[self.topology.key_index[vkey]] - self.iso_value
+        return self.mesh.vertex[vkey]['scalar_field'] - self.iso_value
 
     def edge_is_intersected(self, u, v):
         """ Returns True if the edge u,v has a zero-crossing, False otherwise. """
-        d1 = self.mesh.vertex[u]['scalar_field']
-        d2 = self.mesh.vertex[v]['scalar_field']
+        d1 = self.get_value(u)
+        d2 = self.get_value(v)
         if (d1 > 0 and d2 > 0) or (d1 < 0 and d2 < 0):
             return False
         else:
@@ -27,7 +49,7 @@ class ScalarFieldContours(ContoursBase):
 
     def find_zero_crossing_data(self, u, v):
         """ Finds the position of the zero-crossing on the edge u,v. """
-        dist_a, dist_b = self.mesh.vertex[u]['scalar_field'], self.mesh.vertex[v]['scalar_field']
+        dist_a, dist_b = self.get_value(u), self.get_value(v)
         if abs(dist_a) + abs(dist_b) > 0:
             v_coords_a, v_coords_b = self.mesh.vertex_coordinates(u), self.mesh.vertex_coordinates(v)
             vec = Vector.from_start_end(v_coords_a, v_coords_b)
@@ -35,6 +57,19 @@ class ScalarFieldContours(ContoursBase):
             pt = add_vectors(v_coords_a, vec)
             return pt
 
+    def find_zero_crossings_batch(self, vkeys, X, u, v):
+        """ Finds the zero-crossings of the arrays of edges u,v. """
+        if self.scalar_field is not None and vkeys is self.topology.vkeys:
+            field = self.scalar_field - self.iso_value
+        else:
+            field = np.array([self.get_value(vkey) for vkey in vkeys], dtype=np.float64)
+        d1, d2 = field[u], field[v]
+        mask = ~(((d1 > 0) & (d2 > 0)) | ((d1 < 0) & (d2 < 0)))
+        mask &= np.abs(d1) + np.abs(d2) > 0
+        t = np.zeros(len(u))
+        t[mask] = np.abs(d1[mask]) / (np.abs(d1[mask]) + np.abs(d2[mask]))
+        return mask, t
+
 
 if __name__ == "__main__":
     pass
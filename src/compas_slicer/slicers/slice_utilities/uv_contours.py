@@ -1,16 +1,50 @@
+import numpy as np
 from compas_slicer.slicers.slice_utilities import ContoursBase
 from compas.geometry import intersection_line_line_xy, distance_point_point_xy, scale_vector, add_vectors
 
+__all__ = ['UVContours',
+           'is_point_on_line_xy',
+           'intersect_segments_with_line_xy']
+
 
 class UVContours(ContoursBase):
-    def __init__(self, mesh, p1, p2):
-        ContoursBase.__init__(self, mesh)  # initialize from parent class
+    """
+    Finds the intersections of the mesh with the line p1-p2 in the uv domain.
+
+    Attributes
+    ----------
+    mesh: :class: 'compas.datastructures.Mesh'
+    p1: tuple (u,v), first point in uv domain defining the cutting line
+    p2: tuple (u,v), second point in uv domain defining the cutting line
+    topology: :class: 'compas_slicer.slicers.slice_utilities.MeshTopology' (optional)
+    uv: np.array, float, (#V x 2) (optional)
+        The uv coordinates of the vertices, in the order of mesh.vertices() (i.e. indexed by vertex index).
+        If None, the 'uv' attribute of the vertices is used.
+    edges: np.array, int (optional)
+        The indices (in topology.edges) of the edges to be tested for intersections, for example the candidates
+        found with find_uv_lines_candidate_edges. If None, all the edges of the mesh are tested.
+    """
+    def __init__(self, mesh, p1, p2, topology=None, uv=None, edges=None):
+        ContoursBase.__init__(self, mesh, topology)  # initialize from parent class
         self.p1 = p1  # tuple (u,v); first point in uv domain defining the cutting line
         self.p2 = p2  # tuple (u,v); second point in uv domain defining the cutting line
+        if uv is not None:
+            uv = np.asarray(uv, dtype=np.float64).reshape((-1, 2))
+            assert len(uv) == self.topology.number_of_vertices, 'The uv array should have one row per vertex.'
+        self.uv_array = uv
+        self.edges = edges
 
     def uv(self, vkey):
+        if self.uv_array is not None:
+            return tuple(self.uv_array[self.topology.key_index[vkey]])
         return self.mesh.vertex[vkey]['uv']
 
+    def candidate_edge_indices(self):
+        """ Returns the indices (in topology.edges) of the edges that are tested for zero-crossings. """
+        if self.edges is None:
+            return np.arange(self.topology.number_of_edges)
+        return self.edges
+
     def edge_is_intersected(self, v1, v2):
         """ Returns True if the edge v1,v2 intersects the line in the uv domain, False otherwise. """
         p = intersection_line_line_xy((self.p1, self.p2), (self.uv(v1), self.uv(v2)))
@@ -30,8 +64,59 @@ class UVContours(ContoursBase):
             pt = add_vectors(self.mesh.vertex_coordinates(v1), vec)
             return pt
 
+    def find_zero_crossings_batch(self, vkeys, X, u, v):
+        """ Finds the zero-crossings of the arrays of edges u,v, with the same tests as edge_is_intersected. """
+        if self.uv_array is not None and vkeys is self.topology.vkeys:
+            uv = self.uv_array
+        else:
+            uv = np.array([self.uv(vkey) for vkey in vkeys], dtype=np.float64).reshape((-1, 2))
+        return intersect_segments_with_line_xy(uv[u], uv[v], self.p1, self.p2)
+
+
+# utility functions
+
+def intersect_segments_with_line_xy(a, b, p1, p2, epsilon=1e-6):
+    """
+    Vectorized equivalent of intersection_line_line_xy followed by is_point_on_line_xy on both lines.
+
+    Parameters
+    ----------
+    a: np.array, float, (#segments x 2), the start points of the segments
+    b: np.array, float, (#segments x 2), the end points of the segments
+    p1: tuple (u,v), the first point of the line
+    p2: tuple (u,v), the second point of the line
+    epsilon: float
+
+    Returns
+    ----------
+    mask: np.array, bool, True for the segments that intersect the line p1-p2.
+    t: np.array, float, the parameter of the intersection on each segment (0 on a, 1 on b).
+    """
+    x1, y1, x2, y2 = float(p1[0]), float(p1[1]), float(p2[0]), float(p2[1])
+    x3, y3, x4, y4 = a[:, 0], a[:, 1], b[:, 0], b[:, 1]
+
+    # intersection of the infinite lines, same formula as intersection_line_line_xy
+    d = (x1 - x2) * (y3 - y4) - (y1 - y2) * (x3 - x4)
+    mask = d != 0.0
+    d = np.where(mask, d, 1.0)
+    det_12 = x1 * y2 - y1 * x2
+    det_34 = x3 * y4 - y3 * x4
+    x = (det_12 * (x3 - x4) - (x1 - x2) * det_34) / d
+    y = (det_12 * (y3 - y4) - (y1 - y2) * det_34) / d
+
+    # the intersection should lie on both the segment and the line p1-p2, same test as is_point_on_line_xy
+    for (ax, ay), (bx, by) in [((x3, y3), (x4, y4)), ((x1, y1), (x2, y2))]:
+        cross_product = (y - ay) * (bx - ax) - (x - ax) * (by - ay)
+        dot_product = (x - ax) * (bx - ax) + (y - ay) * (by - ay)
+        squared_length_ba = (bx - ax) * (bx - ax) + (by - ay) * (by - ay)
+        mask &= (np.abs(cross_product) <= epsilon) & (dot_product >= 0) & (dot_product <= squared_length_ba)
+
+    d1 = np.sqrt((x - x3) ** 2 + (y - y3) ** 2)
+    d2 = np.sqrt((x - x4) ** 2 + (y - y4) ** 2)
+    mask &= d1 + d2 > 0
+    t = np.where(mask, d1 / np.where(mask, d1 + d2, 1.0), 0.0)
+    return mask, t
 
-# utility function
 
 def is_point_on_line_xy(c, line, epsilon=1e-6):
     """
@@ -1,6 +1,7 @@
 from compas_slicer.slicers import BaseSlicer
 import logging
-from compas_slicer.slicers.slice_utilities import UVContours
+from compas_slicer.slicers.slice_utilities import get_mesh_topology
+from compas_slicer.slicers.slice_utilities import create_uv_contours_multi_level, create_uv_contours_parallel
 import numpy as np
 
 import progressbar
@@ -25,20 +26,28 @@ class UVSlicer(BaseSlicer):
         We recommend to 1)re-topologize, 2) triangulate, and 3) weld your mesh in advance.
     vkey_to_uv: dict {vkey : tuple (u,v)}. U,V coordinates should be in the domain [0,1]. The U coordinate
     no_of_isocurves: int, how many levels to be generated
+    paths_type: str
+        'flat' (default) for paths on lines of constant u, or 'spiral' for paths that rise by one level per turn.
+    workers: int (optional)
+        If more than 1, the contours are found on a pool of that many processes. Defaults to None (serial).
     """
 
-    def __init__(self, mesh, vkey_to_uv, no_of_isocurves, parameters=None):
+    def __init__(self, mesh, vkey_to_uv, no_of_isocurves, parameters=None, paths_type='flat', workers=None):
         logger.info('UVSlicer')
         BaseSlicer.__init__(self, mesh)
 
         self.vkey_to_uv = vkey_to_uv
         self.no_of_isocurves = no_of_isocurves
         self.parameters = parameters if parameters else {}
+        self.workers = workers
+        assert paths_type in ['flat', 'spiral'], "Invalid paths_type : " + str(paths_type)
+        self.paths_type = paths_type
 
         u = [self.vkey_to_uv[vkey][0] for vkey in mesh.vertices()]
         v = [self.vkey_to_uv[vkey][1] for vkey in mesh.vertices()]
         u = np.array(u) * float(no_of_isocurves + 1)
         vkey_to_i = self.mesh.key_index()
+        self.uv = np.column_stack((u, np.array(v, dtype=np.float64)))  # (#V x 2), in the order of mesh.vertices()
 
         mesh.update_default_vertex_attributes({'uv': 0})
         for vkey in mesh.vertices():
@@ -46,29 +55,32 @@ class UVSlicer(BaseSlicer):
 
     def generate_paths(self):
         """ Generates isocontours. """
-        paths_type = 'flat'  # 'spiral' # 'zigzag'
         v_left, v_right = 0.0, 1.0 - 1e-5
 
         max_dist = get_param(self.parameters, key='vertical_layers_max_centroid_dist', defaults_type='layers')
         vertical_layers_manager = VerticalLayersManager(max_dist)
+        topology = get_mesh_topology(self.mesh)
+
+        lines = []
+        for i in range(0, self.no_of_isocurves + 1):
+            if i == 0:
+                i += 0.05  # contours are a bit tricky in the edges
+            if self.paths_type == 'spiral':
+                u1, u2 = i, i + 1.0
+            else:  # 'flat'
+                u1 = u2 = i
+            lines.append(((u1, v_left), (u2, v_right)))
+
+        if self.workers and self.workers > 1:
+            all_contours = create_uv_contours_parallel(self.mesh, self.uv, lines, topology=topology,
+                                                       workers=self.workers)
+        else:
+            all_contours = create_uv_contours_multi_level(self.mesh, self.uv, lines, topology=topology)
 
         # create paths + layers
         with progressbar.ProgressBar(max_value=self.no_of_isocurves) as bar:
-            for i in range(0, self.no_of_isocurves + 1):
-                if i == 0:
-                    i += 0.05  # contours are a bit tricky in the edges
-                if paths_type == 'spiral':
-                    u1, u2 = i, i + 1.0
-                else:  # 'flat'
-                    u1 = u2 = i
-
-                p1 = (u1, v_left)
-                p2 = (u2, v_right)
-
-                contours = UVContours(self.mesh, p1, p2)
-                contours.compute()
+            for i, contours in enumerate(all_contours):
                 contours.add_to_vertical_layers_manager(vertical_layers_manager)
-
                 bar.update(i)  # advance progress bar
 
         self.layers = vertical_layers_manager.layers
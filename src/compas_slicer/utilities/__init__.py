@@ -28,6 +28,30 @@ utils
     smooth_vectors
     get_normal_of_path_on_xy_plane
 
+mesh_query
+==========
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    MeshQuery
+    VertexLocator
+    get_mesh_query
+    invalidate_mesh_query
+    get_vertex_locator
+    invalidate_vertex_locator
+    closest_points_on_triangles
+
+point_cloud
+===========
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    PointCloudIndex
+
 """
 
 from __future__ import absolute_import
@@ -35,6 +59,8 @@ from __future__ import division
 from __future__ import print_function
 
 from .terminal_command import *  # noqa: F401 E402 F403
+from .mesh_query import *  # noqa: F401 E402 F403
+from .point_cloud import *  # noqa: F401 E402 F403
 from .utils import *  # noqa: F401 E402 F403
 from .attributes_transfer import *  # noqa: F401 E402 F403
 
@@ -0,0 +1,407 @@
+import weakref
+import logging
+import numpy as np
+import scipy.spatial
+
+logger = logging.getLogger('logger')
+
+__all__ = ['MeshQuery',
+           'VertexLocator',
+           'get_mesh_query',
+           'invalidate_mesh_query',
+           'get_vertex_locator',
+           'invalidate_vertex_locator',
+           'invalidate_mesh_caches',
+           'closest_points_on_triangles']
+
+
+class MeshQuery(object):
+    """
+    Closest point queries on a triangular mesh, accelerated with a bounding volume hierarchy (BVH) of axis aligned
+    bounding boxes over the triangles.
+
+    The tree is built once, by splitting the triangles recursively at the median of their centroids along the
+    longest axis. The queries are done for batches of points: each point first descends greedily to one leaf
+    to get an upper bound of its distance to the mesh, and then only visits the boxes that are closer than its
+    current best distance. On ties, the face that is found first is kept. The points are processed in chunks, so the
+    memory use is bounded by the chunk size and not by #points x #faces.
+
+    Use get_mesh_query(mesh) to get a cached instance that is rebuilt only when the mesh changes.
+
+    Attributes
+    ----------
+    mesh: :class: 'compas.datastructures.Mesh'
+    fkeys: np.array, int, (#F), the face keys, in the order of mesh.faces()
+    V: np.array, float, (#V x 3), the vertex coordinates
+    F: np.array, int, (#F x 3), the vertex indices of each face
+    leaf_size: int, the maximum number of triangles in a leaf of the tree
+    """
+
+    def __init__(self, mesh, leaf_size=4):
+        self.mesh = mesh
+        self.signature = MeshSignature(mesh)
+        self.leaf_size = leaf_size
+
+        vkeys = list(mesh.vertices())
+        key_index = {vkey: i for i, vkey in enumerate(vkeys)}
+        self.fkeys = np.array(list(mesh.faces()), dtype=np.int64)
+        faces = [mesh.face_vertices(fkey) for fkey in self.fkeys.tolist()]
+        assert all(len(face) == 3 for face in faces), 'MeshQuery only works on triangular meshes.'
+        self.V = np.array([mesh.vertex_coordinates(vkey) for vkey in vkeys], dtype=np.float64).reshape((-1, 3))
+        self.F = np.array([[key_index[vkey] for vkey in face] for face in faces], dtype=np.int64).reshape((-1, 3))
+        self.triangles = self.V[self.F]  # (#F x 3 x 3)
+
+        self.build_tree()
+
+    def __repr__(self):
+        return "<MeshQuery with %d faces and %d tree nodes>" % (len(self.F), len(self.node_min))
+
+    @property
+    def number_of_faces(self):
+        return len(self.F)
+
+    # --- Tree
+
+    def build_tree(self):
+        """
+        Builds the tree. The nodes are stored in arrays, in breadth-first order. The children of node i are
+        first_child[i] and first_child[i] + 1, and the leaves (first_child = -1) contain the triangles
+        order[start[i]:end[i]].
+        """
+        tri_min = self.triangles.min(axis=1)
+        tri_max = self.triangles.max(axis=1)
+        centroids = (tri_min + tri_max) / 2.0
+        self.order = np.arange(len(self.F), dtype=np.int64)
+
+        ranges = [(0, len(self.F))]
+        node_min, node_max, first_child = [], [], []
+        i = 0
+        while i < len(ranges):
+            start, end = ranges[i]
+            indices = self.order[start:end]
+            node_min.append(tri_min[indices].min(axis=0) if end > start else np.full(3, np.inf))
+            node_max.append(tri_max[indices].max(axis=0) if end > start else np.full(3, -np.inf))
+            if end - start > self.leaf_size:
+                c = centroids[indices]
+                axis = np.argmax(c.max(axis=0) - c.min(axis=0))
+                half = (end - start) // 2
+                self.order[start:end] = indices[np.argpartition(c[:, axis], half)]
+                first_child.append(len(ranges))
+                ranges.append((start, start + half))
+                ranges.append((start + half, end))
+            else:
+                first_child.append(-1)
+            i += 1
+
+        self.node_min = np.array(node_min, dtype=np.float64).reshape((-1, 3))
+        self.node_max = np.array(node_max, dtype=np.float64).reshape((-1, 3))
+        self.first_child = np.array(first_child, dtype=np.int64)
+        self.start = np.array([r[0] for r in ranges], dtype=np.int64)
+        self.end = np.array([r[1] for r in ranges], dtype=np.int64)
+
+    def boxes_distances_sqrd(self, points, nodes):
+        """ Returns np.array, float, the squared distances from the points to the bounding boxes of the nodes. """
+        d = np.maximum(np.maximum(self.node_min[nodes] - points, points - self.node_max[nodes]), 0.0)
+        return d[:, 0] ** 2 + d[:, 1] ** 2 + d[:, 2] ** 2
+
+    # --- Queries
+
+    def closest_points(self, points, chunk_size=4096):
+        """
+        Finds the closest points on the mesh.
+
+        Parameters
+        ----------
+        points: np.array, float, (#points x 3), or list of points
+        chunk_size: int, the number of points that are processed together.
+
+        Returns
+        -------
+        np.array, int, (#points), the index of the closest face of each point (use fkeys[index] for the face key)
+        np.array, float, (#points x 3), the closest point on the mesh
+        np.array, float, (#points x 3), the barycentric coordinates of the closest point on its face
+        """
+        points = np.array(points, dtype=np.float64).reshape((-1, 3))
+        assert self.number_of_faces > 0, 'The mesh has no faces.'
+        face_indices = np.zeros(len(points), dtype=np.int64)
+        closest = np.zeros((len(points), 3))
+        barycentric = np.zeros((len(points), 3))
+        for s in range(0, len(points), chunk_size):
+            e = min(s + chunk_size, len(points))
+            face_indices[s:e], closest[s:e], barycentric[s:e] = self.closest_points_chunk(points[s:e])
+        return face_indices, closest, barycentric
+
+    def closest_faces(self, points, chunk_size=4096):
+        """ Returns list, int, the keys of the closest faces of the points. """
+        face_indices, _, _ = self.closest_points(points, chunk_size)
+        return self.fkeys[face_indices].tolist()
+
+    def closest_points_chunk(self, points):
+        """ Finds the closest points on the mesh for a chunk of points, see closest_points. """
+        n = len(points)
+        best_d2 = np.full(n, np.inf)
+        best_face = np.full(n, -1, dtype=np.int64)
+        best_pt = np.zeros((n, 3))
+        best_bary = np.zeros((n, 3))
+
+        def update(pis, nodes):
+            """ Tests the triangles of the leaf nodes, and keeps the closest ones. """
+            counts = self.end[nodes] - self.start[nodes]
+            pis = np.repeat(pis, counts)
+            offsets = np.arange(len(pis)) - np.repeat(np.cumsum(counts) - counts, counts)
+            faces = self.order[np.repeat(self.start[nodes], counts) + offsets]
+            q, bary = closest_points_on_triangles(points[pis], self.triangles[faces])
+            diff = points[pis] - q
+            d2 = diff[:, 0] ** 2 + diff[:, 1] ** 2 + diff[:, 2] ** 2
+
+            # closest candidate of each point
+            d2_min = np.full(n, np.inf)
+            np.minimum.at(d2_min, pis, d2)
+            better = (d2 == d2_min[pis]) & (d2 < best_d2[pis])
+            pis = pis[better]
+            best_d2[pis], best_face[pis], best_pt[pis], best_bary[pis] = d2[better], faces[better], q[better], \
+                bary[better]
+
+        # (1) greedy descent to one leaf per point, to get an upper bound of the distances
+        nodes = np.zeros(n, dtype=np.int64)
+        inner = self.first_child[nodes] >= 0
+        while np.any(inner):
+            left = self.first_child[nodes[inner]]
+            d_left = self.boxes_distances_sqrd(points[inner], left)
+            d_right = self.boxes_distances_sqrd(points[inner], left + 1)
+            nodes[inner] = np.where(d_right < d_left, left + 1, left)
+            inner = self.first_child[nodes] >= 0
+        update(np.arange(n), nodes)
+        greedy_leaf = nodes
+
+        # (2) traversal of the boxes that are closer than the current best distances
+        pis = np.arange(n)
+        nodes = np.zeros(n, dtype=np.int64)
+        while len(pis) > 0:
+            keep = self.boxes_distances_sqrd(points[pis], nodes) < best_d2[pis]
+            pis, nodes = pis[keep], nodes[keep]
+            is_leaf = self.first_child[nodes] < 0
+            is_new_leaf = is_leaf & (nodes != greedy_leaf[pis])
+            if np.any(is_new_leaf):
+                update(pis[is_new_leaf], nodes[is_new_leaf])
+            pis, left = pis[~is_leaf], self.first_child[nodes[~is_leaf]]
+            pis, nodes = np.repeat(pis, 2), np.stack([left, left + 1], axis=1).reshape(-1)
+
+        return best_face, best_pt, best_bary
+
+
+class VertexLocator(object):
+    """
+    Nearest vertex queries on a mesh, with a KD-tree over the vertex coordinates.
+
+    Use get_vertex_locator(mesh) to get a cached instance that is rebuilt only when the mesh changes.
+
+    Attributes
+    ----------
+    mesh: :class: 'compas.datastructures.Mesh'
+    vkeys: np.array, int, (#V), the vertex keys, in the order of mesh.vertices()
+    V: np.array, float, (#V x 3), the vertex coordinates
+    """
+
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self.signature = MeshSignature(mesh)
+        self.vkeys = np.array(list(mesh.vertices()), dtype=np.int64)
+        self.V = np.array([mesh.vertex_coordinates(vkey) for vkey in self.vkeys.tolist()],
+                          dtype=np.float64).reshape((-1, 3))
+        self.tree = scipy.spatial.cKDTree(self.V)
+
+    def __repr__(self):
+        return "<VertexLocator with %d vertices>" % len(self.vkeys)
+
+    def closest_vertices(self, points, k=1):
+        """
+        Finds the k closest vertices of each point.
+
+        Parameters
+        ----------
+        points: np.array, float, (#points x 3), or list of points
+        k: int, the number of closest vertices to find.
+
+        Returns
+        -------
+        np.array, int, (#points) if k == 1, else (#points x k), the closest vertex keys, sorted by distance
+        np.array, float, (#points) if k == 1, else (#points x k), the distances to the closest vertices
+        """
+        points = np.array(points, dtype=np.float64).reshape((-1, 3))
+        assert 0 < k <= len(self.vkeys), 'Cannot find %d closest vertices on a mesh with %d vertices.' % (
+            k, len(self.vkeys))
+        distances, indices = self.tree.query(points, k=k)
+        return self.vkeys[indices], distances
+
+
+def closest_points_on_triangles(points, triangles):
+    """
+    Returns the closest points on the triangles, and their barycentric coordinates, for pairs of points and
+    triangles. It follows the Voronoi regions of the vertices, edges and face of each triangle
+    (Ericson, Real-Time Collision Detection, 5.1.5).
+
+    Parameters
+    ----------
+    points: np.array, float, (#pairs x 3)
+    triangles: np.array, float, (#pairs x 3 x 3)
+
+    Returns
+    -------
+    np.array, float, (#pairs x 3), the closest points
+    np.array, float, (#pairs x 3), the barycentric coordinates of the closest points
+    """
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    ab, ac = b - a, c - a
+    ap, bp, cp = points - a, points - b, points - c
+    d1, d2 = np.einsum('ij,ij->i', ab, ap), np.einsum('ij,ij->i', ac, ap)
+    d3, d4 = np.einsum('ij,ij->i', ab, bp), np.einsum('ij,ij->i', ac, bp)
+    d5, d6 = np.einsum('ij,ij->i', ab, cp), np.einsum('ij,ij->i', ac, cp)
+    va, vb, vc = d3 * d6 - d5 * d4, d5 * d2 - d1 * d6, d1 * d4 - d3 * d2
+
+    bary = np.zeros((len(points), 3))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # inside the face, then the regions with higher priority overwrite it
+        denom = va + vb + vc
+        v, w = vb / denom, vc / denom
+        bary[:] = np.stack([1.0 - v - w, v, w], axis=1)
+
+        bc = (va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0)
+        w = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        bary[bc] = np.stack([np.zeros(len(w)), 1.0 - w, w], axis=1)[bc]
+
+        ac_edge = (vb <= 0) & (d2 >= 0) & (d6 <= 0)
+        w = d2 / (d2 - d6)
+        bary[ac_edge] = np.stack([1.0 - w, np.zeros(len(w)), w], axis=1)[ac_edge]
+
+        bary[(d6 >= 0) & (d5 <= d6)] = (0.0, 0.0, 1.0)
+
+        ab_edge = (vc <= 0) & (d1 >= 0) & (d3 <= 0)
+        v = d1 / (d1 - d3)
+        bary[ab_edge] = np.stack([1.0 - v, v, np.zeros(len(v))], axis=1)[ab_edge]
+
+        bary[(d3 >= 0) & (d4 <= d3)] = (0.0, 1.0, 0.0)
+        bary[(d1 <= 0) & (d2 <= 0)] = (1.0, 0.0, 0.0)
+
+    # degenerate triangles: closest vertex
+    degenerate = ~np.all(np.isfinite(bary), axis=1)
+    if np.any(degenerate):
+        d = np.linalg.norm(triangles[degenerate] - points[degenerate][:, None, :], axis=2)
+        bary[degenerate] = np.eye(3)[np.argmin(d, axis=1)]
+
+    closest = bary[:, 0, None] * a + bary[:, 1, None] * b + bary[:, 2, None] * c
+    return closest, bary
+
+
+_MESH_VERSIONS = weakref.WeakKeyDictionary()  # mesh : int
+
+
+def invalidate_mesh_caches(mesh):
+    """
+    Marks all the structures that are cached per mesh (MeshTopology, MeshQuery, VertexLocator,
+    HeatGeodesicsSolver) as out of date, so that they are rebuilt the next time that they are needed.
+    Call this after editing the coordinates of some vertices of the mesh in place.
+    """
+    _MESH_VERSIONS[mesh] = _MESH_VERSIONS.get(mesh, 0) + 1
+
+
+class MeshSignature(object):
+    """
+    The state of a mesh when a cached structure was built from it. Checking it against the mesh is O(1), so it can
+    be done on every lookup of the cache. It compares the number of vertices and faces, the largest vertex and face
+    keys, the version of the mesh (increased by invalidate_mesh_caches), and the coordinates of a fixed sample of
+    vertices, which change when the whole mesh is moved or transformed in place. Edits of the coordinates of single
+    vertices are only detected through invalidate_mesh_caches(mesh).
+
+    Attributes
+    ----------
+    state: tuple, the counts, the largest keys and the version of the mesh
+    samples: list, (int, tuple (float, float, float)), the sampled vertex keys and their coordinates
+    """
+
+    def __init__(self, mesh, number_of_samples=32):
+        self.state = get_mesh_state(mesh)
+        vkeys = list(mesh.vertex)
+        indices = np.linspace(0, len(vkeys) - 1, min(number_of_samples, len(vkeys))).astype(np.int64)
+        self.samples = [(vkeys[i], get_vertex_xyz(mesh, vkeys[i])) for i in np.unique(indices).tolist()]
+
+    def matches(self, mesh):
+        """ Returns True if the mesh has not changed since the signature was created. """
+        if self.state != get_mesh_state(mesh):
+            return False
+        for vkey, xyz in self.samples:
+            if get_vertex_xyz(mesh, vkey) != xyz:
+                return False
+        return True
+
+
+def get_mesh_state(mesh):
+    """ Returns the number of vertices and faces, the largest vertex and face keys and the version of the mesh. """
+    return (len(mesh.vertex), len(mesh.face), getattr(mesh, '_max_vertex', None), getattr(mesh, '_max_face', None),
+            _MESH_VERSIONS.get(mesh, 0))
+
+
+def get_vertex_xyz(mesh, vkey):
+    """ Returns tuple (float, float, float), the coordinates of the vertex, read directly from the vertex dict. """
+    attr = mesh.vertex[vkey]
+    return attr['x'], attr['y'], attr['z']
+
+
+_QUERIES = weakref.WeakKeyDictionary()  # mesh : MeshQuery
+
+
+def get_mesh_query(mesh):
+    """
+    Returns the MeshQuery of the mesh. It is cached, and it is rebuilt if vertices or faces have been
+    added or deleted, if the mesh has been transformed, or after invalidate_mesh_caches(mesh) (see MeshSignature).
+
+    Parameters
+    ----------
+    mesh: :class: 'compas.datastructures.Mesh'
+
+    Returns
+    ----------
+    :class: 'compas_slicer.utilities.MeshQuery'
+    """
+    query = _QUERIES.get(mesh)
+    if query is None or not query.signature.matches(mesh):
+        query = MeshQuery(mesh)
+        _QUERIES[mesh] = query
+    return query
+
+
+def invalidate_mesh_query(mesh):
+    """ Removes the cached MeshQuery of the mesh, so that it is rebuilt the next time that it is needed. """
+    _QUERIES.pop(mesh, None)
+
+
+_LOCATORS = weakref.WeakKeyDictionary()  # mesh : VertexLocator
+
+
+def get_vertex_locator(mesh):
+    """
+    Returns the VertexLocator of the mesh. It is cached, and it is rebuilt if vertices or faces have been
+    added or deleted, if the mesh has been transformed, or after invalidate_mesh_caches(mesh) (see MeshSignature).
+
+    Parameters
+    ----------
+    mesh: :class: 'compas.datastructures.Mesh'
+
+    Returns
+    ----------
+    :class: 'compas_slicer.utilities.VertexLocator'
+    """
+    locator = _LOCATORS.get(mesh)
+    if locator is None or not locator.signature.matches(mesh):
+        locator = VertexLocator(mesh)
+        _LOCATORS[mesh] = locator
+    return locator
+
+
+def invalidate_vertex_locator(mesh):
+    """ Removes the cached VertexLocator of the mesh, so that it is rebuilt the next time that it is needed. """
+    _LOCATORS.pop(mesh, None)
+
+
+if __name__ == "__main__":
+    pass
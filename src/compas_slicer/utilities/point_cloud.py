@@ -0,0 +1,69 @@
+import logging
+import numpy as np
+import scipy.spatial
+
+logger = logging.getLogger('logger')
+
+__all__ = ['PointCloudIndex']
+
+
+class PointCloudIndex(object):
+    """
+    Proximity queries between a point cloud (for example the points of a path) and batches of other points,
+    with a KD-tree over the cloud. Build it once per cloud, and then query it with as many batches as needed.
+
+    Attributes
+    ----------
+    coords: np.array, float, (#points x 3), the coordinates of the cloud
+    """
+
+    def __init__(self, points):
+        self.coords = np.array(points, dtype=np.float64).reshape((-1, 3))
+        self.tree = scipy.spatial.cKDTree(self.coords)
+
+    def __repr__(self):
+        return "<PointCloudIndex with %d points>" % len(self.coords)
+
+    def nearest_distances(self, points):
+        """
+        Returns np.array, float, (#points), the distance of each point to its nearest point of the cloud
+        (inf if the cloud is empty).
+
+        Parameters
+        ----------
+        points: np.array, float, (#points x 3), or list of points
+        """
+        points = np.array(points, dtype=np.float64).reshape((-1, 3))
+        if len(self.coords) == 0:
+            return np.full(len(points), np.inf)
+        distances, _ = self.tree.query(points, k=1)
+        return distances
+
+    def min_max_nearest_distance(self, points):
+        """
+        Returns (float, float), the minimum and the maximum of the distances of the points to their nearest point of
+        the cloud, or (inf, 0.0) if there are no points.
+
+        Parameters
+        ----------
+        points: np.array, float, (#points x 3), or list of points
+        """
+        distances = self.nearest_distances(points)
+        if len(distances) == 0:
+            return np.inf, 0.0
+        return float(np.min(distances)), float(np.max(distances))
+
+    def count_within(self, points, threshold):
+        """
+        Returns int, the number of points whose nearest point of the cloud is closer than the threshold.
+
+        Parameters
+        ----------
+        points: np.array, float, (#points x 3), or list of points
+        threshold: float
+        """
+        return int(np.count_nonzero(self.nearest_distances(points) < threshold))
+
+
+if __name__ == "__main__":
+    pass
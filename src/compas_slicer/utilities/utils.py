@@ -1,14 +1,15 @@
 import os
 import json
 import logging
-from compas.geometry import Point, distance_point_point_sqrd, normalize_vector
-from compas.geometry import Vector, length_vector, closest_point_in_cloud, closest_point_on_plane
+from compas.geometry import Point, normalize_vector
+from compas.geometry import Vector, length_vector, closest_point_in_cloud
 import matplotlib.pyplot as plt
 import networkx as nx
 import numpy as np
 import scipy
 from compas.plugins import PluginNotInstalledError
 from compas_slicer.utilities import TerminalCommand
+from compas_slicer.utilities import get_mesh_query, get_vertex_locator
 
 logger = logging.getLogger('logger')
 
@@ -25,6 +26,7 @@ __all__ = ['remap',
            'point_list_to_dict',
            'point_list_from_dict',
            'get_closest_mesh_vkey_to_pt',
+           'get_closest_mesh_vkeys_to_pts',
            'get_mesh_cotmatrix_igl',
            'get_mesh_cotans_igl',
            'get_closest_pt_index',
@@ -37,6 +39,7 @@ __all__ = ['remap',
            'find_previous_printpoint',
            'smooth_vectors',
            'get_normal_of_path_on_xy_plane',
+           'get_normals_of_path_on_xy_plane',
            'get_all_files_with_name',
            'get_closest_mesh_normal_to_pt',
            'check_package_is_installed']
@@ -127,24 +130,21 @@ def get_closest_pt(pt, pts):
 def pull_pts_to_mesh_faces(mesh, points):
     """
     Very fast method for projecting a list of points on a mesh, and finding their closest face keys.
+    The points are projected to their closest point on the mesh, using the cached MeshQuery of the mesh.
 
     Parameters
     ----------
     mesh: :class: compas.datastructures.Mesh
-    points: list, compas.geometry.Point
+    points: list, compas.geometry.Point, or np.array, float, (#points x 3)
 
     Returns
     -------
     closest_fks: a list of the closest face keys
     projected_pts: a list of the projected points on the mesh
     """
-    points = np.array(points, dtype=np.float64).reshape((-1, 3))
-    fi_fk = {index: fkey for index, fkey in enumerate(mesh.faces())}
-    f_centroids = np.array([mesh.face_centroid(fkey) for fkey in mesh.faces()], dtype=np.float64)
-    closest_fis = np.argmin(scipy.spatial.distance_matrix(points, f_centroids), axis=1)
-    closest_fks = [fi_fk[fi] for fi in closest_fis]
-    projected_pts = [closest_point_on_plane(point, mesh.face_plane(fi)) for point, fi in zip(points, closest_fis)]
-    return closest_fks, projected_pts
+    query = get_mesh_query(mesh)
+    face_indices, projected_pts, _ = query.closest_points(points)
+    return query.fkeys[face_indices].tolist(), projected_pts.tolist()
 
 
 def smooth_vectors(vectors, strength, iterations):
@@ -287,12 +287,27 @@ def get_closest_mesh_vkey_to_pt(mesh, pt):
     int
         the closest vertex key
     """
-    # cloud = [Point(data['x'], data['y'], data['z']) for v_key, data in mesh.vertices(data=True)]
-    # closest_index = compas.geometry.closest_point_in_cloud(pt, cloud)[2]
-    vertex_tupples = [(v_key, Point(data['x'], data['y'], data['z'])) for v_key, data in mesh.vertices(data=True)]
-    vertex_tupples = sorted(vertex_tupples, key=lambda v_tupple: distance_point_point_sqrd(pt, v_tupple[1]))
-    closest_vkey = vertex_tupples[0][0]
-    return closest_vkey
+    vkeys, _ = get_vertex_locator(mesh).closest_vertices([pt])
+    return int(vkeys[0])
+
+
+def get_closest_mesh_vkeys_to_pts(mesh, pts, k=1):
+    """
+    Finds the k closest vertex keys to each point, with the cached VertexLocator of the mesh.
+
+    Parameters
+    ----------
+    mesh: :class: 'compas.datastructures.Mesh'
+    pts: list, :class: 'compas.geometry.Point', or np.array, float, (#points x 3)
+    k: int, the number of closest vertices.
+
+    Returns
+    ----------
+    np.array, int, (#points) if k == 1, else (#points x k)
+        the closest vertex keys, sorted by distance
+    """
+    vkeys, _ = get_vertex_locator(mesh).closest_vertices(pts, k=k)
+    return vkeys
 
 
 def get_closest_mesh_normal_to_pt(mesh, pt):
@@ -385,6 +400,65 @@ def get_normal_of_path_on_xy_plane(k, point, path, mesh):
     return normal
 
 
+def get_normals_of_path_on_xy_plane(path, mesh):
+    """
+    Finds the normals of the curve that lies on the xy plane at all the points of the path, with array operations.
+    The normals are the same as the ones of get_normal_of_path_on_xy_plane for each point. Where the neighboring
+    elements cancel out, the closest mesh normals of all these points are found in one batch.
+
+    Parameters
+    ----------
+    path: :class: 'compas_slicer.geometry.Path'
+    mesh: :class: 'compas.datastructures.Mesh'
+
+    Returns
+    ----------
+    list, :class: 'compas.geometry.Vector', one normal per point of the path
+    """
+    pts = path.coords
+    n = len(pts)
+    if n == 0:
+        return []
+    if path.is_closed:
+        prev_pts, next_pts = np.roll(pts, 1, axis=0), np.roll(pts, -1, axis=0)
+    else:
+        prev_pts = np.concatenate([pts[:1], pts[:-1]])
+        next_pts = np.concatenate([pts[1:], pts[-1:]])
+
+    v1 = normalize_vectors(pts - prev_pts)  # Vector.from_start_end(prev_pt, point)
+    v2 = normalize_vectors(next_pts - pts)  # Vector.from_start_end(point, next_pt)
+    v = (v1 + v2) * 0.5
+    normals = np.stack([-v[:, 1], v[:, 0], v[:, 2]], axis=1)  # rotate 90 degrees COUNTER-clockwise on the xy plane
+    if not path.is_closed:
+        normals[0] = [-v2[0, 1], v2[0, 0], v2[0, 2]]
+        if n > 1:
+            v = normalize_vectors(prev_pts[-1:] - pts[-1:])[0]
+            normals[-1] = [v[1], -v[0], v[2]]  # rotate 90 degrees clockwise on the xy plane
+
+    # When the neighboring elements happen to cancel out, then search for the true normals,
+    # and project them on the xy plane for consistency
+    cancel_out = vector_lengths(normals) == 0
+    if np.any(cancel_out):
+        vkeys = get_closest_mesh_vkeys_to_pts(mesh, pts[cancel_out])
+        mesh_normals = np.array([mesh.vertex_normal(vkey) for vkey in vkeys.tolist()], dtype=np.float64)
+        normals[cancel_out] = mesh_normals * np.array([1.0, 1.0, 0.0])
+
+    return [Vector(*normal) for normal in normalize_vectors(normals).tolist()]
+
+
+def vector_lengths(vectors):
+    """ Returns np.array, float, the lengths of the (#vectors x 3) vectors, summed in the same order as
+    compas.geometry.length_vector. """
+    return np.sqrt(vectors[:, 0] * vectors[:, 0] + vectors[:, 1] * vectors[:, 1] + vectors[:, 2] * vectors[:, 2])
+
+
+def normalize_vectors(vectors):
+    """ Returns np.array, float, the (#vectors x 3) vectors divided by their lengths. Vectors of zero length are
+    returned as zero vectors. """
+    lengths = vector_lengths(vectors)
+    return np.divide(vectors, lengths[:, None], out=np.zeros_like(vectors), where=lengths[:, None] > 0)
+
+
 #######################################
 # igl utils
 
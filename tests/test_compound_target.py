@@ -0,0 +1,131 @@
+import math
+import os
+import numpy as np
+import pytest
+from compas.datastructures import Mesh
+from compas_slicer.pre_processing import CompoundTarget, get_union_of_distances, get_interpolation_distances_batch, \
+    assign_interpolation_distance_to_mesh_vertex
+from compas_slicer.pre_processing.preprocessing_utils.region_split import MeshSplitter, get_weights_list
+
+HERE = os.path.dirname(__file__)
+DATA = os.path.join(HERE, 'tests_data')
+
+
+def fold(values, union, *params):
+    """ The union of a list of floats, folded element by element in pure python. """
+    d_result = 9999999
+    for d in values:
+        d_result = union(d_result, d, *params)
+    return d_result
+
+
+def blend(da, db, r):
+    e = max(r - abs(da - db), 0)
+    return min(da, db) - e * e * 0.25 / r
+
+
+def chamfer(a, b, r):
+    return min(min(a, b), (a - r + b) * math.sqrt(0.5))
+
+
+def stairs(a, b, r, n):
+    s = r / n
+    u = b - r
+    return min(min(a, b), 0.5 * (u + a + abs((u - a + s) % (2 * s) - s)))
+
+
+def test_union_of_distances():
+    """ Tests that the unions reduced over the clusters axis are the same as the unions of each vertex. """
+    distances = np.random.default_rng(0).uniform(0.0, 200.0, (4, 500))
+    cases = [('min', [], min, []), ('smooth', [10.0], blend, [10.0]), ('chamfer', [100.0], chamfer, [100.0]),
+             ('stairs', [80.0, 3], stairs, [80.0, 3])]
+    for union_method, union_params, union, params in cases:
+        union_distances = get_union_of_distances(distances, union_method, union_params)
+        if union_method == 'min':
+            expected = [min(column) for column in distances.T.tolist()]
+        else:
+            expected = [fold(column, union, *params) for column in distances.T.tolist()]
+        assert union_distances.tolist() == expected
+
+
+def test_compound_target_union_memoized(tmp_path):
+    """ Tests that the union of the distances is kept until the union method or its parameters change. """
+    mesh = Mesh.from_obj(os.path.join(DATA, 'distorted_v_closed_low_res.obj'))
+    mesh.update_default_vertex_attributes({'boundary': 0})
+    for vkey in [0, 50, 100]:
+        mesh.vertex_attribute(vkey, 'boundary', 2)
+    distances = np.random.default_rng(1).uniform(0.0, 200.0, (3, mesh.number_of_vertices()))
+    target = CompoundTarget(mesh, 'boundary', 2, str(tmp_path), geodesics_method='heat_fast')
+    assert target.number_of_boundaries == 3
+    target.update_distances_lists(distances)
+
+    union_distances = target.get_union_distances()
+    assert target.get_union_distances() is union_distances
+    assert np.array_equal(union_distances, np.min(distances, axis=0))
+    assert target.get_distance(7) == union_distances[7]
+    assert target.get_all_distances_for_vkey(7) == distances[:, 7].tolist()
+
+    target.union_method, target.union_params = 'smooth', [10.0]
+    assert np.array_equal(target.get_union_distances(), get_union_of_distances(distances, 'smooth', [10.0]))
+    target.union_params[0] = 20.0
+    assert np.array_equal(target.get_union_distances(), get_union_of_distances(distances, 'smooth', [20.0]))
+
+    target.update_distances_lists(distances[::-1])
+    assert np.array_equal(target.get_clusters_distances(), distances[::-1])
+    assert np.array_equal(target.get_union_distances(), get_union_of_distances(distances[::-1], 'smooth', [20.0]))
+
+
+def test_interpolation_distances_batch(tmp_path):
+    """ Tests the batch of interpolation distances against the distances of each vertex. """
+    mesh = Mesh.from_obj(os.path.join(DATA, 'distorted_v_closed_low_res.obj'))
+    mesh.update_default_vertex_attributes({'boundary': 0})
+    for vkey, value in [(0, 1), (50, 2), (100, 2), (150, 2)]:
+        mesh.vertex_attribute(vkey, 'boundary', value)
+    rng = np.random.default_rng(2)
+    target_low = CompoundTarget(mesh, 'boundary', 1, str(tmp_path), geodesics_method='heat_fast')
+    target_low.update_distances_lists(rng.uniform(0.0, 200.0, (1, mesh.number_of_vertices())))
+    target_high = CompoundTarget(mesh, 'boundary', 2, str(tmp_path), union_method='stairs', union_params=[80.0, 3],
+                                 geodesics_method='heat_fast')
+    target_high.update_distances_lists(rng.uniform(0.0, 200.0, (3, mesh.number_of_vertices())))
+
+    weights = [0.0, 0.001, 0.3, 0.997]
+    for target_HIGH, uneven in [(None, False), (target_high, False), (target_high, True)]:
+        if uneven:
+            target_high.weight_max_per_cluster = [0.5, 1.0, 0.8]
+        distances = get_interpolation_distances_batch(mesh, weights, target_low, target_HIGH)
+        assert distances.shape == (len(weights), mesh.number_of_vertices())
+        for row, weight in enumerate(weights):
+            expected = [assign_interpolation_distance_to_mesh_vertex(vkey, weight, target_low, target_HIGH)
+                        for vkey in mesh.vertices()]
+            assert distances[row].tolist() == expected
+
+
+def test_weights_intersecting_vkeys(tmp_path):
+    """ Tests the batched search of the weights that intersect vertices against a linear scan of each vertex. """
+    mesh = Mesh.from_obj(os.path.join(DATA, 'distorted_v_closed_low_res.obj'))
+    mesh.update_default_vertex_attributes({'boundary': 0})
+    for vkey, value in [(0, 1), (50, 2), (100, 2)]:
+        mesh.vertex_attribute(vkey, 'boundary', value)
+    target_low = CompoundTarget(mesh, 'boundary', 1, str(tmp_path), geodesics_method='heat_fast')
+    target_high = CompoundTarget(mesh, 'boundary', 2, str(tmp_path), union_method='smooth', union_params=[10.0],
+                                 geodesics_method='heat_fast')
+    splitter = MeshSplitter(mesh, target_low, target_high, str(tmp_path))
+
+    def linear_scan(vkey, threshold, resolution):
+        weight_list = get_weights_list(n=resolution, start=0.001, end=0.999)
+        for i, weight in enumerate(weight_list[:-1]):
+            current_d = assign_interpolation_distance_to_mesh_vertex(vkey, weight, target_low, target_high)
+            next_d = assign_interpolation_distance_to_mesh_vertex(vkey, weight_list[i + 1], target_low, target_high)
+            if abs(current_d) < abs(next_d) and current_d < threshold:
+                return weight
+        return None
+
+    expected = {vkey: linear_scan(vkey, 0.5, 2000) for vkey in range(0, mesh.number_of_vertices(), 5)}
+    found = [vkey for vkey in expected if expected[vkey] is not None]
+    missing = [vkey for vkey in expected if expected[vkey] is None]
+    assert found and missing
+    assert splitter.find_weights_intersecting_vkeys(found, 0.5, 2000) == [expected[vkey] for vkey in found]
+    assert splitter.find_weight_intersecting_vkey(found[-1], 0.5, 2000) == expected[found[-1]]
+    assert splitter.find_weights_intersecting_vkeys([], 0.5, 2000) == []
+    with pytest.raises(ValueError):
+        splitter.find_weights_intersecting_vkeys(found[:1] + missing[:1], 0.5, 2000)
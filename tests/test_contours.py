@@ -0,0 +1,180 @@
+import os
+import math
+import numpy as np
+from compas.datastructures import Mesh
+from compas.geometry import Plane, Point, Vector, Translation
+from compas_slicer.slicers.planar_slicing.planar_slicing import PlanarContours
+from compas_slicer.slicers.slice_utilities import ScalarFieldContours, UVContours
+from compas_slicer.slicers.slice_utilities import get_mesh_topology, invalidate_mesh_topology
+from compas_slicer.utilities import invalidate_mesh_caches
+from compas_slicer.slicers.slice_utilities import create_scalar_field_contours_multi_level
+from compas_slicer.slicers.slice_utilities import create_scalar_field_contours_parallel
+from compas_slicer.slicers.slice_utilities import create_uv_contours_multi_level
+
+DATA = os.path.join(os.path.dirname(__file__), 'tests_data')
+FILE = os.path.abspath(os.path.join(DATA, 'distorted_v_closed_low_res.obj'))
+
+compas_mesh = Mesh.from_obj(FILE)
+z = [compas_mesh.vertex_attribute(key, 'z') for key in compas_mesh.vertices()]
+min_z, max_z = min(z), max(z)
+
+
+def set_scalar_field(mesh, level):
+    for vkey, data in mesh.vertices(data=True):
+        data['scalar_field'] = data['z'] + 5.0 * math.sin(data['x'] * 0.1) - level
+
+
+def set_uv(mesh):
+    for vkey, data in mesh.vertices(data=True):
+        data['uv'] = ((data['z'] - min_z) / (max_z - min_z) * 10.0, 0.5 + math.atan2(data['y'], data['x']) / (2 * math.pi))
+
+
+def get_per_edge_contours(contours):
+    """ Disables the batched kernel, so that every edge is tested separately. """
+    contours.find_zero_crossings_batch = lambda vkeys, X, u, v: None
+    return contours
+
+
+def assert_same_intersections(contours_batch, contours_per_edge):
+    contours_batch.compute()
+    contours_per_edge.compute()
+    assert set(contours_batch.intersection_data) == set(contours_per_edge.intersection_data)
+    for edge in contours_batch.intersection_data:
+        assert np.allclose(contours_batch.intersection_data[edge], contours_per_edge.intersection_data[edge])
+    assert contours_batch.edge_to_index == contours_per_edge.edge_to_index
+
+
+def test_planar_contours_batch_matches_per_edge():
+    """ Tests that the batched kernel of PlanarContours finds the same intersections as the per-edge tests. """
+    for h in np.linspace(min_z, max_z, 7):
+        plane = Plane(Point(0, 0, h), Vector(0, 0, 1))
+        assert_same_intersections(PlanarContours(compas_mesh, plane),
+                                  get_per_edge_contours(PlanarContours(compas_mesh, plane)))
+
+
+def test_scalar_field_contours_batch_matches_per_edge():
+    """ Tests that the batched kernel of ScalarFieldContours finds the same intersections as the per-edge tests. """
+    mesh = compas_mesh.copy()
+    for level in np.linspace(min_z, max_z, 7):
+        set_scalar_field(mesh, level)
+        assert_same_intersections(ScalarFieldContours(mesh), get_per_edge_contours(ScalarFieldContours(mesh)))
+
+
+def test_uv_contours_batch_matches_per_edge():
+    """ Tests that the batched kernel of UVContours finds the same intersections as the per-edge tests. """
+    mesh = compas_mesh.copy()
+    set_uv(mesh)
+    for i in [0.05, 2, 5, 7.5]:
+        for p1, p2 in [((i, 0.0), (i, 1.0 - 1e-5)), ((i, 0.0), (i + 1.0, 1.0 - 1e-5))]:  # flat and spiral
+            assert_same_intersections(UVContours(mesh, p1, p2), get_per_edge_contours(UVContours(mesh, p1, p2)))
+
+
+def test_uv_contours_multi_level():
+    """ Tests that testing only the candidate edges of each uv line finds the same contours as testing all edges. """
+    mesh = compas_mesh.copy()
+    set_uv(mesh)
+    uv = np.array([mesh.vertex_attribute(vkey, 'uv') for vkey in mesh.vertices()])
+    for spiral in [False, True]:
+        lines = [((i, 0.0), (i + 1.0 if spiral else i, 1.0 - 1e-5)) for i in [0.05, 1, 2, 3.5, 5, 7.5, 9]]
+        for (p1, p2), contours in zip(lines, create_uv_contours_multi_level(mesh, uv, lines)):
+            contours_all_edges = UVContours(mesh, p1, p2)
+            contours_all_edges.compute()
+            assert len(contours.candidate_edge_indices()) < mesh.number_of_edges()
+            assert contours.sorted_edge_clusters == contours_all_edges.sorted_edge_clusters
+            assert contours.closed_paths_booleans == contours_all_edges.closed_paths_booleans
+
+
+def test_scalar_field_contours_from_array():
+    """ Tests that a scalar field given as an array with an iso_value gives the same contours as the attribute. """
+    mesh = compas_mesh.copy()
+    set_scalar_field(mesh, 0.0)
+    field = np.array([mesh.vertex_attribute(vkey, 'scalar_field') for vkey in mesh.vertices()])
+    for level in np.linspace(min_z, max_z, 5):
+        contours = ScalarFieldContours(mesh, scalar_field=field, iso_value=level)
+        set_scalar_field(mesh, level)
+        assert_same_intersections(contours, ScalarFieldContours(mesh))
+        assert_same_intersections(get_per_edge_contours(ScalarFieldContours(mesh, scalar_field=field, iso_value=level)),
+                                  ScalarFieldContours(mesh))
+
+
+def test_scalar_field_contours_multi_level():
+    """ Tests that the single-pass extraction finds the same contours as one ScalarFieldContours per level. """
+    mesh = compas_mesh.copy()
+    set_scalar_field(mesh, 0.0)
+    field = np.array([mesh.vertex_attribute(vkey, 'scalar_field') for vkey in mesh.vertices()])
+    levels = np.linspace(min_z, max_z, 9)[1:-1]
+
+    all_contours = create_scalar_field_contours_multi_level(mesh, field, levels)
+    assert len(all_contours) == len(levels)
+    for level, contours in zip(levels, all_contours):
+        set_scalar_field(mesh, level)
+        contours_single = ScalarFieldContours(mesh)
+        contours_single.compute()
+        assert set(contours.intersection_data) == set(contours_single.intersection_data)
+        assert len(contours.sorted_point_clusters) == len(contours_single.sorted_point_clusters)
+        for i in contours.sorted_point_clusters:
+            assert np.allclose(contours.sorted_point_clusters[i], contours_single.sorted_point_clusters[i])
+            assert contours.closed_paths_booleans[i] == contours_single.closed_paths_booleans[i]
+
+
+def test_scalar_field_contours_parallel():
+    """ Tests that the contours found on a process pool match the single-pass extraction, level by level. """
+    mesh = compas_mesh.copy()
+    set_scalar_field(mesh, 0.0)
+    field = np.array([mesh.vertex_attribute(vkey, 'scalar_field') for vkey in mesh.vertices()])
+    levels = list(np.linspace(min_z, max_z, 9)[1:-1])
+
+    all_contours_serial = create_scalar_field_contours_multi_level(mesh, field, levels)
+    all_contours_parallel = create_scalar_field_contours_parallel(mesh, field, levels, workers=2)
+    assert len(all_contours_parallel) == len(levels)
+    for contours_serial, contours_parallel in zip(all_contours_serial, all_contours_parallel):
+        assert contours_parallel.sorted_edge_clusters == contours_serial.sorted_edge_clusters
+        assert contours_parallel.closed_paths_booleans == contours_serial.closed_paths_booleans
+        for i in contours_serial.sorted_point_clusters:
+            assert np.allclose(contours_parallel.sorted_point_clusters[i], contours_serial.sorted_point_clusters[i])
+
+
+def test_mesh_topology_arrays():
+    """ Tests that the arrays of the MeshTopology are consistent with the mesh. """
+    topology = get_mesh_topology(compas_mesh)
+    assert topology.V.shape == (compas_mesh.number_of_vertices(), 3)
+    assert topology.F.shape == (compas_mesh.number_of_faces(), 3)
+    assert topology.E.shape == (compas_mesh.number_of_edges(), 2)
+    for i, (u, v) in enumerate(topology.edges):
+        assert topology.vkeys[topology.E[i, 0]] == u and topology.vkeys[topology.E[i, 1]] == v
+        faces = set(f for f in compas_mesh.edge_faces(u, v) if f is not None)
+        assert faces == set(topology.fkeys[f] for f in topology.edge_faces[i] if f >= 0)
+        for f in topology.edge_faces[i]:
+            if f >= 0:
+                assert i in topology.face_edges[f]
+
+
+def test_mesh_topology_cache():
+    """ Tests that the MeshTopology is only rebuilt when the mesh changes. """
+    mesh = compas_mesh.copy()
+    topology = get_mesh_topology(mesh)
+    assert get_mesh_topology(mesh) is topology
+    assert ScalarFieldContours(mesh).topology is topology
+
+    fkey = list(mesh.faces())[0]
+    mesh.delete_face(fkey)
+    assert get_mesh_topology(mesh) is not topology
+
+    topology = get_mesh_topology(mesh)
+    mesh.transform(Translation.from_vector([0.0, 0.0, 10.0]))
+    assert get_mesh_topology(mesh) is not topology
+    assert np.allclose(get_mesh_topology(mesh).V[:, 2], topology.V[:, 2] + 10.0)
+
+    topology = get_mesh_topology(mesh)
+    invalidate_mesh_topology(mesh)
+    assert get_mesh_topology(mesh) is not topology
+
+    # editing the coordinates of single vertices is marked with invalidate_mesh_caches
+    topology = get_mesh_topology(mesh)
+    mesh.vertex_attribute(topology.vkeys[1], 'z', 0.0)
+    invalidate_mesh_caches(mesh)
+    assert get_mesh_topology(mesh) is not topology and get_mesh_topology(mesh).V[1, 2] == 0.0
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,74 @@
+import os
+import numpy as np
+from compas.datastructures import Mesh
+from compas_slicer.pre_processing import CompoundTarget, GeodesicsCache, get_geodesics_cache_key
+
+HERE = os.path.dirname(__file__)
+DATA = os.path.join(HERE, 'tests_data')
+
+
+def create_mesh():
+    """ Loads a test mesh and marks its lowest vertices as the target. """
+    mesh = Mesh.from_obj(os.path.join(DATA, 'distorted_v_closed_low_res.obj'))
+    z_min = min(mesh.vertex_attribute(vkey, 'z') for vkey in mesh.vertices())
+    mesh.update_default_vertex_attributes({'boundary': 0})
+    for vkey in mesh.vertices():
+        if mesh.vertex_attribute(vkey, 'z') < z_min + 1e-3:
+            mesh.vertex_attribute(vkey, 'boundary', 1)
+    return mesh
+
+
+def test_geodesics_cache_key():
+    """ Tests that the key depends on the mesh, the set of sources and the method, but not on the sources order. """
+    mesh = create_mesh()
+    key = get_geodesics_cache_key(mesh, [3, 1, 2], 'exact_igl')
+    assert key == get_geodesics_cache_key(mesh, [1, 2, 3], 'exact_igl')
+    assert key != get_geodesics_cache_key(mesh, [1, 2], 'exact_igl')
+    assert key != get_geodesics_cache_key(mesh, [1, 2, 3], 'heat')
+    mesh.vertex_attribute(0, 'x', mesh.vertex_attribute(0, 'x') + 1e-9)
+    assert key != get_geodesics_cache_key(mesh, [1, 2, 3], 'exact_igl')
+
+
+def test_geodesics_cache_lru_eviction(tmp_path):
+    """ Tests that the least recently used fields are evicted when the cache exceeds its size. """
+    field = np.arange(100, dtype=np.float64)
+    cache = GeodesicsCache(str(tmp_path), max_size=3000)  # room for 3 fields of 928 bytes
+    assert cache.get('a') is None
+    for key in ['a', 'b', 'c']:
+        cache.put(key, field + len(key))
+        os.utime(cache.get_filepath(key), (0, {'a': 1, 'b': 2, 'c': 3}[key]))  # deterministic use times
+    assert len(cache.get_entries()) == 3
+
+    assert np.array_equal(cache.get('a'), field + 1)  # 'a' becomes the most recently used field
+    cache.put('d', field)
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None and cache.get('d') is not None
+
+    cache.clear()
+    assert len(cache.get_entries()) == 0
+
+
+def test_geodesics_cache_unreadable_files(tmp_path):
+    """ Tests that empty and truncated files are misses that are removed. """
+    cache = GeodesicsCache(str(tmp_path))
+    open(cache.get_filepath('empty'), 'wb').close()
+    cache.put('truncated', np.arange(100, dtype=np.float64))
+    with open(cache.get_filepath('truncated'), 'r+b') as f:
+        f.truncate(200)
+    for key in ['empty', 'truncated']:
+        assert cache.get(key) is None
+        assert not os.path.exists(cache.get_filepath(key))
+    assert len(os.listdir(str(tmp_path))) == 0  # no temporary files are left
+
+
+def test_compound_target_reads_geodesics_cache(tmp_path):
+    """ Tests that a CompoundTarget takes its distances from the cache instead of computing them. """
+    mesh = create_mesh()
+    cache = GeodesicsCache(str(tmp_path / 'cache'))
+    vkeys = [vkey for vkey, data in mesh.vertices(data=True) if data['boundary'] == 1]
+    distances = np.linspace(0.0, 1.0, mesh.number_of_vertices())
+    cache.put(get_geodesics_cache_key(mesh, vkeys, 'exact_igl'), distances)
+
+    target = CompoundTarget(mesh, 'boundary', 1, str(tmp_path), geodesics_method='exact_igl', geodesics_cache=cache)
+    assert target.number_of_boundaries == 1
+    assert np.array_equal(target.get_all_distances(), distances)
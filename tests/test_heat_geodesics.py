@@ -0,0 +1,106 @@
+import os
+import numpy as np
+from compas.datastructures import Mesh
+from compas.geometry import Scale
+from compas_slicer.pre_processing import CompoundTarget, GeodesicsCache, get_geodesics_cache_key, move_mesh_to_point
+from compas_slicer.pre_processing.preprocessing_utils.geodesics import GeodesicsSolver, HeatGeodesicsSolver, \
+    get_heat_geodesics_solver
+from compas_slicer.pre_processing.preprocessing_utils.gradient import get_per_vertex_divergence
+from compas_slicer.utilities import invalidate_mesh_caches
+
+HERE = os.path.dirname(__file__)
+DATA = os.path.join(HERE, 'tests_data')
+
+
+def create_mesh():
+    """ Loads a test mesh and marks its lowest vertices with boundary=1 and its highest with boundary=2. """
+    mesh = Mesh.from_obj(os.path.join(DATA, 'distorted_v_closed_low_res.obj'))
+    zs = [mesh.vertex_attribute(vkey, 'z') for vkey in mesh.vertices()]
+    mesh.update_default_vertex_attributes({'boundary': 0})
+    for vkey, z in zip(mesh.vertices(), zs):
+        if z < min(zs) + 1e-3:
+            mesh.vertex_attribute(vkey, 'boundary', 1)
+        elif z > max(zs) - 1e-3:
+            mesh.vertex_attribute(vkey, 'boundary', 2)
+    return mesh
+
+
+def test_heat_geodesics_solver_operators(tmp_path):
+    """ Tests the prefactored diffusion and the sparse divergence against the GeodesicsSolver. """
+    mesh = create_mesh()
+    solver = get_heat_geodesics_solver(mesh)
+    reference = GeodesicsSolver(mesh, str(tmp_path))
+    sources = [vkey for vkey, data in mesh.vertices(data=True) if data['boundary'] == 1]
+
+    assert np.allclose(solver.diffuse_heat(sources), reference.diffuse_heat(sources), rtol=0.0, atol=1e-12)
+
+    X = np.random.default_rng(0).uniform(-1.0, 1.0, (mesh.number_of_faces(), 3))
+    assert np.allclose(solver.D @ X.T.reshape(-1), -get_per_vertex_divergence(mesh, X, reference.cotans),
+                       rtol=0.0, atol=1e-12)
+
+
+def test_heat_geodesic_distances():
+    """ Tests that the distances are finite, 0 on the sources and grow away from them, and that the solver is rebuilt
+    when the mesh changes. """
+    mesh = create_mesh()
+    solver = get_heat_geodesics_solver(mesh)
+    assert get_heat_geodesics_solver(mesh) is solver
+    sources = [vkey for vkey, data in mesh.vertices(data=True) if data['boundary'] == 1]
+    distances = solver.get_geodesic_distances(sources)
+    zs = np.array([mesh.vertex_attribute(vkey, 'z') for vkey in mesh.vertices()])
+
+    assert not np.any(np.isnan(distances))
+    assert np.all(distances[sources] == 0.0) and np.all(distances >= 0.0)
+    assert np.corrcoef(distances, zs)[0, 1] > 0.95
+
+    move_mesh_to_point(mesh, [0.0, 0.0, 0.0])
+    assert get_heat_geodesics_solver(mesh) is not solver
+
+    # the solver of a mesh that is transformed in place is rebuilt with the new geometry
+    solver = get_heat_geodesics_solver(mesh)
+    mesh.transform(Scale.from_factors([2.0, 2.0, 2.0]))
+    assert get_heat_geodesics_solver(mesh) is not solver
+    expected = HeatGeodesicsSolver(mesh.copy()).get_geodesic_distances(sources)
+    assert np.array_equal(get_heat_geodesics_solver(mesh).get_geodesic_distances(sources), expected)
+
+    solver = get_heat_geodesics_solver(mesh)
+    invalidate_mesh_caches(mesh)
+    assert get_heat_geodesics_solver(mesh) is not solver
+
+
+def test_compound_targets_heat_fast(tmp_path):
+    """ Tests that the targets of a mesh share one solver and get the distances of their clusters. """
+    mesh = create_mesh()
+    solver = get_heat_geodesics_solver(mesh)
+    target_low = CompoundTarget(mesh, 'boundary', 1, str(tmp_path), geodesics_method='heat_fast')
+    target_high = CompoundTarget(mesh, 'boundary', 2, str(tmp_path), geodesics_method='heat_fast')
+    assert get_heat_geodesics_solver(mesh) is solver
+    for target in [target_low, target_high]:
+        expected = solver.get_geodesic_distances(target.clustered_vkeys[0])
+        assert np.allclose(target.get_all_distances(), expected, rtol=0.0, atol=0.0)
+
+
+def test_heat_geodesic_distances_batch(tmp_path):
+    """ Tests that the distance fields solved together are the same as the ones solved one by one. """
+    mesh = create_mesh()
+    solver = get_heat_geodesics_solver(mesh)
+    sources = [vkey for vkey, data in mesh.vertices(data=True) if data['boundary'] == 1]
+    sources_list = [sources, sources[:2], [vkey for vkey, data in mesh.vertices(data=True) if data['boundary'] == 2]]
+
+    distances = solver.get_geodesic_distances_batch(sources_list)
+    assert distances.shape == (3, mesh.number_of_vertices())
+    for row, vi_sources in enumerate(sources_list):
+        assert np.array_equal(distances[row], solver.get_geodesic_distances(vi_sources))
+
+    # a target with several clusters, some of them already in the cache
+    cache = GeodesicsCache(str(tmp_path / 'cache'))
+    for vkey in sources[:2]:
+        mesh.vertex_attribute(vkey, 'boundary', 3)
+    mesh.vertex_attribute(sources_list[2][0], 'boundary', 3)
+    cache.put(get_geodesics_cache_key(mesh, [sources_list[2][0]], 'heat_fast'), np.ones(mesh.number_of_vertices()))
+    target = CompoundTarget(mesh, 'boundary', 3, str(tmp_path), geodesics_method='heat_fast', geodesics_cache=cache)
+    assert target.number_of_boundaries == 2
+    for i, vkeys in enumerate(target.clustered_vkeys):
+        expected = 1.0 if len(vkeys) == 1 else solver.get_geodesic_distances(vkeys)
+        assert np.array_equal(np.array(target.get_all_clusters_distances_dict()[i]), expected * np.ones(target.VN))
+    assert len(cache.get_entries()) == 2
@@ -0,0 +1,133 @@
+import os
+import numpy as np
+from compas.datastructures import Mesh
+from compas.geometry import Point, Translation
+from compas_slicer.utilities import get_mesh_query, closest_points_on_triangles, pull_pts_to_mesh_faces
+from compas_slicer.utilities import get_vertex_locator, get_closest_mesh_vkey_to_pt, get_closest_mesh_vkeys_to_pts
+from compas_slicer.utilities import invalidate_mesh_caches, get_normal_of_path_on_xy_plane, \
+    get_normals_of_path_on_xy_plane
+from compas_slicer.utilities.mesh_query import MeshSignature
+from compas_slicer.geometry import Path
+from compas_slicer.pre_processing import move_mesh_to_point
+
+HERE = os.path.dirname(__file__)
+DATA = os.path.join(HERE, 'tests_data')
+
+
+def test_closest_points_on_triangles():
+    """ Tests the closest points on a triangle, in the regions of its face, edges and vertices. """
+    triangle = np.array([[0.0, 0.0, 0.0], [2.0, 0.0, 0.0], [0.0, 2.0, 0.0]])
+    points = np.array([[0.5, 0.5, 3.0],  # face
+                       [-1.0, -1.0, 1.0],  # vertex a
+                       [4.0, -1.0, 0.0],  # vertex b
+                       [-1.0, 5.0, 0.0],  # vertex c
+                       [1.0, -2.0, 0.0],  # edge ab
+                       [-3.0, 1.0, 0.0],  # edge ac
+                       [2.0, 2.0, -1.0]])  # edge bc
+    closest, bary = closest_points_on_triangles(points, np.repeat(triangle[None], len(points), axis=0))
+    expected = [[0.5, 0.5, 0.0], [0.0, 0.0, 0.0], [2.0, 0.0, 0.0], [0.0, 2.0, 0.0], [1.0, 0.0, 0.0],
+                [0.0, 1.0, 0.0], [1.0, 1.0, 0.0]]
+    assert np.allclose(closest, expected)
+    assert np.allclose(bary.sum(axis=1), 1.0) and np.all(bary >= 0.0)
+    assert np.allclose(np.dot(bary, triangle), closest)
+
+
+def test_mesh_query_brute_force():
+    """ Tests that the closest points found with the tree are the closest points on all the triangles. """
+    mesh = Mesh.from_obj(os.path.join(DATA, 'distorted_v_closed_low_res.obj'))
+    query = get_mesh_query(mesh)
+    assert get_mesh_query(mesh) is query
+
+    rng = np.random.default_rng(0)
+    lo, hi = query.V.min(axis=0), query.V.max(axis=0)
+    points = rng.uniform(lo - 10.0, hi + 10.0, (200, 3))
+    face_indices, closest, bary = query.closest_points(points, chunk_size=64)
+
+    for point, fi, pt in zip(points, face_indices, closest):
+        all_closest, _ = closest_points_on_triangles(np.repeat(point[None], query.number_of_faces, axis=0),
+                                                     query.triangles)
+        d = np.linalg.norm(all_closest - point, axis=1)
+        assert np.isclose(np.linalg.norm(pt - point), d.min())
+        assert np.isclose(d[fi], d.min())
+    assert np.allclose(np.einsum('ij,ijk->ik', bary, query.triangles[face_indices]), closest)
+
+    closest_fks, projected_pts = pull_pts_to_mesh_faces(mesh, points)
+    assert closest_fks == query.fkeys[face_indices].tolist()
+    assert np.allclose(projected_pts, closest)
+
+
+def test_mesh_query_after_transform():
+    """ Tests that the points are pulled to the new faces of a mesh that was transformed in place, and that the query
+    is rebuilt after invalidate_mesh_caches. """
+    mesh = Mesh.from_obj(os.path.join(DATA, 'distorted_v_closed_low_res.obj'))
+    query = get_mesh_query(mesh)
+    mesh.transform(Translation.from_vector([0.0, 0.0, 50.0]))
+    assert get_mesh_query(mesh) is not query
+
+    points = query.V[:20] + np.array([0.0, 0.0, 50.0])
+    _, projected_pts = pull_pts_to_mesh_faces(mesh, points)
+    assert np.allclose(projected_pts, points)
+
+    query = get_mesh_query(mesh)
+    invalidate_mesh_caches(mesh)
+    assert get_mesh_query(mesh) is not query
+
+
+def test_vertex_locator():
+    """ Tests the closest vertices of the locator, and that it is rebuilt after the mesh is moved. """
+    mesh = Mesh.from_obj(os.path.join(DATA, 'distorted_v_closed_low_res.obj'))
+    locator = get_vertex_locator(mesh)
+    assert get_vertex_locator(mesh) is locator
+
+    rng = np.random.default_rng(1)
+    points = rng.uniform(locator.V.min(axis=0), locator.V.max(axis=0), (50, 3))
+    vkeys, distances = locator.closest_vertices(points, k=3)
+    for point, keys, ds in zip(points, vkeys, distances):
+        d = np.linalg.norm(locator.V - point, axis=1)
+        assert np.allclose(ds, np.sort(d)[:3])
+        assert keys[0] == get_closest_mesh_vkey_to_pt(mesh, Point(*point))
+    assert np.array_equal(get_closest_mesh_vkeys_to_pts(mesh, points), vkeys[:, 0])
+
+    move_mesh_to_point(mesh, Point(100.0, 0.0, 0.0))
+    moved = get_vertex_locator(mesh)
+    assert moved is not locator
+    vkey = next(iter(mesh.vertices()))
+    assert get_closest_mesh_vkey_to_pt(mesh, Point(*mesh.vertex_coordinates(vkey))) == vkey
+
+    mesh.transform(Translation.from_vector([0.0, 0.0, 50.0]))
+    assert get_vertex_locator(mesh) is not moved
+    assert get_closest_mesh_vkey_to_pt(mesh, Point(*mesh.vertex_coordinates(vkey))) == vkey
+    assert np.allclose(get_vertex_locator(mesh).V, moved.V + np.array([0.0, 0.0, 50.0]))
+
+    locator = get_vertex_locator(mesh)
+    invalidate_mesh_caches(mesh)
+    assert get_vertex_locator(mesh) is not locator
+
+
+def test_mesh_signature():
+    """ Tests that the signature detects added vertices, transformations and invalidate_mesh_caches. """
+    mesh = Mesh.from_obj(os.path.join(DATA, 'distorted_v_closed_low_res.obj'))
+    signature = MeshSignature(mesh)
+    assert signature.matches(mesh) and len(signature.samples) == 32
+
+    mesh.transform(Translation.from_vector([1e-9, 0.0, 0.0]))
+    assert not signature.matches(mesh)
+
+    signature = MeshSignature(mesh)
+    invalidate_mesh_caches(mesh)
+    assert not signature.matches(mesh)
+
+    signature = MeshSignature(mesh)
+    mesh.add_vertex(x=0.0, y=0.0, z=0.0)
+    assert not signature.matches(mesh)
+
+
+def test_normals_of_path_on_xy_plane():
+    """ Tests the normals of whole paths against the normals of each point, also where the neighbors cancel out. """
+    mesh = Mesh.from_obj(os.path.join(DATA, 'distorted_v_closed_low_res.obj'))
+    coords = [[0.0, 0.0, 10.0], [10.0, 0.0, 10.0], [0.0, 0.0, 10.0], [5.0, 5.0, 10.0], [8.0, 2.0, 11.0]]
+    for path in [Path.from_coords(coords, is_closed=False), Path.from_coords(coords, is_closed=True),
+                 Path([Point(*pt) for pt in coords[:2]], is_closed=False)]:
+        normals = get_normals_of_path_on_xy_plane(path, mesh)
+        assert [list(normal) for normal in normals] == \
+            [list(get_normal_of_path_on_xy_plane(k, point, path, mesh)) for k, point in enumerate(path.points)]
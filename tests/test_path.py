@@ -0,0 +1,33 @@
+import numpy as np
+from compas.geometry import Point
+from compas_slicer.geometry import Path
+
+
+def test_path_from_coords():
+    """ Tests that a path backed by an array creates its points lazily, and that they can be modified in place. """
+    coords = np.array([[0.0, 0.0, 1.0], [1.0, 0.0, 1.0], [1.0, 1.0, 1.0], [0.0, 0.0, 1.0]])
+    path = Path.from_coords(coords, is_closed=True)
+    assert path.number_of_points == 4
+    assert path.coords is not None and np.allclose(path.coords, coords)
+
+    points = path.points
+    assert all(isinstance(pt, Point) for pt in points)
+    assert np.allclose(np.array(points), coords)
+
+    points[0][2] = 5.0
+    points.append(Point(2.0, 2.0, 2.0))
+    assert path.number_of_points == 5
+    assert path.coords[0, 2] == 5.0
+    assert np.allclose(path.coords[-1], [2.0, 2.0, 2.0])
+
+
+def test_path_data_round_trip():
+    """ Tests that to_data / from_data round-trip both points-backed and array-backed paths. """
+    points = [Point(0.0, 0.0, 0.0), Point(1.0, 2.0, 3.0), Point(4.0, 5.0, 6.0)]
+    for path in [Path(points, is_closed=False), Path.from_coords(np.array(points), is_closed=False)]:
+        data = path.to_data()
+        assert data['points'][1] == [1.0, 2.0, 3.0]
+        other = Path.from_data(data)
+        assert other.is_closed == path.is_closed
+        assert np.allclose(other.coords, path.coords)
+        assert other.to_data() == data
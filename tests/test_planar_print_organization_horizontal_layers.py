@@ -127,6 +127,26 @@ def test_planar_add_safety_printpoints_for_horizontal_layers():
             "Wrong number of safety points added on file : " + str(filename)
 
 
+def test_planar_create_printpoints_up_vectors():
+    """ Tests that the printpoints created at once have the same up vectors as get_printpoint_up_vector. """
+
+    for filename in stl_to_test:
+        slicer, print_organizer = create_setup(filename)
+        assert print_organizer.number_of_printpoints == slicer.number_of_points
+
+        pp_dict = print_organizer.printpoints_dict
+        for i, layer in enumerate(slicer.layers):
+            for j, path in enumerate(layer.paths):
+                for k, pp in enumerate(pp_dict['layer_%d' % i]['path_%d' % j]):
+                    assert pp.layer_height == slicer.layer_height
+                    if layer.is_brim or layer.is_raft:
+                        assert list(pp.up_vector) == [0.0, 0.0, 1.0]
+                    else:
+                        up_vector = print_organizer.get_printpoint_up_vector(path, k, pp.mesh_normal)
+                        assert np.allclose(pp.up_vector, up_vector, rtol=0.0, atol=1e-12), \
+                            "Wrong up vector on layer %d, path %d, point %d. \nFilename: %s" % (i, j, k, filename)
+
+
 def test_planar_set_linear_velocity_constant_for_horizontal_layers():
     """ Tests set_linear_velocity on planar slicer, with constant value. """
     #
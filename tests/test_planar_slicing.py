@@ -1,8 +1,13 @@
 from compas_slicer.geometry import Layer
 from compas_slicer.geometry import Path
 import os
+import numpy as np
 from compas.datastructures import Mesh
 from compas_slicer.slicers import PlanarSlicer
+from compas_slicer.slicers.slice_utilities import EdgeIntervalIndex
+from compas_slicer.slicers.planar_slicing.planar_slicing import PlanarContours
+from compas.geometry import Plane, Point, Vector, Translation, intersection_segment_plane
+from compas_slicer.slicers.slice_utilities import get_mesh_topology, find_level_crossings
 
 DATA = os.path.join(os.path.dirname(__file__), 'tests_data')
 FILE = os.path.abspath(os.path.join(DATA, 'cylinder.obj'))
@@ -32,6 +37,132 @@ def test_planar_slicing_success():
                                                     "open. It should be closed "
 
 
+def test_planar_slicing_numpy_matches_default():
+    """ Tests that the numpy planar slicing backend produces the same paths as the default one. """
+    slicer_default = PlanarSlicer(compas_mesh, slicer_type="default", layer_height=layer_height)
+    slicer_default.generate_paths()
+    slicer_numpy = PlanarSlicer(compas_mesh, slicer_type="numpy", layer_height=layer_height)
+    slicer_numpy.generate_paths()
+
+    assert len(slicer_numpy.layers) == len(slicer_default.layers), "Wrong number of generated layers"
+    for layer_default, layer_numpy in zip(slicer_default.layers, slicer_numpy.layers):
+        assert isinstance(layer_numpy, Layer)
+        assert len(layer_numpy.paths) == len(layer_default.paths), "Wrong number of paths in layer"
+        for path_default, path_numpy in zip(layer_default.paths, layer_numpy.paths):
+            assert isinstance(path_numpy, Path)
+            assert path_numpy.is_closed == path_default.is_closed
+            assert len(path_numpy.points) == len(path_default.points)
+            assert np.allclose(np.sort(np.array(path_numpy.points), axis=0),
+                               np.sort(np.array(path_default.points), axis=0))
+
+
+def test_planar_slicing_workers_matches_serial():
+    """ Tests that sharding the planes across a process pool returns the same layers, in the same order. """
+    slicer_serial = PlanarSlicer(compas_mesh, layer_height=layer_height)
+    slicer_serial.generate_paths()
+    slicer_parallel = PlanarSlicer(compas_mesh, layer_height=layer_height, workers=2)
+    slicer_parallel.generate_paths()
+
+    assert len(slicer_parallel.layers) == len(slicer_serial.layers), "Wrong number of generated layers"
+    for layer_serial, layer_parallel in zip(slicer_serial.layers, slicer_parallel.layers):
+        assert len(layer_parallel.paths) == len(layer_serial.paths), "Wrong number of paths in layer"
+        for path_serial, path_parallel in zip(layer_serial.paths, layer_parallel.paths):
+            assert path_parallel.is_closed == path_serial.is_closed
+            assert np.allclose(np.array(path_parallel.points), np.array(path_serial.points))
+
+
+def test_edge_interval_index_sweep():
+    """ Tests that the edge interval index returns exactly the edges that span each plane. """
+    edge_index = EdgeIntervalIndex(compas_mesh)
+    levels = [min_z + i * layer_height for i in range(no_of_layers)]
+    for level, edges in zip(levels, edge_index.sweep(levels)):
+        expected = []
+        for u, v in compas_mesh.edges():
+            zs = [compas_mesh.vertex_attribute(u, 'z'), compas_mesh.vertex_attribute(v, 'z')]
+            if min(zs) <= level < max(zs):
+                expected.append((u, v))
+        assert edges == expected
+        assert edge_index.edges_spanning(level) == expected
+
+
+def test_planar_slicing_reuses_edge_index():
+    """ Tests that re-slicing with a different layer height reuses the edge interval index. """
+    slicer = PlanarSlicer(compas_mesh, slicer_type="default", layer_height=layer_height)
+    slicer.generate_paths()
+    edge_index = slicer.edge_index
+    assert isinstance(edge_index, EdgeIntervalIndex)
+
+    slicer.layer_height = 2 * layer_height
+    slicer.generate_paths()
+    assert slicer.edge_index is edge_index
+    assert len(slicer.layers) == int(d / (2 * layer_height)) + 1, "Wrong number of generated layers"
+
+
+def test_planar_slicing_after_transform():
+    """ Tests that slicing a mesh that was transformed in place uses its new vertex coordinates. """
+    mesh = compas_mesh.copy()
+    slicer = PlanarSlicer(mesh, slicer_type="default", layer_height=layer_height)
+    slicer.slice_model()
+    mesh.transform(Translation.from_vector([0.0, 0.0, 1000.0]))
+
+    slicer = PlanarSlicer(mesh, slicer_type="default", layer_height=layer_height)
+    slicer.slice_model()
+    assert len(slicer.layers) == no_of_layers, "Wrong number of generated layers"
+    assert all(len(layer.paths) == 1 for layer in slicer.layers)
+    assert abs(slicer.layers[0].paths[0].points[0][2] - (min_z + 1000.0)) < 1e-6
+
+
+def test_planar_crossings_near_flat_edges():
+    """ Tests that all the planar backends skip the edges that are almost parallel to the planes. """
+    mesh = compas_mesh.copy()
+    h = min_z + 2 * layer_height  # one of the planes of the slicer
+    # move two neighboring vertices just below and above a plane
+    u, v = next((u, v) for u, v in mesh.edges() if abs(mesh.vertex_attribute(u, 'z') - mesh.vertex_attribute(v, 'z')) > 1)
+    mesh.vertex_attribute(u, 'z', h - 3e-7)
+    mesh.vertex_attribute(v, 'z', h + 3e-7)
+    topology = get_mesh_topology(mesh)
+    edge = topology.edges.index((u, v))
+
+    edge_ids, _, _ = find_level_crossings(topology.V[:, 2], topology.E, [h], include_end=False)
+    assert edge not in edge_ids
+    contours = PlanarContours(mesh, Plane(Point(0, 0, h), Vector(0, 0, 1)))
+    contours.find_intersections()
+    assert (u, v) not in contours.intersection_data and len(contours.intersection_data) == len(edge_ids)
+    assert intersection_segment_plane((mesh.vertex_coordinates(u), mesh.vertex_coordinates(v)),
+                                      contours.plane) is None
+
+    layers = {}
+    for slicer_type, workers in [("default", None), ("numpy", None), ("default", 2)]:
+        slicer = PlanarSlicer(mesh, slicer_type=slicer_type, layer_height=layer_height, workers=workers)
+        slicer.slice_model()
+        layers[(slicer_type, workers)] = [[path.coords for path in layer.paths] for layer in slicer.layers]
+    for other in [layers[("numpy", None)], layers[("default", 2)]]:
+        assert len(other) == len(layers[("default", None)])
+        for paths, other_paths in zip(layers[("default", None)], other):
+            assert len(paths) == len(other_paths)
+            for coords, other_coords in zip(paths, other_paths):
+                assert len(coords) == len(other_coords)
+                assert np.allclose(np.sort(coords, axis=0), np.sort(other_coords, axis=0))
+
+
+def test_contours_stitching_matches_graph():
+    """ Tests that chaining the intersections along the mesh faces gives the same paths as the networkx graph. """
+    for i in range(no_of_layers):
+        plane = Plane(Point(0, 0, min_z + i * layer_height), Vector(0, 0, 1))
+        contours_graph = PlanarContours(compas_mesh, plane)
+        contours_graph.compute(use_graph=True)
+        contours = PlanarContours(compas_mesh, plane)
+        contours.compute()
+
+        assert len(contours.sorted_edge_clusters) == len(contours_graph.sorted_edge_clusters)
+        for key in contours.sorted_edge_clusters:
+            edges, edges_graph = contours.sorted_edge_clusters[key], contours_graph.sorted_edge_clusters[key]
+            assert set(edges) == set(edges_graph)
+            assert contours.closed_paths_booleans[key] == contours_graph.closed_paths_booleans[key]
+            for e1, e2 in zip(edges[:-1], edges[1:]):  # consecutive intersected edges share a vertex
+                assert e1[0] in e2 or e1[1] in e2
+
+
 # test inclined cylinder. How many paths open, how many paths closed
 if __name__ == '__main__':
     pass
@@ -0,0 +1,28 @@
+import numpy as np
+from compas.geometry import Point
+from compas_slicer.utilities import PointCloudIndex
+from compas_slicer.pre_processing.preprocessing_utils.topological_sorting import are_neighboring_point_clouds
+
+
+def test_point_cloud_index():
+    """ Tests the nearest distances of a PointCloudIndex against the distances to all the points of the cloud. """
+    rng = np.random.default_rng(0)
+    cloud = rng.uniform(0.0, 10.0, (100, 3))
+    points = rng.uniform(-2.0, 12.0, (40, 3))
+    index = PointCloudIndex([Point(*pt) for pt in cloud])
+
+    d = np.min(np.linalg.norm(cloud[None, :, :] - points[:, None, :], axis=2), axis=1)
+    assert np.allclose(index.nearest_distances(points), d)
+    assert np.allclose(index.min_max_nearest_distance(points), (d.min(), d.max()))
+    assert index.count_within(points, 1.5) == np.count_nonzero(d < 1.5)
+    assert index.min_max_nearest_distance(np.zeros((0, 3))) == (np.inf, 0.0)
+
+
+def test_are_neighboring_point_clouds():
+    """ Tests that two parallel circles are neighbors only if they are closer than the threshold. """
+    t = np.linspace(0.0, 2 * np.pi, 50, endpoint=False)
+    circle = np.stack([np.cos(t), np.sin(t), np.zeros(len(t))], axis=1) * 10.0
+    lifted = [Point(*pt) for pt in circle + (0.0, 0.0, 2.0)]
+    assert are_neighboring_point_clouds(lifted, circle, 2.5)
+    assert are_neighboring_point_clouds(lifted, PointCloudIndex(circle), 2.5)
+    assert not are_neighboring_point_clouds(lifted, circle, 1.5)
@@ -0,0 +1,56 @@
+import copy
+import pytest
+from compas.geometry import Point, Vector, Frame
+from compas_slicer.geometry import PrintPoint
+from compas_slicer.print_organization.print_organization_utilities.safety_printpoints import create_safety_printpoint
+
+
+def test_print_point_lazy_frame():
+    """ Tests that the frame is computed lazily and recomputed when pt, mesh_normal or up_vector are set. """
+    ppt = PrintPoint(pt=Point(1.0, 2.0, 3.0), layer_height=1.0, mesh_normal=Vector(0.0, 1.0, 0.0))
+    frame = ppt.frame
+    assert frame is ppt.frame
+    assert frame.xaxis == Vector(-1.0, 0.0, 0.0) and frame.point == Point(1.0, 2.0, 3.0)
+
+    ppt.up_vector = Vector(0.0, 0.0, -1.0)
+    assert ppt.frame is not frame
+    assert ppt.frame.xaxis == Vector(1.0, 0.0, 0.0)
+
+    ppt.pt = Point(0.0, 0.0, 10.0)
+    assert ppt.frame.point == Point(0.0, 0.0, 10.0)
+
+    ppt.mesh_normal = Vector(1.0, 0.0, 0.0)
+    assert ppt.frame.yaxis == Vector(1.0, 0.0, 0.0)
+
+    custom_frame = Frame.worldXY()
+    ppt.frame = custom_frame
+    assert ppt.frame is custom_frame
+
+
+def test_print_point_slots():
+    """ Tests that printpoints have no __dict__, and that they can be copied and serialized. """
+    ppt = PrintPoint(pt=Point(1.0, 2.0, 3.0), layer_height=1.0, mesh_normal=Vector(0.0, 1.0, 0.0))
+    assert not hasattr(ppt, '__dict__')
+    with pytest.raises(AttributeError):
+        ppt.some_attribute = 1.0
+
+    ppt.attributes['a'] = 1.0
+    other = copy.deepcopy(ppt)
+    assert other.attributes == {'a': 1.0} and other.pt == ppt.pt and other.frame == ppt.frame
+    assert ppt.to_data()['frame'] == ppt.frame.to_data()
+
+
+def test_safety_printpoint_frame():
+    """ Tests that a safety printpoint keeps the orientation of a frame that was set explicitly. """
+    ppt = PrintPoint(pt=Point(1.0, 2.0, 3.0), layer_height=1.0, mesh_normal=Vector(0.0, 1.0, 0.0))
+    ppt.frame = Frame(Point(1.0, 2.0, 3.0), Vector(0.0, 0.0, 1.0), Vector(1.0, 0.0, 0.0))
+    safety_ppt = create_safety_printpoint(ppt, z_hop=10.0, extruder_toggle=False)
+    assert safety_ppt.pt == Point(1.0, 2.0, 13.0) and safety_ppt.extruder_toggle is False
+    assert safety_ppt.frame.point == Point(1.0, 2.0, 13.0)
+    assert safety_ppt.frame.xaxis == Vector(0.0, 0.0, 1.0) and safety_ppt.frame.yaxis == Vector(1.0, 0.0, 0.0)
+    assert ppt.frame.point == Point(1.0, 2.0, 3.0)
+
+    # without an explicit frame, the frame is the one of the printpoint at the new point
+    ppt = PrintPoint(pt=Point(1.0, 2.0, 3.0), layer_height=1.0, mesh_normal=Vector(0.0, 1.0, 0.0))
+    safety_ppt = create_safety_printpoint(ppt, z_hop=10.0, extruder_toggle=False)
+    assert safety_ppt.frame.point == Point(1.0, 2.0, 13.0) and safety_ppt.frame.xaxis == ppt.frame.xaxis
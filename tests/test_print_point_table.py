@@ -0,0 +1,99 @@
+import os
+import numpy as np
+from compas.datastructures import Mesh
+from compas_slicer.geometry import PrintPointTable, get_frames_axes
+from compas_slicer.slicers import PlanarSlicer
+from compas_slicer.post_processing import generate_brim
+from compas_slicer.print_organization import PlanarPrintOrganizer
+from compas_slicer.print_organization import set_extruder_toggle
+from compas_slicer.print_organization import add_safety_printpoints
+from compas_slicer.print_organization import set_linear_velocity_constant
+from compas_slicer.print_organization import set_blend_radius
+from compas_slicer.print_organization import set_wait_time_based_on_extruder_toggle
+from compas_slicer.print_organization.print_organization_utilities.data_smoothing import \
+    smooth_printpoints_layer_heights
+
+HERE = os.path.dirname(__file__)
+DATA = os.path.join(HERE, 'tests_data')
+
+
+def create_setup():
+    """ Slices a test mesh and returns the slicer and a print organizer with its printpoints. """
+    compas_mesh = Mesh.from_obj(os.path.join(DATA, 'distorted_v_closed_low_res.obj'))
+    slicer = PlanarSlicer(compas_mesh, slicer_type="default", layer_height=20)
+    slicer.slice_model()
+    generate_brim(slicer, layer_width=3.0, number_of_brim_offsets=2)
+    print_organizer = PlanarPrintOrganizer(slicer)
+    print_organizer.create_printpoints()
+    return slicer, print_organizer
+
+
+def test_print_point_table_round_trip():
+    """ Tests that the printpoints dict is converted to a table and back without changes. """
+    _, print_organizer = create_setup()
+    data = print_organizer.output_printpoints_dict()
+    nested = print_organizer.output_nested_printpoints_dict()
+
+    table = PrintPointTable.from_printpoints_dict(print_organizer.printpoints_dict)
+    assert table.number_of_printpoints == print_organizer.number_of_printpoints
+    assert table.number_of_layers == print_organizer.number_of_layers
+    assert table.number_of_paths == print_organizer.number_of_paths
+
+    print_organizer.printpoints_table = table
+    assert print_organizer.is_backed_by_table
+    assert print_organizer.output_printpoints_dict() == data
+    assert print_organizer.output_nested_printpoints_dict() == nested
+
+    print_organizer.printpoints_dict  # converts back to PrintPoints
+    assert not print_organizer.is_backed_by_table
+    assert print_organizer.output_printpoints_dict() == data
+
+
+def test_print_point_table_frames():
+    """ Tests that the vectorized frames are the same as the frames of the PrintPoints. """
+    _, print_organizer = create_setup()
+    ppts = list(print_organizer.printpoints_iterator())
+    ppts[0].mesh_normal = ppts[0].up_vector  # co-linear vectors
+    xaxes, yaxes = get_frames_axes(np.array([ppt.up_vector for ppt in ppts]),
+                                   np.array([ppt.mesh_normal for ppt in ppts]))
+    assert np.allclose(xaxes, np.array([ppt.frame.xaxis for ppt in ppts]), rtol=0.0, atol=1e-12)
+    assert np.allclose(yaxes, np.array([ppt.frame.yaxis for ppt in ppts]), rtol=0.0, atol=1e-12)
+
+
+def test_print_point_table_utilities():
+    """ Tests that the print organization utilities give the same results on a table and on PrintPoints. """
+    results = []
+    for use_table in [False, True]:
+        slicer, print_organizer = create_setup()
+        if not use_table:
+            print_organizer.printpoints_dict  # switches the organizer to PrintPoints
+        set_extruder_toggle(print_organizer, slicer)
+        set_wait_time_based_on_extruder_toggle(print_organizer, 'wait_before_and_after_extrusion', wait_time=0.5)
+        add_safety_printpoints(print_organizer, z_hop=10.0)
+        set_linear_velocity_constant(print_organizer, v=25.0)
+        set_blend_radius(print_organizer, d_fillet=10.0)
+        smooth_printpoints_layer_heights(print_organizer, iterations=3, strength=0.5)
+        assert print_organizer.is_backed_by_table == use_table
+
+        gcode = print_organizer.output_gcode({}).split('\n')
+        results.append((print_organizer.number_of_printpoints, print_organizer.total_length_of_paths,
+                        print_organizer.total_print_time, print_organizer.output_printpoints_dict(),
+                        [line for line in gcode if not line.startswith(';generated')]))
+    assert results[0] == results[1]
+
+
+def test_print_point_table_remove_duplicate_points():
+    """ Tests that remove_duplicate_points removes the same points from a table and from PrintPoints. """
+    results = []
+    for use_table in [False, True]:
+        _, print_organizer = create_setup()
+        path = print_organizer.printpoints_dict['layer_3']['path_0']
+        path[4].pt = path[5].pt.copy()
+        number_of_printpoints = print_organizer.number_of_printpoints
+        if use_table:
+            print_organizer.printpoints_table
+        assert print_organizer.is_backed_by_table == use_table
+        print_organizer.remove_duplicate_points()
+        assert print_organizer.number_of_printpoints < number_of_printpoints
+        results.append(print_organizer.output_printpoints_dict())
+    assert results[0] == results[1]
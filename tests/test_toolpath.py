@@ -0,0 +1,52 @@
+import os
+import numpy as np
+from compas.datastructures import Mesh
+from compas_slicer.slicers import PlanarSlicer
+from compas_slicer.geometry import Toolpath, Layer, VerticalLayer
+
+DATA = os.path.join(os.path.dirname(__file__), 'tests_data')
+FILE = os.path.abspath(os.path.join(DATA, 'cylinder.obj'))
+compas_mesh = Mesh.from_obj(os.path.join(DATA, FILE))
+
+
+def test_toolpath_round_trip():
+    """ Tests that the layers of a slicer are converted to a Toolpath and back without changes. """
+    slicer = PlanarSlicer(compas_mesh, slicer_type="default", layer_height=20)
+    slicer.slice_model()
+    slicer.layers[0].is_brim = True
+    slicer.layers[0].number_of_brim_offsets = 2
+
+    toolpath = slicer.to_toolpath()
+    assert toolpath.number_of_points == slicer.number_of_points
+    assert toolpath.number_of_paths == slicer.number_of_paths
+    assert toolpath.number_of_layers == slicer.number_of_layers
+    assert np.allclose(toolpath.layer_z_bounds, [layer.min_max_z_height for layer in slicer.layers])
+    assert toolpath.is_brim[0] and not toolpath.is_brim[-1]
+
+    other = Toolpath.from_data(toolpath.to_data())
+    layers = slicer.layers
+    slicer.from_toolpath(other)
+    assert slicer.layer_height == 20
+    assert slicer.layers[0].is_brim and slicer.layers[0].number_of_brim_offsets == 2
+    for layer, other_layer in zip(layers, slicer.layers):
+        assert type(other_layer) is Layer
+        for path, other_path in zip(layer.paths, other_layer.paths):
+            assert path.is_closed == other_path.is_closed
+            assert np.allclose(path.coords, other_path.coords)
+
+
+def test_toolpath_vertical_layers():
+    """ Tests that vertical layers keep their ids, and that empty layers are supported. """
+    toolpath = Toolpath(coords=np.arange(15, dtype=float).reshape((5, 3)), path_offsets=[0, 2, 5],
+                        layer_offsets=[0, 1, 1, 2], is_closed=[False, True], vertical_layer_id=[3, 4])
+    assert toolpath.number_of_paths == (2, 1, 1)
+    assert repr(toolpath) == "<Toolpath with 3 layers, 2 paths and 5 points>"
+    assert np.allclose(toolpath.bounding_box[0], [0, 1, 2]) and np.allclose(toolpath.bounding_box[1], [12, 13, 14])
+    assert np.isnan(toolpath.layer_z_bounds[1]).all()
+    assert np.allclose(toolpath.layer_z_bounds[[0, 2]], [[2, 5], [8, 14]])
+
+    layers = toolpath.to_layers()
+    assert [type(layer) for layer in layers] == [VerticalLayer, Layer, VerticalLayer]
+    assert layers[0].id == 3 and layers[2].id == 4
+    assert np.allclose(layers[2].head_centroid, [9, 10, 11])
+    assert Toolpath.from_layers(layers).vertical_layer_id.tolist() == [3, 4]
@@ -0,0 +1,135 @@
+import itertools
+import numpy as np
+from compas.datastructures import Mesh
+from compas_slicer.geometry import Path, VerticalLayer
+from compas_slicer.pre_processing.preprocessing_utils.topological_sorting import DirectedGraph, MeshDirectedGraph, \
+    SegmentsDirectedGraph, get_true_mesh_adjacencies, is_true_mesh_adjacency
+
+
+def create_strip_mesh(x0, x1, y0, y1, n, left, right):
+    """ Creates a grid mesh on [x0, x1] x [y0, y1], whose left and right columns of vertices get the given
+    (attribute name, value) pairs. """
+    mesh = Mesh.from_vertices_and_faces(*grid_vertices_and_faces(x0, x1, y0, y1, n))
+    mesh.update_default_vertex_attributes({'cut': 0, 'boundary': 0})
+    for vkey in mesh.vertices():
+        x = mesh.vertex_attribute(vkey, 'x')
+        for (name, value), x_side in [(left, x0), (right, x1)]:
+            if abs(x - x_side) < 1e-9 and name is not None:
+                mesh.vertex_attribute(vkey, name, value)
+    return mesh
+
+
+def grid_vertices_and_faces(x0, x1, y0, y1, n):
+    xs, ys = np.linspace(x0, x1, n), np.linspace(y0, y1, n)
+    vertices = [[x, y, 0.0] for y in ys for x in xs]
+    faces = [[j * n + i, j * n + i + 1, (j + 1) * n + i + 1, (j + 1) * n + i] for j in range(n - 1)
+             for i in range(n - 1)]
+    return vertices, faces
+
+
+def create_split_meshes():
+    """ Four strips of a split mesh, the first lies on the build platform, the last one ends the print. Strip 2 only
+    touches strip 1 in two vertices, which is not a true adjacency. """
+    meshes = [create_strip_mesh(0.0, 10.0, 0.0, 10.0, 6, ('boundary', 1), ('cut', 1)),
+              create_strip_mesh(10.0, 20.0, 0.0, 10.0, 6, ('cut', 1), ('cut', 2)),
+              create_strip_mesh(20.0, 30.0, 8.0, 10.0, 2, ('cut', 2), (None, 0)),
+              create_strip_mesh(20.0, 30.0, 0.0, 10.0, 6, ('cut', 2), ('boundary', 2))]
+    # the shared vertices are not exactly on the same positions
+    rng = np.random.default_rng(0)
+    for mesh in meshes:
+        for vkey in mesh.vertices():
+            mesh.vertex_attribute(vkey, 'y', mesh.vertex_attribute(vkey, 'y') + rng.uniform(-1e-4, 1e-4))
+    return meshes
+
+
+def test_true_mesh_adjacencies():
+    """ Tests that the hashed adjacencies are the same as the ones of the pairwise comparison. """
+    meshes = create_split_meshes()
+    adjacencies = get_true_mesh_adjacencies(meshes)
+    expected = {(i, j) for i, j in itertools.permutations(range(len(meshes)), 2)
+                if is_true_mesh_adjacency(meshes, i, j)}
+    assert adjacencies == expected == {(0, 1), (1, 0), (1, 3), (3, 1)}
+    assert get_true_mesh_adjacencies([]) == set()
+
+
+def test_true_mesh_adjacencies_large_coordinates():
+    """ Tests the adjacencies of split meshes that are several meters apart on every axis (in mm). """
+    meshes = create_split_meshes()
+    far_meshes = create_split_meshes()
+    for mesh in far_meshes:
+        for vkey in mesh.vertices():
+            for axis in 'xyz':
+                mesh.vertex_attribute(vkey, axis, mesh.vertex_attribute(vkey, axis) + 7000.0)
+    adjacencies = get_true_mesh_adjacencies(meshes + far_meshes)
+    expected = {(0, 1), (1, 0), (1, 3), (3, 1)}
+    assert adjacencies == expected | {(i + 4, j + 4) for i, j in expected}
+
+
+def test_mesh_directed_graph(tmp_path):
+    """ Tests the topological sorting of the split meshes. """
+    meshes = create_split_meshes()
+    graph = MeshDirectedGraph(meshes[:2] + meshes[3:], str(tmp_path))
+    assert graph.root_indices == [0]
+    assert graph.end_indices == [2]
+    assert graph.adj_list == [[1], [2], []]
+
+
+class EdgesDirectedGraph(DirectedGraph):
+    """ A directed graph with the given number of nodes and edges. """
+
+    def __init__(self, number_of_nodes, edges):
+        self.number_of_nodes = number_of_nodes
+        self.edges = edges
+        DirectedGraph.__init__(self)
+
+    def find_roots(self):
+        return [i for i in range(self.number_of_nodes) if all(child != i for _, child in self.edges)]
+
+    def find_ends(self):
+        return [i for i in range(self.number_of_nodes) if all(parent != i for parent, _ in self.edges)]
+
+    def create_graph_nodes(self):
+        for i in range(self.number_of_nodes):
+            self.G.add_node(i)
+
+    def get_children_of_node(self, root):
+        children = [child for parent, child in self.edges if parent == root]
+        return children, [None for _ in children]
+
+
+def test_topological_orders():
+    """ Tests the generated orders against all the permutations that respect the edges. """
+    edges = [(0, 2), (1, 2), (2, 3), (2, 4), (1, 5)]
+    graph = EdgesDirectedGraph(6, edges)
+    expected = [list(p) for p in itertools.permutations(range(6))
+                if all(p.index(parent) < p.index(child) for parent, child in edges)]
+    assert graph.get_all_topological_orders() == expected
+    assert list(graph.iter_topological_orders()) == expected
+    assert graph.get_best_order() == expected[0]
+
+    # the cheapest next node is the one with the largest index
+    assert graph.get_best_order(lambda previous, node: -node) == [1, 5, 0, 2, 4, 3]
+
+
+def test_topological_orders_are_lazy():
+    """ Tests that one order of a graph with a dozen independent branches is found without enumerating all of them. """
+    graph = EdgesDirectedGraph(25, [(0, i) for i in range(1, 13)] + [(i, i + 12) for i in range(1, 13)])
+    assert next(graph.iter_topological_orders()) == graph.get_best_order()
+    assert len(graph.get_best_order(lambda previous, node: 0.0)) == 25
+
+
+def test_segments_directed_graph(tmp_path):
+    """ Tests the order of two segments, and that the travel distance keeps the paths backed by arrays. """
+    mesh = create_strip_mesh(0.0, 10.0, 0.0, 10.0, 6, ('boundary', 1), ('boundary', 2))
+    ys = np.linspace(0.0, 10.0, 11)
+    segments = [VerticalLayer(id=i, paths=[Path.from_coords([[x, y, 0.0] for y in ys], is_closed=False)
+                                           for x in xs]) for i, xs in enumerate([[0.0, 5.0], [5.5, 10.0]])]
+    graph = SegmentsDirectedGraph(mesh, segments, 1.0, str(tmp_path))
+    coords = [path.coords for segment in segments for path in segment.paths]
+    assert graph.root_indices == [0] and graph.end_indices == [1]
+    assert graph.adj_list == [[1], []]
+
+    assert graph.get_travel_distance(None, 1) == 0.0
+    assert np.isclose(graph.get_travel_distance(0, 1), np.hypot(0.5, 10.0))
+    assert graph.get_best_order(graph.get_travel_distance) == [0, 1]
+    assert all(path.coords is c for path, c in zip([path for segment in segments for path in segment.paths], coords))